@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class JiraAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jira_app'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401  (connects the model signal handlers)
+        from .metrics import install_query_recorder
+
+        connection_created.connect(install_query_recorder, dispatch_uid="jira_query_recorder")
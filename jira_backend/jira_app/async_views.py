@@ -0,0 +1,202 @@
+"""
+Async versions of the hot read endpoints, served natively by ``asgi.py``.
+
+DRF's ``APIView`` is sync only, so under ASGI every request to it hops onto
+the thread pool and holds a worker thread for its whole lifetime. These
+views are plain async Django views that keep DRF's contract: the same JWT
+authentication, permission rules, status codes, error bodies, ETags and
+JSON bytes (or MessagePack) as their sync counterparts in ``views.py``.
+Queries go through the async ORM (``aget``/``afirst``/``aexists``/
+``aiterator``/``async for``).
+
+``urls.py`` routes GET/HEAD of these endpoints here when
+``JIRA_ASYNC_VIEWS`` is on (``asgi.py`` turns it on by default) and every
+other method to the sync views through ``read_async``.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.views import exception_handler
+
+from . import metrics
+from .authentication import AsyncJWTAuthentication
+from .conditional import atask_list_state, atask_state, conditional_get
+from .filters import FilterError, filter_tasks
+from .models import Project, Task, Comment
+from .pagination import KeysetPagination
+from .permissions import IsProjectMember, ais_project_member
+from .renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+from .response_cache import acached
+from .rows import atask_rows, auser_rows, task_values
+from .serializers import CommentSerializer
+from .summaries import asummarize_projects
+
+
+def read_async(async_view, sync_view):
+    """ One URL, two implementations: GET/HEAD run ``async_view``, other methods the sync DRF view """
+    async def view(request, *args, **kwargs):
+        if request.method in ("GET", "HEAD"):
+            return await async_view(request, *args, **kwargs)
+        return await sync_to_async(sync_view)(request, *args, **kwargs)
+    return csrf_exempt(view)
+
+
+class AsyncAPIView(View):
+    """
+    The parts of ``APIView`` the read endpoints rely on: JWT authentication
+    (``IsAuthenticated``), an optional project membership check on
+    ``project_url_kwarg``, DRF-shaped errors and renderer negotiation.
+    """
+
+    authentication = AsyncJWTAuthentication()
+    renderer_classes = [FastJSONRenderer] + ([MessagePackRenderer] if msgpack else [])
+    project_url_kwarg = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        # filters and pagination read DRF's name for the query string
+        request.query_params = request.GET
+        recorded = metrics.current()
+        try:
+            await self.initial(request)
+            handler_started, handler_db = time.perf_counter(), recorded.db if recorded else 0.0
+            response = await super().dispatch(request, *args, **kwargs)
+            if recorded is not None:
+                # Same split as MetricsMixin: handler time outside SQL counts as serialization
+                recorded.serialize += max(0.0, time.perf_counter() - handler_started - (recorded.db - handler_db))
+        except Exception as exc:
+            response = self.handle_exception(request, exc)
+        if isinstance(response, Reply):
+            render_started = time.perf_counter()
+            response = self.render(request, response)
+            if recorded is not None:
+                recorded.render += time.perf_counter() - render_started
+        return response
+
+    async def initial(self, request):
+        authenticated = await self.authentication.aauthenticate(request)
+        if authenticated is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = authenticated
+        project_id = self.kwargs.get(self.project_url_kwarg) if self.project_url_kwarg else None
+        if project_id is not None and not await ais_project_member(request, project_id):
+            raise exceptions.PermissionDenied(IsProjectMember.message)
+
+    def handle_exception(self, request, exc):
+        response = exception_handler(exc, {"view": self, "request": request})
+        if response is None:
+            raise exc
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            headers["WWW-Authenticate"] = self.authentication.authenticate_header(request)
+        return Reply(response.data, status=response.status_code, headers=headers)
+
+    def render(self, request, reply):
+        try:
+            renderer, media_type = DefaultContentNegotiation().select_renderer(
+                request, [renderer() for renderer in self.renderer_classes]
+            )
+        except exceptions.NotAcceptable:
+            renderer, media_type = self.renderer_classes[0](), self.renderer_classes[0].media_type
+            reply = Reply({"detail": "Could not satisfy the request Accept header."}, status=406)
+        content_type = f"{media_type}; charset={renderer.charset}" if renderer.charset else media_type
+        response = HttpResponse(renderer.render(reply.data), status=reply.status, content_type=content_type)
+        for name, value in reply.headers.items():
+            response[name] = value
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+
+class Reply:
+    """ Data for ``AsyncAPIView`` to render, the async counterpart of DRF's ``Response`` """
+
+    def __init__(self, data, status=200, headers=None):
+        self.data = data
+        self.status = status
+        self.headers = headers or {}
+        # conditional_get reads these before the reply is rendered
+        self.status_code = status
+
+    def __setitem__(self, name, value):
+        self.headers[name] = value
+
+    def __getitem__(self, name):
+        return self.headers[name]
+
+    def get(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def has_header(self, name):
+        return name in self.headers
+
+
+# ----------------- 🔹 Users & Projects 🔹 -----------------
+
+class AsyncUserListView(AsyncAPIView):
+    async def get(self, request):
+        return Reply(await auser_rows(User.objects.filter(is_superuser=False)))
+
+
+class AsyncProjectSummaryView(AsyncAPIView):
+    async def get(self, request):
+        """ Names and SQL-computed counts for the user's projects, without tasks or comments """
+        return Reply(await asummarize_projects(Project.objects.filter(team_members=request.user.id)))
+
+
+# ----------------- 🔹 Tasks & Comments 🔹 -----------------
+
+class AsyncTaskListView(AsyncAPIView):
+    project_url_kwarg = "project_id"
+
+    @conditional_get(atask_list_state)
+    async def get(self, request, project_id):
+        """ One filtered, sorted page of a project's tasks """
+        try:
+            tasks, ordering = filter_tasks(Task.objects.filter(project_id=project_id), request.query_params, request.user)
+        except FilterError as e:
+            return Reply({"error": str(e)}, status=400)
+
+        paginator = KeysetPagination()
+        paginator.ordering = ordering
+        page = await paginator.apaginate_queryset(task_values(tasks, ordering), request)
+        return Reply(paginator.get_paginated_data(await atask_rows(page)))
+
+
+class AsyncTaskDetailView(AsyncAPIView):
+    @conditional_get(atask_state)
+    async def get(self, request, pk):
+        project_id = await Task.objects.filter(pk=pk).values_list("project_id", flat=True).afirst()
+        if project_id is None:
+            return Reply({"error": "Task not found"}, status=404)
+        if not await ais_project_member(request, project_id):
+            return Reply({"error": "Not authorized"}, status=403)
+
+        async def build():
+            row = await task_values(Task.objects.filter(pk=pk)).afirst()
+            return (await atask_rows([row]))[0] if row else None
+
+        data, hit = await acached("task", pk, project_id, build)
+        if data is None:
+            return Reply({"error": "Task not found"}, status=404)
+        return Reply(data, headers={"X-Cache": "HIT" if hit else "MISS"})
+
+
+class AsyncCommentListView(AsyncAPIView):
+    async def get(self, request, task_id):
+        """ One page of a task's comments, oldest first, keyset-paginated on (created_at, id) """
+        project_id = await Task.objects.filter(id=task_id).values_list("project_id", flat=True).afirst()
+        if project_id is None or not await ais_project_member(request, project_id):
+            return Reply({"error": "Not authorized or task not found"}, status=403)
+
+        comments = Comment.objects.filter(task_id=task_id).select_related("user")
+        paginator = KeysetPagination()
+        paginator.ordering = ("created_at", "id")
+        page = await paginator.apaginate_queryset(comments, request)
+        # The authors are joined in, so serializing makes no queries
+        return Reply(paginator.get_paginated_data(CommentSerializer(page, many=True).data))
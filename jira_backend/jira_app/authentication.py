@@ -0,0 +1,181 @@
+"""
+JWT authentication for the API.
+
+Access tokens carry the user's ``username``, ``email`` and project
+memberships (``projects``, a list of ids, plus ``mv``, the user's membership
+version at minting time). With ``JIRA_STATELESS_AUTH`` on, requests are
+authenticated from those signed claims alone: ``request.user`` is a
+``ClaimsUser`` and no user row is loaded. Membership checks trust the
+embedded project list while ``mv`` still matches the version in the cache
+(bumped on every team change, see ``signals.py``) and go to the database
+otherwise. Access tokens are short-lived and refresh tokens rotate, so
+claims are re-read from the database at least every access token lifetime.
+The versions live in the ``JIRA_MEMBERSHIP_CACHE`` cache, which must be
+shared by every worker for a revocation to be seen everywhere (settings
+refuse stateless auth with a per-process cache).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .permissions import (
+    ProjectMembership, auser_membership_version, user_membership_version,
+)
+
+PROJECTS_CLAIM = "projects"
+MEMBERSHIP_VERSION_CLAIM = "mv"
+# Users on more projects than this get no embedded list (checks then always hit the database)
+MAX_CLAIMED_PROJECTS = 200
+
+
+def stateless_auth_enabled():
+    return getattr(settings, "JIRA_STATELESS_AUTH", False)
+
+
+# ----------------- 🔹 Login 🔹 -----------------
+
+class UsernameOrEmailBackend(ModelBackend):
+    """
+    ``authenticate(username=...)`` accepting a username or an email address.
+
+    Both are matched in one query (``username`` is unique, ``email`` has an
+    index), and the password is hashed once per matching account: the
+    username match first, then the oldest account with that email.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        candidates = list(UserModel._default_manager.filter(Q(username=username) | Q(email=username)).order_by("id"))
+        if not candidates:
+            # Hash anyway so unknown identifiers take as long as wrong passwords
+            UserModel().set_password(password)
+            return None
+
+        by_username = next((user for user in candidates if user.username == username), None)
+        by_email = next((user for user in candidates if user.email == username and user is not by_username), None)
+        for user in (by_username, by_email):
+            # check_password() rehashes with the preferred hasher when the stored hash is outdated
+            if user and user.check_password(password) and self.user_can_authenticate(user):
+                return user
+        return None
+
+
+# ----------------- 🔹 Tokens 🔹 -----------------
+
+class ClaimsRefreshToken(RefreshToken):
+    """ A refresh token whose access tokens embed fresh user and membership claims """
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        user_id = self[api_settings.USER_ID_CLAIM]
+        # Read the version first: a team change after this point makes the claims look stale, never fresh
+        version = user_membership_version(user_id)
+        user = self.get_user(user_id)
+        project_ids = sorted(ProjectMembership.objects.filter(user_id=user_id).values_list("project_id", flat=True))
+        access["username"] = user.username if user else ""
+        access["email"] = user.email if user else ""
+        access[MEMBERSHIP_VERSION_CLAIM] = version
+        access[PROJECTS_CLAIM] = project_ids if len(project_ids) <= MAX_CLAIMED_PROJECTS else None
+        return access
+
+    @staticmethod
+    def get_user(user_id):
+        from django.contrib.auth.models import User
+        return User.objects.filter(id=user_id).only("username", "email").first()
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """ ``/api/token/refresh/``: rotates the refresh token and mints an access token with current claims """
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsUser(TokenUser):
+    """ ``request.user`` under stateless auth, built from access token claims only """
+
+    @cached_property
+    def id(self):
+        # simplejwt stringifies the claim; views and raw SQL expect the integer primary key
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def claimed_project_ids(self):
+        """ The embedded project ids, or ``None`` when they may be out of date """
+        return self._claimed(user_membership_version(self.id))
+
+    async def aclaimed_project_ids(self):
+        if "claimed_project_ids" not in self.__dict__:
+            self.__dict__["claimed_project_ids"] = self._claimed(await auser_membership_version(self.id))
+        return self.claimed_project_ids
+
+    def _claimed(self, current_version):
+        projects = self.token.get(PROJECTS_CLAIM)
+        if projects is None or self.token.get(MEMBERSHIP_VERSION_CLAIM) != current_version:
+            return None
+        return frozenset(projects)
+
+
+# ----------------- 🔹 Authentication Classes 🔹 -----------------
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """ ``JWTAuthentication`` building a ``ClaimsUser`` from the token instead of loading the row under stateless auth """
+
+    def get_user(self, validated_token):
+        if stateless_auth_enabled():
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+        return super().get_user(validated_token)
+
+
+class AsyncJWTAuthentication(ClaimsJWTAuthentication):
+    """ ``ClaimsJWTAuthentication`` with a coroutine entry point for the async views (user lookup via ``aget``) """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if stateless_auth_enabled():
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
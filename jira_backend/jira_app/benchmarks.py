@@ -0,0 +1,217 @@
+"""
+API benchmark suite: every route in ``urls.py`` driven through the Django
+test client against a ``datasets.generate`` dataset.
+
+For each endpoint ``run`` reports the query count, p50/p95 latency and
+response size; ``regressions`` compares a run with the stored baseline
+(``benchmark_baseline.json``). Query counts must not grow at all and
+response sizes only within ``size_tolerance``. Latency is checked only when
+a ``latency_tolerance`` is given: median latency may then grow by that factor
+(timings depend on the machine and its load; the median rather than p95 so
+one garbage collection pause is not a failure).
+Writes run inside a transaction that is rolled back after every request,
+so each repetition sees the same data.
+
+The suite runs from ``jira_app/tests.py`` (``BENCH_*`` environment
+variables choose scales and repetitions, print the result tables and can
+rewrite the baseline).
+"""
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .authentication import ClaimsRefreshToken
+from .datasets import PASSWORD
+
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+
+
+class Endpoint:
+    """ One request to benchmark; ``path`` and ``body`` are filled from the dataset context """
+
+    def __init__(self, name, method, path, body=None, content_type="application/json", write=False, check_size=True,
+                 headers=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers or {}
+        self.write = write
+        # Sizes that depend on earlier activity in the process (not on the dataset) are reported only
+        self.check_size = check_size
+
+    @property
+    def key(self):
+        return f"{self.method.upper()} {self.name}"
+
+    def prepare(self, context, iteration):
+        """ ``(path, body, headers)`` for one repetition, built before the clock starts """
+        body = self.body(context, iteration) if callable(self.body) else self.body
+        if body is not None and self.content_type == "application/json":
+            body = json.dumps(body)
+        headers = {name: value.format(**context) for name, value in self.headers.items()}
+        return self.path.format(**context), body, headers
+
+    def send(self, client, path, body, headers):
+        if self.method == "get":
+            return client.get(path, headers=headers)
+        return getattr(client, self.method)(path, body, content_type=self.content_type, headers=headers)
+
+
+ENDPOINTS = [
+    Endpoint("register", "post", "/api/register/", lambda context, i: {
+        "username": f"bench-register-{i}", "email": f"bench-register-{i}@example.com", "password": PASSWORD,
+    }, write=True),
+    # A different account per repetition keeps clear of the per-identifier login throttle
+    Endpoint("login", "post", "/api/login/", lambda context, i: {
+        "username": context["usernames"][i % len(context["usernames"])], "password": PASSWORD,
+    }),
+    Endpoint("token-refresh", "post", "/api/token/refresh/", lambda context, i: {"refresh": context["new_refresh"]()}, write=True),
+    Endpoint("user-list", "get", "/api/users/"),
+    Endpoint("project-list", "get", "/api/projects/"),
+    Endpoint("project-list", "post", "/api/projects/", {"name": "Benchmark write"}, write=True),
+    Endpoint("project-summary", "get", "/api/projects/summary/"),
+    Endpoint("project-detail", "get", "/api/projects/{project}/"),
+    Endpoint("project-changes", "get", "/api/projects/{project}/changes/?since=0"),
+    Endpoint("project-export", "get", "/api/projects/{project}/export/?format=ndjson"),
+    Endpoint("project-import", "post", "/api/projects/{project}/import/",
+             "".join(json.dumps({"title": f"Imported {i}", "priority": "low"}) + "\n" for i in range(50)),
+             content_type="application/x-ndjson", write=True),
+    Endpoint("task-list", "get", "/api/projects/{project}/tasks/"),
+    Endpoint("task-list", "post", "/api/projects/{project}/tasks/", {"title": "Benchmark task", "comment": "First!"}, write=True),
+    Endpoint("task-bulk", "post", "/api/tasks/bulk/", lambda context, i: {
+        "create": [{"project": context["project"], "title": f"Bulk {n}"} for n in range(20)],
+        "update": [{"id": task_id, "priority": "high"} for task_id in context["tasks"][:20]],
+    }, write=True),
+    Endpoint("task-detail", "get", "/api/tasks/{task}/"),
+    Endpoint("update-task-status", "patch", "/api/tasks/{task}/update-status/", {"status": "in_progress"}, write=True),
+    Endpoint("comment-list", "get", "/api/tasks/{task}/comments/"),
+    Endpoint("comment-list", "post", "/api/tasks/{task}/comments/", {"text": "Benchmark comment"}, write=True),
+    Endpoint("dashboard", "get", "/api/dashboard/"),
+    Endpoint("search", "get", "/api/search/?q=deploy"),
+    Endpoint("metrics", "get", "/api/_metrics", check_size=False, headers={"Authorization": "Bearer {metrics_token}"}),
+]
+
+
+def context_for(dataset):
+    owner = dataset["owner"]
+    return {
+        "usernames": dataset["usernames"],
+        "project": dataset["projects"][0],
+        "task": dataset["tasks"][0],
+        "tasks": dataset["tasks"],
+        "new_refresh": lambda: str(ClaimsRefreshToken.for_user(owner)),
+        "metrics_token": getattr(settings, "JIRA_METRICS_TOKEN", ""),
+    }
+
+
+def authenticated_client(owner):
+    token = ClaimsRefreshToken.for_user(owner).access_token
+    return Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+def _content_length(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def measure(endpoint, client, context, repeat):
+    """ ``{"status", "queries", "p50_ms", "p95_ms", "bytes"}`` for one endpoint (after one warm-up request) """
+    timings, queries, size, status = [], None, 0, None
+    for iteration in range(repeat + 1):
+        with transaction.atomic():
+            path, body, headers = endpoint.prepare(context, iteration)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = endpoint.send(client, path, body, headers)
+                size = _content_length(response)
+                elapsed = time.perf_counter() - started
+            if endpoint.write:
+                transaction.set_rollback(True)
+        status = response.status_code
+        if iteration:
+            timings.append(elapsed * 1000)
+            queries = len(captured) if queries is None else max(queries, len(captured))
+    return {
+        "status": status,
+        "queries": queries,
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(_percentile(timings, 0.95), 2),
+        "bytes": size,
+        "_sql": [query["sql"] for query in captured.captured_queries],
+    }
+
+
+def run(dataset, repeat=10, endpoints=ENDPOINTS):
+    """ Benchmark every endpoint as the dataset's owner; ``{endpoint key: result}`` """
+    client = authenticated_client(dataset["owner"])
+    context = context_for(dataset)
+    results = {}
+    for endpoint in endpoints:
+        results[endpoint.key] = measure(endpoint, client, context, repeat)
+        results[endpoint.key]["check_size"] = endpoint.check_size
+    return results
+
+
+def report(scale, results):
+    lines = [f"{scale}:", f"  {'endpoint':<28} {'status':>6} {'queries':>7} {'p50 ms':>8} {'p95 ms':>8} {'bytes':>9}"]
+    for key, result in results.items():
+        lines.append(
+            f"  {key:<28} {result['status']:>6} {result['queries']:>7} {result['p50_ms']:>8.2f} "
+            f"{result['p95_ms']:>8.2f} {result['bytes']:>9}"
+        )
+    return "\n".join(lines)
+
+
+# ----------------- 🔹 Baseline 🔹 -----------------
+
+def load_baseline(path=BASELINE_PATH):
+    if not Path(path).exists():
+        return {}
+    return json.loads(Path(path).read_text())
+
+
+def save_baseline(results_by_scale, path=BASELINE_PATH):
+    baseline = load_baseline(path)
+    for scale, results in results_by_scale.items():
+        baseline[scale] = {
+            key: {name: value for name, value in result.items() if name in ("queries", "p50_ms", "p95_ms", "bytes")}
+            for key, result in results.items()
+        }
+    Path(path).write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def regressions(scale, results, baseline, latency_tolerance=None, size_tolerance=0.1, latency_floor_ms=5.0):
+    """ Human-readable descriptions of every metric that got worse than ``baseline[scale]`` allows """
+    found = []
+    for key, result in results.items():
+        expected = baseline.get(scale, {}).get(key)
+        if expected is None:
+            continue
+        if result["queries"] > expected["queries"]:
+            sql = "\n    ".join(result["_sql"])
+            found.append(f"{scale} {key}: {result['queries']} queries, baseline {expected['queries']}\n    {sql}")
+        if result["check_size"] and result["bytes"] > expected["bytes"] * (1 + size_tolerance):
+            found.append(f"{scale} {key}: {result['bytes']} bytes, baseline {expected['bytes']}")
+        if latency_tolerance is None:
+            continue
+        allowed = max(expected["p50_ms"] * latency_tolerance, expected["p50_ms"] + latency_floor_ms)
+        if result["p50_ms"] > allowed:
+            found.append(
+                f"{scale} {key}: p50 {result['p50_ms']:.2f} ms (p95 {result['p95_ms']:.2f} ms), "
+                f"baseline {expected['p50_ms']:.2f} ms ({expected['p95_ms']:.2f} ms)"
+            )
+    return found
@@ -0,0 +1,213 @@
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import counters, reminders
+from .changes import record_tasks
+from .models import Comment, Reminder, Task
+from .outbox import enqueue_many
+from .permissions import member_project_ids
+from .search import get_search_backend
+from .realtime import publish_event
+from .response_cache import bump_project_versions
+from .serializers import BulkTaskItemSerializer, TaskSyncSerializer
+
+MAX_BULK_ITEMS = 1000
+NOT_AUTHORIZED = "Not authorized or project not found"
+
+
+class BulkTaskError(Exception):
+    """ Raised when a bulk request fails validation; ``errors`` holds the per-item report """
+
+    def __init__(self, errors):
+        super().__init__("Bulk task request is invalid")
+        self.errors = errors
+
+
+def _as_list(payload, key):
+    items = payload.get(key, [])
+    if not isinstance(items, list):
+        raise BulkTaskError({"error": f"'{key}' must be a list"})
+    return items
+
+
+def apply_bulk_tasks(request, payload):
+    """
+    Validate and apply a batch of task creates, partial updates and deletes.
+
+    ``payload`` is ``{"create": [...], "update": [{"id": ..., ...}], "delete": [ids]}``.
+    Everything is validated up front with a fixed number of queries (tasks,
+    memberships and assignees are each loaded once) and then written with
+    ``bulk_create``/``bulk_update``/one ``DELETE`` per table in a single transaction.
+    If any item is invalid nothing is written and ``BulkTaskError`` carries
+    the errors per item.
+    """
+    if not isinstance(payload, dict):
+        raise BulkTaskError({"error": "Expected an object with create, update and delete lists"})
+    creates, updates, deletes = (_as_list(payload, key) for key in ("create", "update", "delete"))
+    if len(creates) + len(updates) + len(deletes) > MAX_BULK_ITEMS:
+        raise BulkTaskError({"error": f"At most {MAX_BULK_ITEMS} items per request"})
+
+    errors = {"create": [], "update": [], "delete": []}
+
+    def fail(section, index, item_errors):
+        errors[section].append({"index": index, "errors": item_errors})
+
+    # 🔹 Field validation (no queries)
+    valid_creates = []
+    for index, item in enumerate(creates):
+        serializer = BulkTaskItemSerializer(data=item)
+        if serializer.is_valid():
+            valid_creates.append((index, serializer.validated_data))
+        else:
+            fail("create", index, serializer.errors)
+
+    valid_updates = []
+    for index, item in enumerate(updates):
+        serializer = BulkTaskItemSerializer(data=item, partial=True)
+        if not serializer.is_valid():
+            fail("update", index, serializer.errors)
+        elif "id" not in serializer.validated_data:
+            fail("update", index, {"id": ["This field is required."]})
+        elif "project" in serializer.validated_data:
+            fail("update", index, {"project": ["Tasks cannot be moved between projects."]})
+        else:
+            valid_updates.append((index, serializer.validated_data))
+
+    valid_deletes = []
+    for index, task_id in enumerate(deletes):
+        if isinstance(task_id, int) and not isinstance(task_id, bool):
+            valid_deletes.append((index, task_id))
+        else:
+            fail("delete", index, {"id": ["A valid integer is required."]})
+
+    touched = [data["id"] for _, data in valid_updates] + [task_id for _, task_id in valid_deletes]
+    if len(touched) != len(set(touched)):
+        raise BulkTaskError({"error": "Each task id may appear only once across update and delete"})
+
+    # 🔹 Related lookups, one query each
+    tasks = Task.objects.in_bulk(touched)
+    counter_keys = {task_id: counters.task_key(task) for task_id, task in tasks.items()}
+    project_ids = {data["project"] for _, data in valid_creates} | {task.project_id for task in tasks.values()}
+    allowed_projects = member_project_ids(request, project_ids)
+    assignee_ids = {
+        data["assigned_to"]
+        for _, data in valid_creates + valid_updates
+        if data.get("assigned_to") is not None
+    }
+    existing_users = set(User.objects.filter(id__in=assignee_ids).values_list("id", flat=True))
+
+    def check_assignee(section, index, data):
+        if data.get("assigned_to") is not None and data["assigned_to"] not in existing_users:
+            fail(section, index, {"assigned_to": ["Invalid user id."]})
+            return False
+        return True
+
+    new_tasks = []
+    for index, data in valid_creates:
+        if data["project"] not in allowed_projects:
+            fail("create", index, {"project": [NOT_AUTHORIZED]})
+        elif check_assignee("create", index, data):
+            fields = {key: value for key, value in data.items() if key not in ("id", "project", "assigned_to")}
+            new_tasks.append((index, Task(project_id=data["project"], assigned_to_id=data.get("assigned_to"), **fields)))
+
+    changed_tasks, changed_fields = [], {"updated_at"}
+    for index, data in valid_updates:
+        task = tasks.get(data["id"])
+        if task is None or task.project_id not in allowed_projects:
+            fail("update", index, {"id": [NOT_AUTHORIZED if task else "Task not found."]})
+        elif check_assignee("update", index, data):
+            for key, value in data.items():
+                if key == "assigned_to":
+                    task.assigned_to_id = value
+                    changed_fields.add("assigned_to")
+                elif key != "id":
+                    setattr(task, key, value)
+                    changed_fields.add(key)
+            changed_tasks.append((index, task))
+
+    deleted_ids = []
+    for index, task_id in valid_deletes:
+        task = tasks.get(task_id)
+        if task is None or task.project_id not in allowed_projects:
+            fail("delete", index, {"id": [NOT_AUTHORIZED if task else "Task not found."]})
+        else:
+            deleted_ids.append((index, task_id))
+
+    if any(errors.values()):
+        raise BulkTaskError({key: sorted(value, key=lambda e: e["index"]) for key, value in errors.items() if value})
+
+    # 🔹 Apply everything atomically
+    now = timezone.now()
+    for _, task in changed_tasks:
+        task.updated_at = now
+
+    removed_tasks = [tasks[task_id] for _, task_id in deleted_ids]
+    with transaction.atomic():
+        Task.objects.bulk_create([task for _, task in new_tasks])
+        Task.objects.bulk_update([task for _, task in changed_tasks], sorted(changed_fields))
+        removed_comment_ids = _delete_tasks(removed_tasks)
+
+        # None of these writes send model signals, so count, remind, log and index explicitly
+        counters.track(
+            removed=[counter_keys[task.id] for _, task in changed_tasks] + [counter_keys[task.id] for task in removed_tasks],
+            added=[task for _, task in new_tasks + changed_tasks],
+        )
+        reminders.reschedule([task for _, task in new_tasks + changed_tasks])
+        record_tasks([task for _, task in new_tasks], "created")
+        record_tasks([task for _, task in changed_tasks], "updated")
+        record_tasks(removed_tasks, "deleted")
+        bump_project_versions(task.project_id for task in [task for _, task in new_tasks + changed_tasks] + removed_tasks)
+        backend = get_search_backend()
+        if backend:
+            backend.index_tasks([task for _, task in new_tasks + changed_tasks])
+            backend.remove_tasks([task.id for task in removed_tasks])
+            backend.remove_comments(removed_comment_ids)
+
+        # Board events go out once the transaction commits
+        _publish_events(new_tasks, changed_tasks, deleted_ids, tasks)
+
+    return {
+        "create": [{"index": index, "id": task.id} for index, task in new_tasks],
+        "update": [{"index": index, "id": task.id} for index, task in changed_tasks],
+        "delete": [{"index": index, "id": task_id} for index, task_id in deleted_ids],
+    }
+
+
+def _delete_tasks(tasks):
+    """
+    Delete ``tasks`` with their comments and reminders, one ``DELETE`` per
+    table; returns the removed comment ids.
+    """
+    if not tasks:
+        return []
+    task_ids = [task.id for task in tasks]
+    comment_ids = list(Comment.objects.filter(task_id__in=task_ids).values_list("id", flat=True))
+    # Plain DELETEs on purpose: QuerySet.delete() would load every task, comment and reminder to walk
+    # the cascade and send pre/post_delete per row, and apply_bulk_tasks already does the work of
+    # those receivers (counters, change log, search, cache, events) once for the whole batch.
+    # Reminder and Comment are the only tables pointing at Task, so deleting them first keeps the
+    # foreign keys intact.
+    quote = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(task_ids))
+    with connection.cursor() as cursor:
+        for model, field in ((Reminder, "task"), (Comment, "task"), (Task, "id")):
+            column = model._meta.get_field(field).column
+            cursor.execute(f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(column)} IN ({placeholders})", task_ids)
+    return comment_ids
+
+
+def _publish_events(new_tasks, changed_tasks, deleted_ids, loaded):
+    actions = {task.id: "task.created" for _, task in new_tasks}
+    actions.update({task.id: "task.updated" for _, task in changed_tasks})
+    if actions:
+        # One joined query instead of an assignee lookup per task
+        written = Task.objects.filter(id__in=actions).select_related("assigned_to")
+        rows = TaskSyncSerializer(written, many=True).data
+        for row in rows:
+            publish_event(row["project"], actions[row["id"]], row)
+        enqueue_many((actions[row["id"]], {"project": row["project"], "data": row}) for row in rows)
+    deleted = [("task.deleted", {"project": loaded[task_id].project_id, "data": {"id": task_id}}) for _, task_id in deleted_ids]
+    for topic, message in deleted:
+        publish_event(message["project"], topic, message["data"])
+    enqueue_many(deleted)
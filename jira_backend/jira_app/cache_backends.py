@@ -0,0 +1,65 @@
+import pickle
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+# Byte accounting per named cache, alongside LocMemCache's own module-level stores
+_sizes = {}
+
+
+class SizeBoundedLocMemCache(LocMemCache):
+    """
+    ``LocMemCache`` that also evicts least-recently-used entries once the
+    pickled values exceed ``OPTIONS["MAX_BYTES"]`` (default 64 MiB), so a few
+    huge project trees cannot push the process out of memory.
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        options = params.get("OPTIONS", {})
+        self._max_bytes = int(options.get("MAX_BYTES", 64 * 1024 * 1024))
+        self._sizes = _sizes.setdefault(name, {"total": 0, "entries": {}})
+
+    def _set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self._forget(key)
+        super()._set(key, value, timeout)
+        self._sizes["entries"][key] = len(value)
+        self._sizes["total"] += len(value)
+        # Least recently used entries sit at the end of the OrderedDict
+        while self._sizes["total"] > self._max_bytes and len(self._cache) > 1:
+            oldest = next(reversed(self._cache))
+            self._delete(oldest)
+
+    def incr(self, key, delta=1, version=None):
+        value = super().incr(key, delta, version)
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            self._forget(key)
+            size = len(pickle.dumps(value, self.pickle_protocol))
+            self._sizes["entries"][key] = size
+            self._sizes["total"] += size
+        return value
+
+    def _delete(self, key):
+        self._forget(key)
+        return super()._delete(key)
+
+    def _cull(self):
+        super()._cull()
+        entries = self._sizes["entries"]
+        for key in [key for key in entries if key not in self._cache]:
+            self._forget(key)
+
+    def clear(self):
+        super().clear()
+        with self._lock:
+            self._sizes["entries"].clear()
+            self._sizes["total"] = 0
+
+    def _forget(self, key):
+        size = self._sizes["entries"].pop(key, 0)
+        self._sizes["total"] -= size
+
+    @property
+    def current_bytes(self):
+        return self._sizes["total"]
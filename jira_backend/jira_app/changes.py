@@ -0,0 +1,141 @@
+"""
+Per-project change log feeding ``/api/projects/<id>/changes/?since=<cursor>``.
+
+Every task, comment, membership and project write appends a ``Change`` row;
+the row id is the sync cursor. Deletes leave a tombstone, so a client can
+keep a mirror of a board by replaying only what happened after its cursor.
+Ids are allocated at insert but seen at commit, so the feed stops before the
+first row younger than ``JIRA_CHANGES_SETTLE_SECONDS``: a slower transaction
+holding a lower id commits before the cursor can move past it.
+``compact_changes`` drops superseded and expired rows and records how far it
+went in ``Project.changes_compacted_through``; cursors older than that get
+``410 Gone`` and must resync from the regular endpoints.
+"""
+import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Max, QuerySet
+from django.utils import timezone
+
+from .models import Change, Comment, Project, Task
+from .serializers import CommentSyncSerializer, TaskSyncSerializer, UserSerializer
+
+MAX_CHANGES_PAGE = 500
+
+
+class CursorExpired(Exception):
+    """ The client's cursor points into a compacted part of the log """
+
+
+def record(project_id, kind, object_ids, action):
+    Change.objects.bulk_create(
+        [Change(project_id=project_id, kind=kind, object_id=object_id, action=action) for object_id in object_ids]
+    )
+
+
+def record_tasks(tasks, action):
+    """ Log many task writes at once (for bulk paths that bypass model signals) """
+    Change.objects.bulk_create(
+        [Change(project_id=task.project_id, kind="task", object_id=task.id, action=action) for task in tasks]
+    )
+
+
+def started_by(origin, model):
+    """ Was a delete initiated on ``model`` itself (not cascaded from a parent)? """
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+# ----------------- 🔹 Reading the feed 🔹 -----------------
+
+def changes_since(project, since, limit=MAX_CHANGES_PAGE):
+    """
+    Collapse the log after ``since`` into one entry per object.
+
+    Returns ``(changes, cursor, has_more)``. Each entry carries the object's
+    current state (``data``) unless its latest action is a delete.
+    """
+    if since < project.changes_compacted_through:
+        raise CursorExpired
+
+    entries = list(
+        Change.objects.filter(project=project, id__gt=since)
+        .order_by("id")
+        .values("id", "kind", "object_id", "action", "created_at")[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    settle = getattr(settings, "JIRA_CHANGES_SETTLE_SECONDS", 0)
+    if settle:
+        # ✅ Stop at the first unsettled row (not filter it out): later ids must not pass a pending lower one
+        horizon = timezone.now() - datetime.timedelta(seconds=settle)
+        settled = next((n for n, entry in enumerate(entries) if entry["created_at"] > horizon), None)
+        if settled is not None:
+            entries, has_more = entries[:settled], False
+    cursor = entries[-1]["id"] if entries else max(since, project.changes_compacted_through)
+
+    # Keep the latest entry per object, but remember objects first seen as created
+    latest, created = {}, set()
+    for entry in entries:
+        key = (entry["kind"], entry["object_id"])
+        if entry["action"] == "created":
+            created.add(key)
+        latest.pop(key, None)
+        latest[key] = entry
+
+    live = {kind: [object_id for (k, object_id), e in latest.items() if k == kind and e["action"] != "deleted"]
+            for kind, _ in Change.KIND_CHOICES}
+    data = {
+        "task": {
+            row["id"]: row
+            for row in TaskSyncSerializer(
+                Task.objects.filter(project=project, id__in=live["task"]).select_related("assigned_to"), many=True
+            ).data
+        },
+        "comment": {
+            row["id"]: row
+            for row in CommentSyncSerializer(
+                Comment.objects.filter(task__project=project, id__in=live["comment"]).select_related("user"), many=True
+            ).data
+        },
+        "member": {
+            row["id"]: row
+            for row in UserSerializer(User.objects.filter(projects=project, id__in=live["member"]), many=True).data
+        },
+        "project": {project.id: {"id": project.id, "name": project.name, "description": project.description}},
+    }
+
+    changes = []
+    for key, entry in latest.items():
+        kind, object_id = key
+        row = data[kind].get(object_id) if entry["action"] != "deleted" else None
+        if row is None:
+            # Gone since it was logged: a later delete is in the log past this page
+            changes.append({"type": kind, "id": object_id, "action": "deleted"})
+        else:
+            action = "created" if key in created else entry["action"]
+            changes.append({"type": kind, "id": object_id, "action": action, "data": row})
+    return changes, str(cursor), has_more
+
+
+# ----------------- 🔹 Compaction 🔹 -----------------
+
+def compact(retention):
+    """
+    Remove superseded entries (older rows for an object that changed again)
+    and everything older than ``retention``. Returns the number of rows removed.
+    """
+    latest_ids = Change.objects.values("project", "kind", "object_id").annotate(latest=Max("id")).values("latest")
+    removed, _ = Change.objects.exclude(id__in=latest_ids).delete()
+
+    cutoff = timezone.now() - retention
+    expired = Change.objects.filter(created_at__lt=cutoff)
+    floors = expired.values("project").annotate(through=Max("id")).values_list("project", "through")
+    for project_id, through in floors:
+        Project.objects.filter(pk=project_id, changes_compacted_through__lt=through).update(
+            changes_compacted_through=through
+        )
+    expired_count, _ = expired.delete()
+    return removed + expired_count
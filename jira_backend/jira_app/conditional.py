@@ -0,0 +1,167 @@
+"""
+Conditional GET (ETag / Last-Modified) for project and task resources.
+
+Each resource gets a cheap fingerprint from a single aggregate query (latest
+``updated_at``/``created_at`` plus row counts, so deletes change it too). When
+the client's ``If-None-Match``/``If-Modified-Since`` still matches, the view
+answers ``304 Not Modified`` without loading or serializing anything.
+Project-wide fingerprints also take the newest change log entry, so a delete
+moves ``Last-Modified`` forward as well as the ETag. Answers can differ per
+user (``assigned_to=me``), so they carry ``Vary: Authorization``.
+"""
+import calendar
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import Change, Project, Task, Comment
+from .permissions import ais_project_member, is_project_member, remember_membership, with_membership
+
+
+def _aggregate(queryset, group_field, expression, output_field=None):
+    """ A correlated scalar subquery computing ``expression`` over ``queryset`` """
+    values = queryset.order_by().values(group_field).annotate(result=expression).values("result")
+    return Subquery(values, output_field=output_field)
+
+
+def _task_aggregates(project_ref):
+    tasks = Task.objects.filter(project=OuterRef(project_ref))
+    comments = Comment.objects.filter(task__project=OuterRef(project_ref))
+    # ✅ Deletes only show up here; the newest entry is one step down change_project_cursor_idx
+    latest_change = Change.objects.filter(project=OuterRef(project_ref)).order_by("-id").values("created_at")[:1]
+    return {
+        "task_count": _aggregate(tasks, "project", Count("id"), IntegerField()),
+        "task_max": _aggregate(tasks, "project", Max("updated_at")),
+        "comment_count": _aggregate(comments, "task__project", Count("id"), IntegerField()),
+        "comment_max": _aggregate(comments, "task__project", Max("created_at")),
+        "change_max": Subquery(latest_change),
+    }
+
+
+def _state(values, *extra):
+    """ Turn a row of fingerprint values into an (etag, last_modified) pair """
+    moments = [value for value in values.values() if hasattr(value, "utctimetuple")]
+    last_modified = calendar.timegm(max(moments).utctimetuple()) if moments else None
+    raw = "|".join(str(value) for value in [*values.values(), *extra])
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"', last_modified
+
+
+# ----------------- 🔹 Fingerprints 🔹 -----------------
+
+def project_state(request, pk):
+    if not is_project_member(request, pk):
+        return None
+    members = Project.team_members.through.objects.filter(project=OuterRef("pk"))
+    values = (
+        Project.objects.filter(pk=pk)
+        .annotate(member_count=_aggregate(members, "project", Count("id"), IntegerField()), **_task_aggregates("pk"))
+        .values("updated_at", "member_count", "task_count", "task_max", "comment_count", "comment_max", "change_max")
+        .first()
+    )
+    return _state(values) if values else None
+
+
+def _task_values(request, pk):
+    comments = Comment.objects.filter(task=OuterRef("pk"))
+    return (
+        with_membership(Task.objects.filter(pk=pk), request)
+        .annotate(
+            comment_count=_aggregate(comments, "task", Count("id"), IntegerField()),
+            comment_max=_aggregate(comments, "task", Max("created_at")),
+        )
+        .values("project_id", "is_member", "updated_at", "assigned_to_id", "comment_count", "comment_max")
+    )
+
+
+def _task_result(request, values):
+    if not values:
+        return None
+    remember_membership(request, values.pop("project_id"), values["is_member"])
+    if not values.pop("is_member"):
+        return None
+    return _state(values)
+
+
+def task_state(request, pk):
+    return _task_result(request, _task_values(request, pk).first())
+
+
+async def atask_state(request, pk):
+    return _task_result(request, await _task_values(request, pk).afirst())
+
+
+def _task_list_values(project_id):
+    return Project.objects.filter(pk=project_id).annotate(**_task_aggregates("pk")).values(
+        "task_count", "task_max", "comment_count", "comment_max", "change_max"
+    )
+
+
+def task_list_state(request, project_id):
+    if not is_project_member(request, project_id):
+        return None
+    values = _task_list_values(project_id).first()
+    # Filters, sort and cursor select different pages of the same data; "assigned_to=me" differs per user
+    return _state(values, request.user.id, request.get_full_path()) if values else None
+
+
+async def atask_list_state(request, project_id):
+    if not await ais_project_member(request, project_id):
+        return None
+    values = await _task_list_values(project_id).afirst()
+    return _state(values, request.user.id, request.get_full_path()) if values else None
+
+
+# ----------------- 🔹 Decorator 🔹 -----------------
+
+def _finish(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified)
+        # Let browsers keep the body but revalidate on every poll
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+def conditional_get(fingerprint):
+    """
+    Wrap an ``APIView.get`` so it honours ``If-None-Match``/``If-Modified-Since``.
+
+    ``fingerprint(request, **kwargs)`` returns ``(etag, last_modified)`` or
+    ``None`` to skip conditional handling (e.g. when the user may not see
+    the resource, so a 304 can never leak its existence). Async handlers
+    take an async fingerprint (``atask_state`` etc.).
+    """
+    def decorator(method):
+        if iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                state = await fingerprint(request, *args, **kwargs)
+                if state is None:
+                    return await method(view, request, *args, **kwargs)
+
+                etag, last_modified = state
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = await method(view, request, *args, **kwargs)
+                return _finish(response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            state = fingerprint(request, *args, **kwargs)
+            if state is None:
+                return method(view, request, *args, **kwargs)
+
+            etag, last_modified = state
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+            return _finish(response, etag, last_modified)
+        return wrapper
+    return decorator
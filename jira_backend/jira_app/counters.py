@@ -0,0 +1,240 @@
+"""
+Denormalized task counts behind ``/api/dashboard/``.
+
+``TaskCounter`` holds one row per (project, assignee, status, priority,
+deadline week) with the number of tasks matching it. Weeks keep the table
+small (a date per key would approach one row per task) while every week
+before the current one is wholly overdue. Every task write moves
+its counts in the same transaction: single saves and deletes through the
+model signals in ``signals.py``, ``bulk_create``/``bulk_update`` paths (the
+bulk endpoint and the importer) by calling ``track`` themselves. The
+``recompute_counters`` command rebuilds the table from the tasks and
+reports drift.
+"""
+import datetime
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DateField, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import Task, TaskCounter
+
+KEY_FIELDS = ("project_id", "assigned_to_id", "status", "priority", "due_week")
+# Keys moved per UPDATE statement (each adds a WHEN and an OR term; SQLite caps expression depth)
+APPLY_CHUNK_SIZE = 100
+# Task fields that feed the key; saves touching none of them leave the counters alone
+COUNTED_FIELDS = {"project", "project_id", "assigned_to", "assigned_to_id", "status", "priority", "deadline"}
+
+
+def week_start(day):
+    """ Monday of ``day``'s week """
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def due_week(deadline):
+    # Unsaved-then-saved instances keep whatever was assigned, e.g. an ISO string passed to create()
+    deadline = Task._meta.get_field("deadline").to_python(deadline)
+    if deadline is None:
+        return None
+    return week_start(timezone.localdate(deadline) if timezone.is_aware(deadline) else deadline.date())
+
+
+def task_key(task):
+    return (task.project_id, task.assigned_to_id, task.status, task.priority, due_week(task.deadline))
+
+
+def remember_key(task):
+    """ Note ``task``'s current key so its next save can move the count without re-reading the row """
+    task._counter_key = task_key(task)
+
+
+def loaded_key(task):
+    """ The key ``task`` had when it was loaded or last saved, ``None`` if unknown (e.g. deferred fields) """
+    return task.__dict__.get("_counter_key")
+
+
+def track(removed=(), added=()):
+    """ Move one count from each ``removed`` task key to each ``added`` one (tasks or key tuples) """
+    deltas = Counter(key if isinstance(key, tuple) else task_key(key) for key in added)
+    deltas.subtract(key if isinstance(key, tuple) else task_key(key) for key in removed)
+    apply(deltas)
+
+
+def apply(deltas):
+    """
+    Add ``deltas`` (``{key: change}``) to the counters; call inside the
+    transaction writing the tasks. Existing rows move in one ``UPDATE`` per
+    ``APPLY_CHUNK_SIZE`` keys; only keys seen for the first time cost more.
+    """
+    deltas = [(key, change) for key, change in deltas.items() if change]
+    for start in range(0, len(deltas), APPLY_CHUNK_SIZE):
+        _apply_chunk(deltas[start:start + APPLY_CHUNK_SIZE])
+
+
+def _apply_chunk(deltas):
+    matches = [(Q(**dict(zip(KEY_FIELDS, key))), change) for key, change in deltas]
+    rows = TaskCounter.objects.filter(reduce(or_, (match for match, _ in matches)))
+    updated = rows.update(count=F("count") + Case(
+        *(When(match, then=Value(change)) for match, change in matches), default=Value(0), output_field=IntegerField(),
+    ))
+    if updated == len(deltas):
+        return
+    existing = set(rows.values_list(*KEY_FIELDS)) if updated else set()
+    for key, change in deltas:
+        if key not in existing:
+            _add(dict(zip(KEY_FIELDS, key)), change)
+
+
+def _add(key, change):
+    """ Create the row for a new ``key`` (or add to it when another transaction just did) """
+    try:
+        with transaction.atomic():
+            TaskCounter.objects.create(count=change, **key)
+    except IntegrityError:
+        # A concurrent transaction created the row first
+        TaskCounter.objects.filter(**key).update(count=F("count") + change)
+
+
+def unassign_user(user_id):
+    """ Fold a user's counts into "unassigned" before the user is deleted (tasks are SET_NULL without signals) """
+    counters = TaskCounter.objects.filter(assigned_to_id=user_id)
+    deltas = Counter()
+    for project_id, status, priority, due, count in counters.values_list("project_id", "status", "priority", "due_week", "count"):
+        deltas[(project_id, None, status, priority, due)] += count
+    apply(deltas)
+    counters.delete()
+
+
+# ----------------- 🔹 Recompute & Drift 🔹 -----------------
+
+def expected_counts():
+    """ ``{key: count}`` computed from the tasks themselves (one grouped scan) """
+    rows = (
+        Task.objects.annotate(due_week=TruncWeek("deadline", output_field=DateField()))
+        .values_list(*KEY_FIELDS)
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    return {tuple(row[:-1]): row[-1] for row in rows}
+
+
+def stored_counts():
+    rows = TaskCounter.objects.exclude(count=0).values_list(*KEY_FIELDS, "count")
+    counts = Counter()
+    for row in rows:
+        counts[tuple(row[:-1])] += row[-1]
+    return {key: count for key, count in counts.items() if count}
+
+
+def drift():
+    """ ``[(key, stored, expected)]`` for every key where the counters disagree with the tasks """
+    expected, stored = expected_counts(), stored_counts()
+    return sorted(
+        ((key, stored.get(key, 0), expected.get(key, 0))
+         for key in expected.keys() | stored.keys()
+         if stored.get(key, 0) != expected.get(key, 0)),
+        key=lambda entry: tuple("" if part is None else str(part) for part in entry[0]),
+    )
+
+
+def rebuild():
+    """ Replace the counters with freshly computed ones; returns the number of rows written """
+    expected = expected_counts()
+    with transaction.atomic():
+        TaskCounter.objects.all().delete()
+        TaskCounter.objects.bulk_create(
+            [TaskCounter(count=count, **dict(zip(KEY_FIELDS, key))) for key, count in expected.items()],
+            batch_size=1000,
+        )
+    return len(expected)
+
+
+# ----------------- 🔹 Dashboard 🔹 -----------------
+
+def _empty_counts():
+    return {
+        "task_count": 0,
+        "status_counts": {value: 0 for value, _ in Task.STATUS_CHOICES},
+        "priority_counts": {value: 0 for value, _ in Task.PRIORITY_CHOICES},
+        "open_count": 0,
+        "overdue_count": 0,
+        "due_today_count": 0,
+    }
+
+
+def _add_group(counts, group, prefix=""):
+    count = group[f"{prefix}total"] or 0
+    counts["task_count"] += count
+    counts["status_counts"][group["status"]] = counts["status_counts"].get(group["status"], 0) + count
+    counts["priority_counts"][group["priority"]] = counts["priority_counts"].get(group["priority"], 0) + count
+    if group["status"] != "done":
+        counts["open_count"] += count
+        counts["overdue_count"] += group[f"{prefix}overdue"] or 0
+
+
+def _add_this_week(counts, group, prefix=""):
+    counts["overdue_count"] += group[f"{prefix}overdue"]
+    counts["due_today_count"] += group[f"{prefix}due_today"]
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time()))
+
+
+def dashboard(user_id, project_ids):
+    """
+    Counts for the dashboard in two grouped queries: ``TaskCounter`` for
+    status, priority, open and the overdue weeks before this one, then the
+    open tasks due between this Monday and the end of today for the rest of
+    overdue (``Task.overdue``, as in the project summaries) and due today.
+    Both cover each project and the tasks assigned to ``user_id``.
+    """
+    project_ids = sorted(project_ids)
+    now = timezone.now()
+    today = timezone.localdate(now)
+    this_week = week_start(today)
+    mine = Q(assigned_to_id=user_id)
+    earlier_weeks = Q(due_week__lt=this_week)
+    groups = (
+        TaskCounter.objects.filter(project_id__in=project_ids)
+        .values("project_id", "status", "priority")
+        .annotate(
+            total=Sum("count"),
+            overdue=Sum("count", filter=earlier_weeks),
+            my_total=Sum("count", filter=mine),
+            my_overdue=Sum("count", filter=mine & earlier_weeks),
+        )
+        .order_by()
+    )
+    # At most a week of deadlines per project, read through task_project_deadline_idx
+    overdue, due_today = Task.overdue(now), Q(deadline__gte=_local_midnight(today))
+    this_week_groups = (
+        Task.objects.filter(
+            project_id__in=project_ids,
+            deadline__gte=_local_midnight(this_week),
+            deadline__lt=_local_midnight(today + datetime.timedelta(days=1)),
+        )
+        .exclude(status="done")
+        .values("project_id")
+        .annotate(
+            overdue=Count("id", filter=overdue),
+            due_today=Count("id", filter=due_today),
+            my_overdue=Count("id", filter=mine & overdue),
+            my_due_today=Count("id", filter=mine & due_today),
+        )
+        .order_by()
+    )
+
+    projects = {project_id: {"id": project_id, **_empty_counts()} for project_id in project_ids}
+    assigned = _empty_counts()
+    for group in groups:
+        _add_group(projects[group["project_id"]], group)
+        _add_group(assigned, group, prefix="my_")
+    for group in this_week_groups:
+        _add_this_week(projects[group["project_id"]], group)
+        _add_this_week(assigned, group, prefix="my_")
+    return {"assigned_to_me": assigned, "projects": list(projects.values())}
@@ -0,0 +1,124 @@
+"""
+Deterministic datasets for benchmarks and load tests.
+
+``generate(seed, ...)`` inserts users, projects, memberships, tasks and
+comments with ``bulk_create`` and then brings the derived data up to date
+(dashboard counters, search index). The same seed and scale always produce
+the same names, texts, statuses, priorities, deadlines, assignees and team
+memberships; ids and timestamps come from the database. Every generated user
+shares ``PASSWORD``, and ``bench-user-0`` is a member of every project.
+"""
+import datetime
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import counters
+from .models import Project, Task, Comment
+from .permissions import ProjectMembership
+from .search import get_search_backend
+
+USERNAME_PREFIX = "bench-user-"
+PROJECT_PREFIX = "Benchmark project "
+PASSWORD = "bench-password"
+
+# Named scales for generate_dataset --scale and the benchmark suite; tasks are per project
+SCALES = {
+    "small": {"users": 20, "projects": 3, "members": 5, "tasks": 40, "comments": 3},
+    "medium": {"users": 200, "projects": 5, "members": 20, "tasks": 400, "comments": 5},
+    "large": {"users": 2000, "projects": 20, "members": 50, "tasks": 5000, "comments": 10},
+}
+
+WORDS = (
+    "api", "backend", "board", "bug", "cache", "client", "deploy", "design", "docs", "export", "feature", "fix",
+    "frontend", "import", "index", "login", "migration", "query", "refactor", "release", "report", "review",
+    "search", "sprint", "task", "test", "timeline", "ui", "update", "workflow",
+)
+# Deadlines are spread around a fixed day so the dataset does not depend on when it was generated
+DEADLINE_ORIGIN = datetime.datetime(2026, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def clear():
+    """ Remove everything a previous ``generate`` created (projects cascade to tasks and comments) """
+    with transaction.atomic():
+        Project.objects.filter(name__startswith=PROJECT_PREFIX).delete()
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+
+def generate(seed=0, users=20, projects=3, members=5, tasks=40, comments=3, batch_size=2000):
+    """
+    Insert a dataset and return ``{"owner": User, "usernames": [...], "projects": [ids], "tasks": [ids]}``.
+
+    ``members`` users (plus ``bench-user-0``) join each project, each project
+    gets ``tasks`` tasks and each task ``comments`` comments. Runs in one
+    transaction.
+    """
+    rng = random.Random(seed)
+    users, members = max(1, users), max(0, min(members, users))
+    # One hash for everyone, with a fixed salt so the rows are reproducible too
+    password = make_password(PASSWORD, salt=f"bench{seed}")
+
+    with transaction.atomic():
+        people = User.objects.bulk_create(
+            [
+                User(username=f"{USERNAME_PREFIX}{index}", email=f"{USERNAME_PREFIX}{index}@example.com", password=password)
+                for index in range(users)
+            ],
+            batch_size=batch_size,
+        )
+        owner, user_ids = people[0], [user.id for user in people]
+
+        boards = Project.objects.bulk_create(
+            [Project(name=f"{PROJECT_PREFIX}{index}", description=_sentence(rng, 12)) for index in range(projects)],
+            batch_size=batch_size,
+        )
+        teams = {}
+        for project in boards:
+            team = set(rng.sample(user_ids, members)) | {owner.id}
+            teams[project.id] = sorted(team)
+        ProjectMembership.objects.bulk_create(
+            [ProjectMembership(project_id=project_id, user_id=user_id) for project_id, team in teams.items() for user_id in team],
+            batch_size=batch_size,
+        )
+
+        new_tasks = []
+        for project in boards:
+            team = teams[project.id]
+            for index in range(tasks):
+                has_deadline = rng.random() < 0.7
+                deadline = DEADLINE_ORIGIN + datetime.timedelta(hours=rng.randint(-24 * 60, 24 * 120))
+                new_tasks.append(Task(
+                    project_id=project.id,
+                    title=f"{_sentence(rng, 4)} #{index}",
+                    description=_sentence(rng, 30),
+                    status=rng.choice(("to_do", "to_do", "in_progress", "done")),
+                    priority=rng.choice(("low", "medium", "medium", "high")),
+                    assigned_to_id=rng.choice(team) if rng.random() < 0.8 else None,
+                    deadline=deadline if has_deadline else None,
+                ))
+        Task.objects.bulk_create(new_tasks, batch_size=batch_size)
+
+        new_comments = {project.id: [] for project in boards}
+        for task in new_tasks:
+            team = teams[task.project_id]
+            for _ in range(comments):
+                new_comments[task.project_id].append(Comment(task_id=task.id, user_id=rng.choice(team), text=_sentence(rng, 15)))
+        Comment.objects.bulk_create(
+            [comment for project_comments in new_comments.values() for comment in project_comments], batch_size=batch_size
+        )
+
+        # bulk_create skips the model signals, so derived data is rebuilt explicitly
+        counters.rebuild()
+        backend = get_search_backend()
+        if backend:
+            backend.index_tasks(new_tasks)
+            for project_id, project_comments in new_comments.items():
+                backend.index_comments(project_comments, project_id)
+
+    return {"owner": owner, "usernames": [user.username for user in people], "projects": [project.id for project in boards], "tasks": [task.id for task in new_tasks]}
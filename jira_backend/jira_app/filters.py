@@ -0,0 +1,121 @@
+from datetime import datetime, time
+
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Task
+
+
+class FilterError(ValueError):
+    """ Raised for a malformed filter or sort query parameter """
+
+
+STATUS_VALUES = [value for value, _ in Task.STATUS_CHOICES]
+PRIORITY_VALUES = [value for value, _ in Task.PRIORITY_CHOICES]
+
+# Sort keys exposed to clients -> keyset ordering (always ending on a unique column)
+TASK_SORTS = {
+    "updated_at": ("updated_at", "id"),
+    "-updated_at": ("-updated_at", "-id"),
+    "deadline": ("deadline", "id"),
+    "-deadline": ("-deadline", "-id"),
+    "priority": ("priority_rank", "id"),
+    "-priority": ("-priority_rank", "-id"),
+    "status": ("status_rank", "id"),
+    "-status": ("-status_rank", "-id"),
+    "title": ("title", "id"),
+    "-title": ("-title", "-id"),
+}
+
+
+def _rank(field, values):
+    """ Order choice fields by their declared order rather than alphabetically """
+    return Case(
+        *[When(**{field: value}, then=Value(rank)) for rank, value in enumerate(values)],
+        default=Value(len(values)),
+        output_field=IntegerField(),
+    )
+
+
+def _choices(params, name, allowed):
+    raw = params.get(name)
+    if not raw:
+        return None
+    values = [value.strip() for value in raw.split(",") if value.strip()]
+    if any(value not in allowed for value in values):
+        raise FilterError(f"Invalid {name} value")
+    return values
+
+
+def _moment(params, name, end_of_day=False):
+    raw = params.get(name)
+    if not raw:
+        return None
+    message = f"Invalid {name} value, expected an ISO date or datetime"
+    try:
+        # ✅ Well-formed but impossible values ("2024-02-30") raise instead of returning None.
+        # Dates go first: parse_datetime also accepts them, as midnight, which loses end_of_day
+        day = parse_date(raw)
+        moment = parse_datetime(raw) if day is None else datetime.combine(day, time.max if end_of_day else time.min)
+    except ValueError:
+        raise FilterError(message) from None
+    if moment is None:
+        raise FilterError(message)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_tasks(queryset, params, user):
+    """
+    Apply the task list query parameters to ``queryset``.
+
+    Supported: ``status`` and ``priority`` (comma-separated), ``assigned_to``
+    (a user id, ``me`` or ``none``), ``deadline_after``/``deadline_before``,
+    ``updated_since`` and ``sort`` (see ``TASK_SORTS``). Returns the filtered
+    queryset and the keyset ordering to paginate it with.
+    """
+    statuses = _choices(params, "status", STATUS_VALUES)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+
+    priorities = _choices(params, "priority", PRIORITY_VALUES)
+    if priorities:
+        queryset = queryset.filter(priority__in=priorities)
+
+    assignee = params.get("assigned_to")
+    if assignee == "me":
+        queryset = queryset.filter(assigned_to_id=user.id)
+    elif assignee == "none":
+        queryset = queryset.filter(assigned_to__isnull=True)
+    elif assignee:
+        try:
+            assignee_id = int(assignee)
+        except ValueError:
+            raise FilterError("Invalid assigned_to value") from None
+        queryset = queryset.filter(assigned_to_id=assignee_id)
+
+    deadline_after = _moment(params, "deadline_after")
+    if deadline_after:
+        queryset = queryset.filter(deadline__gte=deadline_after)
+
+    deadline_before = _moment(params, "deadline_before", end_of_day=True)
+    if deadline_before:
+        queryset = queryset.filter(deadline__lte=deadline_before)
+
+    updated_since = _moment(params, "updated_since")
+    if updated_since:
+        queryset = queryset.filter(updated_at__gt=updated_since)
+
+    sort = params.get("sort", "updated_at")
+    if sort not in TASK_SORTS:
+        raise FilterError(f"Invalid sort value, expected one of: {', '.join(TASK_SORTS)}")
+    ordering = TASK_SORTS[sort]
+
+    if "priority" in sort:
+        queryset = queryset.annotate(priority_rank=_rank("priority", PRIORITY_VALUES))
+    elif "status" in sort:
+        queryset = queryset.annotate(status_rank=_rank("status", STATUS_VALUES))
+
+    return queryset, ordering
@@ -0,0 +1,35 @@
+"""
+Password hashers whose cost comes from settings. ``PASSWORD_HASHERS`` in
+``settings.py`` lists both, with the one ``JIRA_PASSWORD_HASHER`` selects
+first.
+
+Django rehashes a stored password with the first entry of
+``PASSWORD_HASHERS`` whenever its algorithm or cost differs, on the user's
+next successful login, so changing the profile needs no migration.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """ PBKDF2-SHA256 with ``JIRA_PBKDF2_ITERATIONS`` rounds (0 keeps Django's default) """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "JIRA_PBKDF2_ITERATIONS", 0) or PBKDF2PasswordHasher.iterations
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """ Argon2id (needs ``argon2-cffi``) with time and memory cost from settings """
+
+    @property
+    def time_cost(self):
+        return getattr(settings, "JIRA_ARGON2_TIME_COST", Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, "JIRA_ARGON2_MEMORY_COST_KIB", Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, "JIRA_ARGON2_PARALLELISM", Argon2PasswordHasher.parallelism)
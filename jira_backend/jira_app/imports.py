@@ -0,0 +1,339 @@
+"""
+Bulk import of tasks and comments into a project from NDJSON or CSV.
+
+Both formats match what ``/api/projects/<id>/export/`` produces, so an
+export can be re-imported, and both are parsed line by line from a stream:
+
+* ``ndjson``: ``{"type": "task", "id": <key>, "title": ..., ...}`` and
+  ``{"type": "comment", "task": <key>, "user": ..., "text": ...}`` lines
+  (``type`` defaults to ``task``).
+* ``csv``: a header row with ``task_id``, ``title``, ``description``,
+  ``status``, ``priority``, ``deadline``, ``assignee_username``/
+  ``assignee_email`` and optional ``comment_user``/``comment_text``/
+  ``comment_created_at`` columns. Rows repeating a ``task_id`` add comments
+  to the same task.
+
+Task keys only link comments to tasks inside the file; tasks always get new
+ids. Assignees and comment authors are matched by username, then email,
+against the project's members (loaded once per import); anyone else is
+reported as a bad row, so an import cannot assign or impersonate outsiders. Rows are validated and
+written in batches (``bulk_create`` inside one transaction per batch);
+invalid rows are skipped and listed in the report with their line numbers.
+Input that stops being valid UTF-8 is a 400 while nothing has been written;
+after that the rows read so far are kept and the report records the error.
+"""
+import codecs
+import csv
+import json
+
+from django.db import transaction
+from rest_framework import serializers
+
+from . import counters
+from .changes import record, record_tasks
+from .filters import PRIORITY_VALUES, STATUS_VALUES
+from .models import Task, Comment
+from .permissions import ProjectMembership
+from .realtime import publish_event
+from .response_cache import bump_project_versions
+from .search import get_search_backend
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ("ndjson", "csv")
+
+_TITLE_MAX_LENGTH = Task._meta.get_field("title").max_length
+_parse_datetime = serializers.DateTimeField().to_internal_value
+
+
+class ImportFormatError(ValueError):
+    """ The stream cannot be read as the requested format at all (as opposed to a bad row) """
+
+
+# ----------------- 🔹 Parsing 🔹 -----------------
+
+def _lines(stream):
+    # Byte lines in, text lines out; a UTF-8 BOM (common in spreadsheet exports) is dropped
+    return codecs.iterdecode(stream, "utf-8-sig")
+
+
+def _ndjson_records(stream):
+    for line_number, line in enumerate(_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, {"line": ["Invalid JSON."]}
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, {"line": ["Expected a JSON object."]}
+            continue
+        kind = record.get("type", "task")
+        if kind == "task":
+            assignee = record.get("assigned_to")
+            if isinstance(assignee, dict):
+                assignee = assignee.get("username") or assignee.get("email")
+            yield line_number, "task", {
+                "key": record.get("id"),
+                "title": record.get("title"),
+                "description": record.get("description"),
+                "status": record.get("status"),
+                "priority": record.get("priority"),
+                "deadline": record.get("deadline"),
+                "assignee": assignee,
+            }
+        elif kind == "comment":
+            yield line_number, "comment", {
+                "task": record.get("task"),
+                "user": record.get("user"),
+                "text": record.get("text"),
+                "created_at": record.get("created_at"),
+            }
+        else:
+            yield line_number, None, {"type": ["Expected 'task' or 'comment'."]}
+
+
+def _cell(row, column):
+    return (row.get(column) or "").strip() or None
+
+
+def _csv_records(stream):
+    reader = csv.DictReader(_lines(stream))
+    if not reader.fieldnames or "title" not in reader.fieldnames:
+        raise ImportFormatError("CSV input needs a header row with at least a 'title' column")
+
+    seen = set()
+    for row in reader:
+        line_number = reader.line_num
+        key = _cell(row, "task_id")
+        if key is None or key not in seen:
+            if key is not None:
+                seen.add(key)
+            yield line_number, "task", {
+                "key": key,
+                "title": row.get("title"),
+                "description": row.get("description") or None,
+                "status": _cell(row, "status"),
+                "priority": _cell(row, "priority"),
+                "deadline": _cell(row, "deadline"),
+                "assignee": _cell(row, "assignee_username") or _cell(row, "assignee_email") or _cell(row, "assigned_to"),
+            }
+        if _cell(row, "comment_text") is not None:
+            yield line_number, "comment", {
+                "task": key,
+                "user": _cell(row, "comment_user"),
+                "text": row.get("comment_text"),
+                "created_at": _cell(row, "comment_created_at"),
+            }
+
+
+def read_records(stream, import_format):
+    """ ``(line_number, kind, data)`` for every record of a binary stream; ``kind`` is None for unreadable rows """
+    if import_format not in FORMATS:
+        raise ImportFormatError(f"Invalid format, expected one of: {', '.join(FORMATS)}")
+    return _ndjson_records(stream) if import_format == "ndjson" else _csv_records(stream)
+
+
+# ----------------- 🔹 Importer 🔹 -----------------
+
+class TaskImporter:
+    """
+    Import records into ``project``. Comments without a resolvable author
+    fall back to ``default_user`` (usually the person running the import).
+    """
+
+    def __init__(self, project, default_user=None, batch_size=DEFAULT_BATCH_SIZE):
+        self.project = project
+        self.default_user_id = default_user.id if default_user else None
+        self.batch_size = max(1, batch_size)
+        self.task_ids = {}  # file key -> new task id, for comments in later batches
+        self.usernames, self.emails = self._user_lookup(project.id)
+        self.last_line = 0
+        self.task_count = 0
+        self.comment_count = 0
+        self.error_count = 0
+        self.errors = []
+
+    @staticmethod
+    def _user_lookup(project_id):
+        """ Members' usernames and lower-cased emails -> user id, from one query (the oldest account wins an email) """
+        usernames, emails = {}, {}
+        members = ProjectMembership.objects.filter(project_id=project_id).order_by("user_id")
+        for user_id, username, email in members.values_list("user_id", "user__username", "user__email"):
+            usernames[username] = user_id
+            if email:
+                emails.setdefault(email.lower(), user_id)
+        return usernames, emails
+
+    def run(self, records):
+        batch = []
+        try:
+            try:
+                for record in records:
+                    self.last_line = record[0]
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        self._import_batch(batch)
+                        batch = []
+            except UnicodeDecodeError:
+                if not (self.task_count or self.comment_count):
+                    raise ImportFormatError("Input is not valid UTF-8")
+                # Earlier batches are committed: keep the rows read so far and report where reading stopped
+                self._fail(self.last_line + 1, {"line": ["Input is not valid UTF-8; the rest of the file was not read."]})
+            if batch:
+                self._import_batch(batch)
+        finally:
+            # Batches committed before a failure are still announced
+            self._finish()
+        return self.report()
+
+    def _finish(self):
+        if self.task_count or self.comment_count:
+            bump_project_versions([self.project.id])
+            # One summary event; clients catch up through the change log
+            publish_event(self.project.id, "project.imported", {
+                "id": self.project.id, "tasks": self.task_count, "comments": self.comment_count,
+            })
+
+    def report(self):
+        return {
+            "tasks": self.task_count,
+            "comments": self.comment_count,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+    def _fail(self, line_number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_number, "errors": errors})
+
+    # 🔹 Validation (no queries)
+
+    def _resolve_user(self, identifier):
+        if identifier is None:
+            return None
+        identifier = str(identifier).strip()
+        return self.usernames.get(identifier) or self.emails.get(identifier.lower())
+
+    def _datetime(self, value, name, errors):
+        if value in (None, ""):
+            return None
+        try:
+            return _parse_datetime(value)
+        except serializers.ValidationError as e:
+            errors[name] = e.detail
+            return None
+
+    def _build_task(self, data):
+        errors = {}
+        title = data["title"]
+        if not isinstance(title, str) or not title.strip():
+            errors["title"] = ["This field is required."]
+        elif len(title) > _TITLE_MAX_LENGTH:
+            errors["title"] = [f"Ensure this field has no more than {_TITLE_MAX_LENGTH} characters."]
+
+        description = data["description"]
+        if description is not None and not isinstance(description, str):
+            errors["description"] = ["Not a valid string."]
+
+        status = data["status"] or "to_do"
+        if status not in STATUS_VALUES:
+            errors["status"] = [f'"{status}" is not a valid choice.']
+        priority = data["priority"] or "medium"
+        if priority not in PRIORITY_VALUES:
+            errors["priority"] = [f'"{priority}" is not a valid choice.']
+
+        deadline = self._datetime(data["deadline"], "deadline", errors)
+
+        assignee_id = self._resolve_user(data["assignee"])
+        if data["assignee"] and assignee_id is None:
+            errors["assigned_to"] = [f'No project member with username or email "{data["assignee"]}".']
+
+        if errors:
+            return None, errors
+        return Task(
+            project_id=self.project.id, title=title, description=description, status=status,
+            priority=priority, deadline=deadline, assigned_to_id=assignee_id,
+        ), None
+
+    def _build_comment(self, data, pending_keys):
+        errors = {}
+        key = None if data["task"] is None else str(data["task"])
+        if key is None or (key not in self.task_ids and key not in pending_keys):
+            errors["task"] = ["No task with this id earlier in the file."]
+
+        text = data["text"]
+        if not isinstance(text, str) or not text.strip():
+            errors["text"] = ["This field is required."]
+
+        user_id = self._resolve_user(data["user"])
+        if user_id is None:
+            if data["user"]:
+                errors["user"] = [f'No project member with username or email "{data["user"]}".']
+            elif self.default_user_id is None:
+                errors["user"] = ["This field is required."]
+            user_id = self.default_user_id
+
+        created_at = self._datetime(data["created_at"], "created_at", errors)
+        if errors:
+            return None, errors
+        return (key, Comment(user_id=user_id, text=text), created_at), None
+
+    # 🔹 Writing
+
+    def _import_batch(self, batch):
+        new_tasks, pending_keys, new_comments = [], {}, []
+        for line_number, kind, data in batch:
+            if kind is None:
+                self._fail(line_number, data)
+            elif kind == "task":
+                task, errors = self._build_task(data)
+                if errors:
+                    self._fail(line_number, errors)
+                    continue
+                new_tasks.append(task)
+                if data["key"] is not None:
+                    pending_keys[str(data["key"])] = task
+            else:
+                comment, errors = self._build_comment(data, pending_keys)
+                if errors:
+                    self._fail(line_number, errors)
+                else:
+                    new_comments.append(comment)
+
+        with transaction.atomic():
+            Task.objects.bulk_create(new_tasks, batch_size=self.batch_size)
+            self.task_ids.update((key, task.id) for key, task in pending_keys.items())
+
+            comments, backdated = [], []
+            for key, comment, created_at in new_comments:
+                comment.task_id = self.task_ids[key]
+                comments.append(comment)
+                if created_at is not None:
+                    backdated.append((comment, created_at))
+            Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+            if backdated:
+                # auto_now_add overrides created_at on insert; restore the imported timestamps
+                for comment, created_at in backdated:
+                    comment.created_at = created_at
+                Comment.objects.bulk_update([comment for comment, _ in backdated], ["created_at"], batch_size=self.batch_size)
+
+            # bulk_create skips post_save, so count, log and index explicitly
+            counters.track(added=new_tasks)
+            record_tasks(new_tasks, "created")
+            record(self.project.id, "comment", [comment.id for comment in comments], "created")
+            backend = get_search_backend()
+            if backend:
+                backend.index_tasks(new_tasks)
+                backend.index_comments(comments, self.project.id)
+
+        self.task_count += len(new_tasks)
+        self.comment_count += len(comments)
+
+
+def import_tasks(project, stream, import_format, default_user=None, batch_size=DEFAULT_BATCH_SIZE):
+    """ Import ``stream`` (binary, ``import_format`` in ``FORMATS``) into ``project`` and return the report """
+    records = read_records(stream, import_format)
+    return TaskImporter(project, default_user=default_user, batch_size=batch_size).run(records)
@@ -0,0 +1,85 @@
+import time
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import get_hashers
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from jira_app.views import LoginView
+
+
+class _Rollback(Exception):
+    pass
+
+
+def legacy_login(identifier, password):
+    """ The previous LoginView flow on Django's ModelBackend: try a username, then look the email up and try again """
+    backend = ModelBackend()
+    user = backend.authenticate(None, username=identifier, password=password)
+    if not user:
+        user = User.objects.filter(email=identifier).first()
+        if user:
+            user = backend.authenticate(None, username=user.username, password=password)
+    return user
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure logins/second on one core for username and email logins, comparing the previous "
+        "two-step flow with UsernameOrEmailBackend and the full LoginView (data is rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20, help="Logins per case (default: 20)")
+        parser.add_argument(
+            "--iterations", type=int, action="append",
+            help="PBKDF2 iterations to compare (repeatable); defaults to the configured profile",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                for iterations in options["iterations"] or [None]:
+                    if iterations is None:
+                        self.run(options["logins"], "configured hasher")
+                        continue
+                    with override_settings(
+                        PASSWORD_HASHERS=["jira_app.hashers.TunedPBKDF2PasswordHasher"],
+                        JIRA_PBKDF2_ITERATIONS=iterations,
+                    ):
+                        self.run(options["logins"], f"pbkdf2, {iterations} iterations")
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def run(self, logins, label):
+        password = "bench-login-Passw0rd"
+        User.objects.filter(username="bench-login").delete()
+        user = User.objects.create_user(username="bench-login", email="bench-login@example.com", password=password)
+        self.stdout.write(f"{label} ({get_hashers()[0].algorithm}):")
+
+        factory = APIRequestFactory()
+        view = LoginView.as_view(throttle_classes=[])
+
+        def login_view(identifier, password):
+            request = factory.post("/api/login/", {"username": identifier, "password": password}, format="json")
+            return view(request).status_code == 200
+
+        cases = [
+            ("legacy flow", legacy_login),
+            ("UsernameOrEmailBackend", lambda identifier, password: authenticate(username=identifier, password=password)),
+            ("LoginView (backend + tokens)", login_view),
+        ]
+        for identifier in (user.username, user.email):
+            for name, login in cases:
+                if not login(identifier, password):
+                    raise CommandError(f"{name} failed for {identifier}")
+                started = time.perf_counter()
+                for _ in range(logins):
+                    login(identifier, password)
+                rate = logins / (time.perf_counter() - started)
+                self.stdout.write(f"  {name:<30} by {'email' if '@' in identifier else 'username':<8} {rate:>8.1f} logins/s")
@@ -0,0 +1,70 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from jira_app.models import Project, Task, Comment
+from jira_app.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+from jira_app.rows import task_rows, task_values
+from jira_app.serializers import TaskSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare rows/second of the serializer and .values() rendering paths for task lists (data is rolled back)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=2000, help="Tasks to render (default: 2000)")
+        parser.add_argument("--comments", type=int, default=5, help="Comments per task (default: 5)")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the best is reported (default: 5)")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def run(self, options):
+        count = options["tasks"]
+        user = User.objects.create_user(username="bench-rendering", email="bench@example.com")
+        project = Project.objects.create(name="Rendering benchmark")
+        project.team_members.add(user)
+        tasks = Task.objects.bulk_create(
+            Task(project=project, title=f"Task {i}", description="x" * 200, assigned_to=user if i % 2 else None)
+            for i in range(count)
+        )
+        Comment.objects.bulk_create(
+            Comment(task=task, user=user, text=f"Comment {j}") for task in tasks for j in range(options["comments"])
+        )
+        queryset = Task.objects.filter(project=project).order_by("id")
+
+        paths = [
+            ("serializer + JSONRenderer", lambda: JSONRenderer().render(
+                TaskSerializer(queryset.with_comment_summary().select_related("assigned_to"), many=True).data
+            )),
+            (f"rows + FastJSONRenderer ({'orjson' if orjson else 'stdlib fallback'})", lambda: FastJSONRenderer().render(
+                task_rows(task_values(queryset))
+            )),
+        ]
+        if msgpack:
+            paths.append(("rows + MessagePackRenderer", lambda: MessagePackRenderer().render(task_rows(task_values(queryset)))))
+
+        baseline = None
+        for name, render in paths:
+            best = min(self.time(render) for _ in range(options["repeat"]))
+            rate = count / best
+            baseline = baseline or rate
+            self.stdout.write(f"{name:<45} {rate:>10,.0f} rows/s  ({rate / baseline:.1f}x)")
+
+    @staticmethod
+    def time(render):
+        started = time.perf_counter()
+        render()
+        return time.perf_counter() - started
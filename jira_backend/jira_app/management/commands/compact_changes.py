@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jira_app.changes import compact
+
+
+class Command(BaseCommand):
+    help = "Drop superseded and expired rows from the per-project change log"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30, help="Keep changes newer than this many days (default: 30)")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            removed = compact(timedelta(days=options["days"]))
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} change log rows"))
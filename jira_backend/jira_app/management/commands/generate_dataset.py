@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from jira_app import datasets
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert a deterministic benchmark dataset (users bench-user-N, password "
+        f"'{datasets.PASSWORD}'), e.g. generate_dataset --scale medium --seed 1"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(datasets.SCALES), default="small", help="Preset sizes (default: small)")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+        parser.add_argument("--users", type=int, help="Override the preset's user count")
+        parser.add_argument("--projects", type=int, help="Override the preset's project count")
+        parser.add_argument("--members", type=int, help="Override the preset's members per project")
+        parser.add_argument("--tasks", type=int, help="Override the preset's tasks per project")
+        parser.add_argument("--comments", type=int, help="Override the preset's comments per task")
+        parser.add_argument("--replace", action="store_true", help="Delete a previously generated dataset first")
+
+    def handle(self, *args, **options):
+        scale = dict(datasets.SCALES[options["scale"]])
+        for name in scale:
+            if options[name] is not None:
+                scale[name] = options[name]
+
+        if options["replace"]:
+            datasets.clear()
+        elif User.objects.filter(username__startswith=datasets.USERNAME_PREFIX).exists():
+            raise CommandError("A generated dataset already exists; pass --replace to regenerate it")
+
+        self.stdout.write(", ".join(f"{name}={value}" for name, value in scale.items()))
+        dataset = datasets.generate(seed=options["seed"], **scale)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {scale['users']} users, {len(dataset['projects'])} projects and {len(dataset['tasks'])} tasks; "
+            f"log in as {dataset['owner'].username} / {datasets.PASSWORD}"
+        ))
@@ -0,0 +1,55 @@
+import sys
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from jira_app.imports import DEFAULT_BATCH_SIZE, FORMATS, ImportFormatError, import_tasks
+from jira_app.models import Project
+from jira_app.permissions import query_membership
+
+
+class Command(BaseCommand):
+    help = "Import tasks and comments into a project from an NDJSON or CSV file (same layout as the export)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("project_id", type=int)
+        parser.add_argument("path", help="File to import, or - for stdin")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to csv for *.csv files, ndjson otherwise")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help=f"Rows per transaction (default: {DEFAULT_BATCH_SIZE})")
+        parser.add_argument("--user", help="Username credited for comments without a known author")
+
+    def handle(self, *args, **options):
+        project = Project.objects.filter(id=options["project_id"]).first()
+        if project is None:
+            raise CommandError(f"Project {options['project_id']} does not exist")
+
+        default_user = None
+        if options["user"]:
+            default_user = User.objects.filter(username=options["user"]).first()
+            if default_user is None:
+                raise CommandError(f"User {options['user']} does not exist")
+            if not query_membership(default_user.id, project.id):
+                raise CommandError(f"User {options['user']} is not a member of project {project.id}")
+
+        path = options["path"]
+        import_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "ndjson")
+        started = time.perf_counter()
+        try:
+            if path == "-":
+                report = import_tasks(project, sys.stdin.buffer, import_format, default_user, options["batch_size"])
+            else:
+                with open(path, "rb") as stream:
+                    report = import_tasks(project, stream, import_format, default_user, options["batch_size"])
+        except (OSError, ImportFormatError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        if report["error_count"] > len(report["errors"]):
+            self.stderr.write(f"... {report['error_count'] - len(report['errors'])} more errors not shown")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['tasks']} tasks and {report['comments']} comments in {elapsed:.1f}s "
+            f"({report['error_count']} rows skipped)"
+        ))
@@ -0,0 +1,130 @@
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [
+    "/api/users/",
+    "/api/projects/summary/",
+    "/api/projects/{project}/tasks/",
+    "/api/tasks/{task}/",
+    "/api/tasks/{task}/comments/",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running deployments and compare requests/second and latency percentiles, e.g. "
+        "gunicorn jira_backend.wsgi (wsgi) against uvicorn jira_backend.asgi:application (asgi): "
+        "loadtest --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001 "
+        "--username alice --password ... --project 1 --task 1"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", action="append", required=True, help="name=base URL; repeat for each deployment")
+        parser.add_argument("--username", required=True, help="Account used to log in on every target")
+        parser.add_argument("--password", required=True)
+        parser.add_argument("--project", type=int, default=1, help="Project id substituted into {project}")
+        parser.add_argument("--task", type=int, default=1, help="Task id substituted into {task}")
+        parser.add_argument("--path", action="append", help="Request path (repeatable); defaults to the async read endpoints")
+        parser.add_argument("--concurrency", type=int, default=32, help="Parallel clients (default: 32)")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds per target (default: 10)")
+        parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each run (default: 2)")
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            name, _, url = target.partition("=")
+            if not url:
+                raise CommandError(f"--target must look like name=http://host:port, got {target!r}")
+            targets.append((name, url.rstrip("/")))
+        paths = [
+            path.format(project=options["project"], task=options["task"])
+            for path in options["path"] or DEFAULT_PATHS
+        ]
+
+        results = []
+        for name, url in targets:
+            token = self.login(url, options["username"], options["password"])
+            self.stdout.write(f"{name}: warming up {url}")
+            self.run(url, token, paths, options["concurrency"], options["warmup"])
+            self.stdout.write(f"{name}: measuring for {options['duration']:.0f}s with {options['concurrency']} clients")
+            latencies, errors, elapsed = self.run(url, token, paths, options["concurrency"], options["duration"])
+            results.append((name, latencies, errors, elapsed))
+
+        self.stdout.write("")
+        self.stdout.write(f"{'target':<10} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, latencies, errors, elapsed in results:
+            if not latencies:
+                self.stdout.write(f"{name:<10} {0:>9} {errors:>7} {'-':>9} {'-':>8} {'-':>8}")
+                continue
+            cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            self.stdout.write(
+                f"{name:<10} {len(latencies):>9} {errors:>7} {len(latencies) / elapsed:>9.1f} "
+                f"{cuts[49] * 1000:>8.1f} {cuts[98] * 1000:>8.1f}"
+            )
+
+    @staticmethod
+    def connect(url):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        return connection_class(parts.hostname, parts.port, timeout=30)
+
+    def login(self, url, username, password):
+        connection = self.connect(url)
+        try:
+            body = json.dumps({"username": username, "password": password})
+            connection.request("POST", "/api/login/", body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            payload = response.read()
+        except OSError as e:
+            raise CommandError(f"Cannot reach {url}: {e}")
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise CommandError(f"Login on {url} failed with {response.status}: {payload[:200]!r}")
+        return json.loads(payload)["access"]
+
+    def run(self, url, token, paths, concurrency, duration):
+        """ ``concurrency`` keep-alive clients cycle through ``paths`` until ``duration`` elapses """
+        headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+        deadline = time.perf_counter() + duration
+        lock = threading.Lock()
+        latencies, errors = [], [0]
+
+        def client(offset):
+            connection = self.connect(url)
+            mine, failed, index = [], 0, offset
+            while time.perf_counter() < deadline:
+                path = paths[index % len(paths)]
+                index += 1
+                started = time.perf_counter()
+                try:
+                    connection.request("GET", path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException):
+                    failed += 1
+                    connection.close()
+                    connection = self.connect(url)
+                    continue
+                if response.status >= 400:
+                    failed += 1
+                else:
+                    mine.append(time.perf_counter() - started)
+            connection.close()
+            with lock:
+                latencies.extend(mine)
+                errors[0] += failed
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, errors[0], time.perf_counter() - started
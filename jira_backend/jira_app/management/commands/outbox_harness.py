@@ -0,0 +1,115 @@
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from jira_app import outbox
+from jira_app.models import DeadLetter, OutboxMessage
+
+TOPIC = "harness.message"
+
+# Set by the command before the workers start; read by the handler on the pool threads
+_options = {"handler_ms": 0.0, "failure_rate": 0.0}
+_deliveries = Counter()
+_deliveries_lock = threading.Lock()
+
+
+def harness_handler(topic, payload):
+    """ Simulated side effect: sleeps like a network call and fails at the configured rate """
+    time.sleep(_options["handler_ms"] / 1000)
+    if random.random() < _options["failure_rate"]:
+        raise RuntimeError("simulated handler failure")
+    with _deliveries_lock:
+        _deliveries[payload["n"]] += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Exercise the outbox end to end on the configured database, no broker needed: enqueue synthetic messages, "
+        "drain them with one or more workers and report throughput, retries, dead letters and duplicate deliveries"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=2000, help="Messages to enqueue (default: 2000)")
+        parser.add_argument("--workers", type=int, default=2, help="Competing worker instances (default: 2)")
+        parser.add_argument("--threads", type=int, default=8, help="Handler threads per worker (default: 8)")
+        parser.add_argument("--batch-size", type=int, default=100, help="Messages claimed per batch (default: 100)")
+        parser.add_argument("--handler-ms", type=float, default=5.0, help="Simulated handler latency (default: 5)")
+        parser.add_argument("--failure-rate", type=float, default=0.05, help="Fraction of handler calls that fail (default: 0.05)")
+        parser.add_argument("--max-attempts", type=int, default=3, help="Attempts before dead-lettering (default: 3)")
+        parser.add_argument("--retry-base", type=float, default=0.05, help="First retry delay in seconds (default: 0.05)")
+        parser.add_argument("--timeout", type=float, default=300.0, help="Give up after this many seconds (default: 300)")
+
+    def handle(self, *args, **options):
+        if OutboxMessage.objects.filter(topic=TOPIC).exists():
+            raise CommandError("Harness messages are left over from an earlier run; delete them first")
+        _options.update(handler_ms=options["handler_ms"], failure_rate=options["failure_rate"])
+        _deliveries.clear()
+        outbox.register(TOPIC, harness_handler)
+        try:
+            with transaction.atomic():
+                outbox.enqueue_many((TOPIC, {"n": n}) for n in range(options["messages"]))
+            elapsed, workers = self.drain(options)
+        finally:
+            outbox.unregister(TOPIC, harness_handler)
+
+        totals = Counter()
+        for worker in workers:
+            totals.update(worker.totals)
+        dead = DeadLetter.objects.filter(topic=TOPIC)
+        dead_count = dead.count()
+        duplicates = sum(count - 1 for count in _deliveries.values() if count > 1)
+        handler_calls = totals["delivered"] + totals["retried"] + totals["dead"]
+
+        self.stdout.write(
+            f"{options['messages']} messages, {options['workers']} workers x {options['threads']} threads: "
+            f"{elapsed:.2f} s, {options['messages'] / elapsed:.1f} messages/s ({handler_calls / elapsed:.1f} handler calls/s)"
+        )
+        self.stdout.write(
+            f"delivered {totals['delivered']}, retried {totals['retried']}, dead letters {dead_count}, "
+            f"duplicate deliveries {duplicates}"
+        )
+        per_worker = [worker.totals["delivered"] for worker in workers]
+        self.stdout.write(f"delivered per worker: {per_worker} (stdev {statistics.pstdev(per_worker):.1f})")
+        dead.delete()
+
+        if totals["delivered"] + dead_count != options["messages"] or duplicates:
+            raise CommandError("Some messages were lost or delivered twice")
+        self.stdout.write(self.style.SUCCESS("Every message was delivered once or dead-lettered"))
+
+    def drain(self, options):
+        workers = [
+            outbox.OutboxWorker(
+                worker_id=f"harness-{number}", batch_size=options["batch_size"], threads=options["threads"],
+                max_attempts=options["max_attempts"], retry_base=options["retry_base"], retry_cap=options["retry_base"] * 8,
+            )
+            for number in range(options["workers"])
+        ]
+        stop = threading.Event()
+
+        def loop(worker):
+            try:
+                worker.run(stop, poll_seconds=0.05)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=loop, args=(worker,)) for worker in workers]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while OutboxMessage.objects.filter(topic=TOPIC).exists():
+                if time.perf_counter() - started > options["timeout"]:
+                    raise CommandError(f"Outbox not drained after {options['timeout']} s")
+                time.sleep(0.05)
+            return time.perf_counter() - started, workers
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            for worker in workers:
+                worker.close()
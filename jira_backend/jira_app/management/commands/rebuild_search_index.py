@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from jira_app.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from every task and comment"
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            raise CommandError("No search backend is configured for this database")
+        with transaction.atomic():
+            backend.rebuild()
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jira_app.counters import KEY_FIELDS, drift, rebuild
+
+
+class Command(BaseCommand):
+    help = "Compare the dashboard counters with the tasks and rebuild them from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Only report drift; exit with an error if any is found")
+        parser.add_argument("--limit", type=int, default=20, help="Drifted keys to print (default: 20)")
+
+    def handle(self, *args, **options):
+        drifted = drift()
+        for key, stored, expected in drifted[: options["limit"]]:
+            described = ", ".join(f"{name}={value}" for name, value in zip(KEY_FIELDS, key))
+            self.stdout.write(f"{described}: stored {stored}, expected {expected}")
+        if len(drifted) > options["limit"]:
+            self.stdout.write(f"... and {len(drifted) - options['limit']} more")
+
+        if options["check"]:
+            if drifted:
+                raise CommandError(f"{len(drifted)} counter keys drifted from the tasks")
+            self.stdout.write(self.style.SUCCESS("Counters match the tasks"))
+            return
+
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} counter rows ({len(drifted)} keys had drifted)"))
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from jira_app.outbox import OutboxWorker
+
+
+class Command(BaseCommand):
+    help = "Run the outbox worker: claim due messages, run their handlers on a thread pool, retry or dead-letter failures"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Process what is due now and exit")
+        parser.add_argument("--batch-size", type=int, default=None, help="Messages claimed per batch (default: JIRA_OUTBOX_BATCH_SIZE)")
+        parser.add_argument("--threads", type=int, default=None, help="Handler threads (default: JIRA_OUTBOX_WORKER_THREADS)")
+        parser.add_argument("--lease", type=int, default=None, help="Lease seconds per batch (default: JIRA_OUTBOX_LEASE_SECONDS)")
+        parser.add_argument("--report-every", type=float, default=60.0, help="Seconds between throughput lines (default: 60)")
+
+    def handle(self, *args, **options):
+        worker = OutboxWorker(batch_size=options["batch_size"], threads=options["threads"], lease_seconds=options["lease"])
+        self.stdout.write(f"{worker.worker_id}: {worker.threads} threads, batches of {worker.batch_size}")
+        try:
+            if options["once"]:
+                while sum(worker.run_once().values()):
+                    pass
+                self.report(worker, dict.fromkeys(worker.totals, 0), None)
+                return
+
+            stop = threading.Event()
+            thread = threading.Thread(target=worker.run, args=(stop,), name="jira-outbox-loop", daemon=True)
+            thread.start()
+            try:
+                previous, started = dict(worker.totals), time.perf_counter()
+                while thread.is_alive():
+                    thread.join(options["report_every"])
+                    elapsed, started = time.perf_counter() - started, time.perf_counter()
+                    self.report(worker, previous, elapsed)
+                    previous = dict(worker.totals)
+            except KeyboardInterrupt:
+                stop.set()
+                thread.join()
+                self.stdout.write("Stopped")
+        finally:
+            worker.close()
+
+    def report(self, worker, previous, elapsed):
+        """ One line of per-outcome counts since ``previous``, with messages/second over ``elapsed`` """
+        delta = {outcome: worker.totals[outcome] - previous[outcome] for outcome in worker.totals}
+        line = ", ".join(f"{count} {outcome}" for outcome, count in delta.items())
+        if elapsed:
+            line += f" ({sum(delta.values()) / elapsed:.1f} messages/s)"
+        self.stdout.write(line)
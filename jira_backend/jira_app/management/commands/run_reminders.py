@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from jira_app.reminders import next_fire_time, scan
+
+
+class Command(BaseCommand):
+    help = "Emit deadline reminders as tasks come due, sleeping until the next deadline between scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Scan once and exit (for cron)")
+        parser.add_argument("--batch-size", type=int, default=None, help="Tasks per transaction (default: JIRA_REMINDER_BATCH_SIZE)")
+        parser.add_argument(
+            "--max-sleep", type=float, default=None,
+            help="Longest sleep between scans in seconds (default: JIRA_REMINDER_MAX_SLEEP_SECONDS)",
+        )
+
+    def handle(self, *args, **options):
+        max_sleep = options["max_sleep"] or settings.JIRA_REMINDER_MAX_SLEEP_SECONDS
+        try:
+            while True:
+                close_old_connections()
+                emitted = scan(batch_size=options["batch_size"])
+                if any(emitted.values()):
+                    described = ", ".join(f"{count} {kind}" for kind, count in emitted.items())
+                    self.stdout.write(f"{timezone.now():%Y-%m-%d %H:%M:%S} emitted {described}")
+                if options["once"]:
+                    return
+
+                # ✅ Sleep until the next deadline comes due; edits that move one earlier are seen within max_sleep
+                wake = next_fire_time()
+                delay = max_sleep if wake is None else (wake - timezone.now()).total_seconds()
+                time.sleep(min(max(delay, 0.0), max_sleep))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped")
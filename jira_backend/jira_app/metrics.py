@@ -0,0 +1,268 @@
+"""
+Per-request instrumentation: SQL query count, DB time, serialization time
+and render time, tagged with the URL name (``task-list``, ``dashboard``, ...).
+
+``RequestMetricsMiddleware`` (``middleware.py``) opens a ``RequestMetrics``
+for every request; every database connection records its queries into it
+through an execute wrapper installed when the connection is created, so
+sync views, async views and ``sync_to_async`` hops are all covered. DRF
+views add ``MetricsMixin`` to split their handler time into serialization
+(view code outside SQL: serializers and row shaping) and rendering.
+
+Finished requests feed in-process histograms, exported in Prometheus text
+format at ``/api/_metrics``. Each worker process keeps its own numbers, so
+scrape every worker (or sum them) when running several.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+
+from . import profiling
+
+_current = ContextVar("jira_request_metrics", default=None)
+
+# Seconds; covers cache hits through slow exports
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+
+class RequestMetrics:
+    """ What one request spent its time on (seconds) """
+
+    __slots__ = ("queries", "db", "serialize", "render", "started", "handler_started", "handler_db")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.started = time.perf_counter()
+        self.handler_started = None
+        self.handler_db = 0.0
+
+    def server_timing(self, total):
+        """ A ``Server-Timing`` header value (durations in milliseconds) """
+        return ", ".join([
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f"serialize;dur={self.serialize * 1000:.1f}",
+            f"render;dur={self.render * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ])
+
+
+def current():
+    """ The ``RequestMetrics`` of the request being handled, if any """
+    return _current.get()
+
+
+def begin():
+    """ Start recording a request; returns ``(metrics, token)`` for ``end`` """
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end(token):
+    _current.reset(token)
+
+
+# ----------------- 🔹 Query Recording 🔹 -----------------
+
+def record_query(execute, sql, params, many, context):
+    """ ``connection.execute_wrapper`` hook counting and timing queries of the current request """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db += time.perf_counter() - started
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """ ``connection_created`` receiver: every new connection reports into the current request """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# ----------------- 🔹 DRF Views 🔹 -----------------
+
+class _TimedRenderer:
+    """ Wraps a response's renderer so ``Response.rendered_content`` reports its time """
+
+    def __init__(self, renderer, metrics):
+        self._renderer = renderer
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._renderer, name)
+
+    def render(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._renderer.render(*args, **kwargs)
+        finally:
+            self._metrics.render += time.perf_counter() - started
+
+
+class MetricsMixin:
+    """ ``APIView`` mixin reporting serialization and render time to ``RequestMetricsMiddleware`` """
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication and permission checks run in here, on the view's thread
+        profiling.follow_view_thread()
+        super().initial(request, *args, **kwargs)
+        metrics = current()
+        if metrics is not None:
+            metrics.handler_started = time.perf_counter()
+            metrics.handler_db = metrics.db
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        metrics = current()
+        if metrics is None:
+            return response
+        if metrics.handler_started is not None:
+            handler = time.perf_counter() - metrics.handler_started
+            metrics.serialize += max(0.0, handler - (metrics.db - metrics.handler_db))
+            metrics.handler_started = None
+        if getattr(response, "accepted_renderer", None) is not None:
+            response.accepted_renderer = _TimedRenderer(response.accepted_renderer, metrics)
+        return response
+
+
+# ----------------- 🔹 Histograms 🔹 -----------------
+
+class Histogram:
+    """ A Prometheus histogram with labels, kept in process memory """
+
+    def __init__(self, name, documentation, buckets, labels=("endpoint", "method")):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, counts[:], total, count) for labels, (counts, total, count) in self._series.items())
+        for label_values, counts, total, count in series:
+            labels = ",".join(f'{name}="{_escape(label)}"' for name, label in zip(self.labels, label_values))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{labels},le="{_format(bound)}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {_format(total)}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class CounterMetric:
+    """ A labelled Prometheus counter, kept in process memory """
+
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            labels = ",".join(f'{name}="{_escape(label)}"' for name, label in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{labels}}} {value}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(number):
+    return repr(float(number))
+
+
+REQUESTS = CounterMetric("jira_requests_total", "Requests handled, by URL name, method and status code.",
+                         ("endpoint", "method", "status"))
+REQUEST_SECONDS = Histogram("jira_request_duration_seconds", "Time from the first middleware to the response.", DURATION_BUCKETS)
+DB_SECONDS = Histogram("jira_request_db_seconds", "Time spent executing SQL per request.", DURATION_BUCKETS)
+QUERIES = Histogram("jira_request_queries", "SQL queries executed per request.", QUERY_BUCKETS)
+SERIALIZE_SECONDS = Histogram("jira_request_serialize_seconds",
+                              "DRF view code outside SQL per request (serializers, row shaping).", DURATION_BUCKETS)
+RENDER_SECONDS = Histogram("jira_request_render_seconds", "Time spent in DRF renderers per request.", DURATION_BUCKETS)
+
+# Outbox worker (outbox.py); these live in the worker process, not the web workers
+OUTBOX_MESSAGES = CounterMetric("jira_outbox_messages_total", "Outbox messages settled, by topic and outcome.",
+                                ("topic", "outcome"))
+OUTBOX_HANDLER_SECONDS = Histogram("jira_outbox_handler_seconds", "Time spent in one outbox handler call.",
+                                   DURATION_BUCKETS, labels=("topic",))
+
+REGISTRY = [
+    REQUESTS, REQUEST_SECONDS, DB_SECONDS, QUERIES, SERIALIZE_SECONDS, RENDER_SECONDS,
+    OUTBOX_MESSAGES, OUTBOX_HANDLER_SECONDS,
+]
+
+
+def observe(endpoint, method, status_code, metrics, total):
+    labels = (endpoint, method)
+    REQUESTS.inc((endpoint, method, str(status_code)))
+    REQUEST_SECONDS.observe(labels, total)
+    DB_SECONDS.observe(labels, metrics.db)
+    QUERIES.observe(labels, metrics.queries)
+    SERIALIZE_SECONDS.observe(labels, metrics.serialize)
+    RENDER_SECONDS.observe(labels, metrics.render)
+
+
+def expose():
+    """ Every metric in Prometheus text exposition format (0.0.4) """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+@csrf_exempt
+@require_GET
+def metrics_view(request):
+    """ ``/api/_metrics``; requires ``Authorization: Bearer <JIRA_METRICS_TOKEN>``, or DEBUG when no token is set """
+    token = getattr(settings, "JIRA_METRICS_TOKEN", "")
+    if not token and not settings.DEBUG:
+        # ✅ Endpoint names, status codes and latencies are not for anonymous callers
+        return HttpResponse("Metrics are disabled; set METRICS_TOKEN\n", status=403, content_type="text/plain")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+    return HttpResponse(expose(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,66 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics, profiling
+
+UNMATCHED = "<unmatched>"
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, DB time, serialization and render time for every
+    request (see ``metrics.py``), adds them as a ``Server-Timing`` header
+    when ``JIRA_SERVER_TIMING`` is on and feeds the ``/api/_metrics``
+    histograms. Also runs the per-request profiler hook (``profiling.py``).
+    Place it first so the totals cover the other middleware too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorded, token = metrics.begin()
+        profile = self.start_profile(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end(token)
+        return self.finish(request, response, recorded, profile)
+
+    async def __acall__(self, request):
+        recorded, token = metrics.begin()
+        profile = self.start_profile(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end(token)
+        return self.finish(request, response, recorded, profile)
+
+    @staticmethod
+    def start_profile(request):
+        mode = profiling.requested_mode(request)
+        return profiling.Profile(mode).start() if mode else None
+
+    def finish(self, request, response, recorded, profile):
+        total = time.perf_counter() - recorded.started
+        match = getattr(request, "resolver_match", None)
+        endpoint = match.view_name if match and match.view_name else UNMATCHED
+        metrics.observe(endpoint, request.method, response.status_code, recorded, total)
+
+        if getattr(settings, "JIRA_SERVER_TIMING", False):
+            response["Server-Timing"] = recorded.server_timing(total)
+        if profile is not None:
+            profile.stop()
+            if profiling.slow_enough(total):
+                response["X-Profile-Dump"] = profile.dump(endpoint).name
+        return response
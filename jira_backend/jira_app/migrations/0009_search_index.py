@@ -0,0 +1,56 @@
+# Full-text search table: FTS5 on SQLite, tsvector + GIN on PostgreSQL
+
+from django.db import migrations
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE jira_app_search USING fts5("
+    "kind UNINDEXED, object_id UNINDEXED, task_id UNINDEXED, project_id UNINDEXED, "
+    "title, body, tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+POSTGRES_CREATE = [
+    "CREATE TABLE jira_app_search ("
+    "rowid bigint PRIMARY KEY, kind varchar(16) NOT NULL, object_id bigint NOT NULL, "
+    "task_id bigint NOT NULL, project_id bigint NOT NULL, title text NOT NULL, body text NOT NULL, "
+    "document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', body), 'B')"
+    ") STORED)",
+    "CREATE INDEX jira_app_search_document_idx ON jira_app_search USING GIN (document)",
+    "CREATE INDEX jira_app_search_project_idx ON jira_app_search (project_id)",
+]
+
+BACKFILL = (
+    "INSERT INTO jira_app_search (rowid, kind, object_id, task_id, project_id, title, body) "
+    "SELECT id * 2, 'task', id, id, project_id, title, COALESCE(description, '') FROM jira_app_task "
+    "UNION ALL "
+    "SELECT c.id * 2 + 1, 'comment', c.id, c.task_id, t.project_id, '', c.text "
+    "FROM jira_app_comment c JOIN jira_app_task t ON t.id = c.task_id"
+)
+
+
+def create_search_table(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements = [SQLITE_CREATE]
+    elif vendor == "postgresql":
+        statements = POSTGRES_CREATE
+    else:
+        return
+    for statement in statements + [BACKFILL]:
+        schema_editor.execute(statement)
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS jira_app_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira_app', '0008_task_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
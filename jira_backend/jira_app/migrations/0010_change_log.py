@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira_app', '0009_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='changes_compacted_through',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('task', 'Task'), ('comment', 'Comment'), ('member', 'Member')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='jira_app.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'id'], name='change_project_cursor_idx'), models.Index(fields=['created_at'], name='change_created_idx')],
+            },
+        ),
+    ]
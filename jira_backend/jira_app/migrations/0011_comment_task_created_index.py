@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira_app', '0010_change_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+        ),
+    ]
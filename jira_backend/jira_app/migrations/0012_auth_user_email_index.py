@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """ Index ``auth_user.email`` so logins by email are an index lookup (the auth app defines no index) """
+
+    dependencies = [
+        ('jira_app', '0011_comment_task_created_index'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS "auth_user_email_idx" ON "auth_user" ("email")',
+            reverse_sql='DROP INDEX IF EXISTS "auth_user_email_idx"',
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:01
+
+import datetime
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncWeek
+
+
+def count_existing_tasks(apps, schema_editor):
+    Task = apps.get_model('jira_app', 'Task')
+    TaskCounter = apps.get_model('jira_app', 'TaskCounter')
+    rows = (
+        Task.objects.annotate(due_week=TruncWeek('deadline', output_field=models.DateField()))
+        .values('project_id', 'assigned_to_id', 'status', 'priority', 'due_week')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    TaskCounter.objects.bulk_create([TaskCounter(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira_app', '0012_auth_user_email_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('to_do', 'To Do'), ('in_progress', 'In Progress'), ('done', 'Done')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=10)),
+                ('due_week', models.DateField(blank=True, null=True)),
+                ('count', models.IntegerField(default=0)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='jira_app.project')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(models.F('project'), django.db.models.functions.comparison.Coalesce('assigned_to', 0), models.F('status'), models.F('priority'), django.db.models.functions.comparison.Coalesce('due_week', models.Value(datetime.date(1, 1, 1))), name='task_counter_key_uniq')],
+            },
+        ),
+        migrations.RunPython(count_existing_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira_app', '0013_task_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('due_soon', 'Due Soon'), ('overdue', 'Overdue')], max_length=10)),
+                ('deadline', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReminderCursor',
+            fields=[
+                ('kind', models.CharField(choices=[('due_soon', 'Due Soon'), ('overdue', 'Overdue')], max_length=10, primary_key=True, serialize=False)),
+                ('scanned_through', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deadline__isnull', False), models.Q(('status', 'done'), _negated=True)), fields=['deadline', 'id'], name='task_open_deadline_idx'),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='jira_app.task'),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['user', 'created_at'], name='reminder_user_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reminder',
+            constraint=models.UniqueConstraint(fields=('task', 'kind', 'deadline'), name='reminder_task_kind_deadline_uniq'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:21
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jira_app', '0014_deadline_reminders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeadLetter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=100)),
+                ('handler', models.CharField(max_length=255)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('attempts', models.PositiveIntegerField()),
+                ('error', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('failed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=100)),
+                ('handler', models.CharField(max_length=255)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('available_at', models.DateTimeField()),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['available_at', 'id'], name='outbox_available_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,10 @@
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 # Project Model
 class Project(models.Model):
@@ -8,10 +13,41 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     team_members = models.ManyToManyField(User, related_name="projects")
+    # Highest change log id removed by compaction; older sync cursors must resync
+    changes_compacted_through = models.BigIntegerField(default=0)
 
     def __str__(self):
         return self.name
 
+# Newest comments embedded in task payloads
+LATEST_COMMENTS = 3
+
+
+# Task QuerySet
+class TaskQuerySet(models.QuerySet):
+    def with_comment_count(self):
+        """ Annotate ``comment_count`` with a correlated subquery (no GROUP BY over tasks) """
+        counts = (
+            Comment.objects.filter(task=models.OuterRef("pk"))
+            .order_by()
+            .values("task")
+            .annotate(count=models.Count("id"))
+            .values("count")
+        )
+        return self.annotate(comment_count=Coalesce(models.Subquery(counts), 0))
+
+    def with_comment_summary(self, latest=LATEST_COMMENTS):
+        """
+        Annotate ``comment_count`` and prefetch the ``latest`` newest comments
+        (with authors) of every task into ``latest_comments``. The prefetch
+        is one windowed query for all tasks, however long the threads are.
+        """
+        newest = Comment.objects.select_related("user").order_by("-created_at", "-id")[:latest]
+        return self.with_comment_count().prefetch_related(
+            models.Prefetch("comments", queryset=newest, to_attr="latest_comments")
+        )
+
+
 # Task Model
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -35,6 +71,39 @@ class Task(models.Model):
     deadline = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
+    @staticmethod
+    def overdue(now=None):
+        """ Open tasks whose deadline has passed; the one definition of overdue (summaries and dashboard) """
+        return models.Q(deadline__lt=now or timezone.now()) & ~models.Q(status="done")
+
+    # Columns making up the dashboard counter key (see counters.py)
+    COUNTER_FIELDS = ("project_id", "assigned_to_id", "status", "priority", "deadline")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # ✅ Keep the counter key as loaded, so saving moves its count without another SELECT
+        if all(name in task.__dict__ for name in cls.COUNTER_FIELDS):
+            from .counters import remember_key
+            remember_key(task)
+        return task
+
+    class Meta:
+        # Composite indexes backing the task list filters and keyset pagination
+        indexes = [
+            models.Index(fields=["project", "status"], name="task_project_status_idx"),
+            models.Index(fields=["project", "assigned_to"], name="task_project_assignee_idx"),
+            models.Index(fields=["project", "deadline"], name="task_project_deadline_idx"),
+            models.Index(fields=["project", "updated_at", "id"], name="task_project_updated_idx"),
+            # Due-time queue for the reminder scheduler: only open tasks with a deadline
+            models.Index(
+                fields=["deadline", "id"], name="task_open_deadline_idx",
+                condition=models.Q(deadline__isnull=False) & ~models.Q(status="done"),
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -46,6 +115,150 @@ class Comment(models.Model):
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Backs per-task comment pages ordered by (created_at, id)
+            models.Index(fields=["task", "created_at", "id"], name="comment_task_created_idx"),
+        ]
+
+    def get_project_id(self):
+        """ The owning project, without a query when the task is already loaded """
+        if Comment.task.is_cached(self):
+            return self.task.project_id
+        return Task.objects.filter(pk=self.task_id).values_list("project_id", flat=True).first()
+
     def __str__(self):
         return f"Comment by {self.user.username} on {self.task.title}"
 
+
+# Change Log Model (feeds the per-project "changes since" sync endpoint)
+class Change(models.Model):
+    KIND_CHOICES = [
+        ("project", "Project"),
+        ("task", "Task"),
+        ("comment", "Comment"),
+        ("member", "Member"),
+    ]
+
+    ACTION_CHOICES = [
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("deleted", "Deleted"),
+    ]
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="changes")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "id"], name="change_project_cursor_idx"),
+            models.Index(fields=["created_at"], name="change_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} {self.action}"
+
+
+# Stands in for a NULL due week in the counter key (NULLs never conflict in a unique index)
+NO_DUE_WEEK = datetime.date(1, 1, 1)
+
+
+# Dashboard Counter Model (denormalized task counts, maintained by ``counters.py``)
+class TaskCounter(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="task_counters")
+    assigned_to = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    # Monday of the deadline's (local) week: weeks before the current one are overdue without a task
+    # scan, and a key covers a week of deadlines rather than (nearly) one task per due date
+    due_week = models.DateField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                "project", Coalesce("assigned_to", 0), "status", "priority", Coalesce("due_week", models.Value(NO_DUE_WEEK)),
+                name="task_counter_key_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id}/{self.assigned_to_id}/{self.status}/{self.priority}/{self.due_week}: {self.count}"
+
+
+# Deadline Reminder Model (emitted by ``reminders.py``)
+class Reminder(models.Model):
+    KIND_CHOICES = [
+        ("due_soon", "Due Soon"),
+        ("overdue", "Overdue"),
+    ]
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="reminders")
+    # The assignee when the reminder fired (none for unassigned tasks)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name="reminders")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # The deadline this reminder is about; moving the deadline earns a new reminder
+    deadline = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["task", "kind", "deadline"], name="reminder_task_kind_deadline_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="reminder_user_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} reminder for task {self.task_id}"
+
+
+# How far each reminder kind has scanned the due-time queue
+class ReminderCursor(models.Model):
+    kind = models.CharField(max_length=10, primary_key=True, choices=Reminder.KIND_CHOICES)
+    # Fire times up to here have been handled; the deadlines scanned end at this plus the kind's lead time
+    scanned_through = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.kind} through {self.scanned_through}"
+
+
+# Outbox Model (side effects of writes, run by the ``run_outbox`` worker; see ``outbox.py``)
+class OutboxMessage(models.Model):
+    topic = models.CharField(max_length=100)
+    # Dotted path of the one handler this message is for, so each handler retries on its own
+    handler = models.CharField(max_length=255)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Not claimable before this (set to the retry time after a failure)
+    available_at = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    # Lease: the worker that claimed the message owns it until locked_until
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["available_at", "id"], name="outbox_available_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} -> {self.handler} ({self.attempts} attempts)"
+
+
+# Dead Letter Model (outbox messages that used up their attempts)
+class DeadLetter(models.Model):
+    topic = models.CharField(max_length=100)
+    handler = models.CharField(max_length=255)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    attempts = models.PositiveIntegerField()
+    error = models.TextField()
+    created_at = models.DateTimeField()
+    failed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.topic} -> {self.handler} failed after {self.attempts} attempts"
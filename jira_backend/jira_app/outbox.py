@@ -0,0 +1,250 @@
+"""
+Transactional outbox: side effects of task and comment writes run after the
+request, in the ``run_outbox`` worker.
+
+Write paths call ``enqueue(topic, payload)`` inside the transaction making
+the write, which appends one ``OutboxMessage`` per handler subscribed to the
+topic: the messages commit or roll back with the write, and topics nobody
+handles cost nothing. Handlers are plain ``handler(topic, payload)``
+callables, subscribed with ``register`` or listed by dotted path in
+``JIRA_OUTBOX_HANDLERS`` (``{"task.created": ["..."], "*": ["..."]}``);
+``post_webhook`` is subscribed to the board events when ``JIRA_WEBHOOK_URL``
+is set.
+
+``OutboxWorker`` claims batches with a lease (``locked_by``/``locked_until``):
+``SELECT ... FOR UPDATE SKIP LOCKED`` where the database has it, and on
+SQLite a conditional ``UPDATE`` inside the (serialized) write transaction.
+Handlers run on a thread pool; successes are deleted, failures are retried
+with exponential backoff and jitter, and after ``JIRA_OUTBOX_MAX_ATTEMPTS``
+the message moves to ``DeadLetter``. A worker that dies mid-batch loses its
+lease and the messages are claimed again, so delivery is at least once and
+handlers must tolerate repeats.
+"""
+import datetime
+import json
+import random
+import threading
+import time
+import traceback
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import metrics
+from .models import DeadLetter, OutboxMessage
+
+# Board events offered to the webhook
+EVENT_TOPICS = ("task.created", "task.updated", "task.deleted", "comment.created", "reminder.due_soon", "reminder.overdue")
+
+_registry = {}
+_subscriptions = {}
+
+
+def handler_name(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def register(topic, func=None):
+    """ Subscribe ``func`` to ``topic`` (``"*"`` for every topic); usable as a decorator """
+    def decorator(func):
+        name = handler_name(func)
+        _registry[name] = func
+        names = _subscriptions.setdefault(topic, [])
+        if name not in names:
+            names.append(name)
+        return func
+    return decorator(func) if func is not None else decorator
+
+
+def unregister(topic, func):
+    names = _subscriptions.get(topic, [])
+    if handler_name(func) in names:
+        names.remove(handler_name(func))
+
+
+def handlers_for(topic):
+    """ Dotted names of every handler subscribed to ``topic`` """
+    configured = getattr(settings, "JIRA_OUTBOX_HANDLERS", {})
+    names = [
+        *_subscriptions.get(topic, ()), *_subscriptions.get("*", ()),
+        *configured.get(topic, ()), *configured.get("*", ()),
+    ]
+    if getattr(settings, "JIRA_WEBHOOK_URL", "") and topic in EVENT_TOPICS:
+        names.append(handler_name(post_webhook))
+    return list(dict.fromkeys(names))
+
+
+def resolve(name):
+    if name not in _registry:
+        _registry[name] = import_string(name)
+    return _registry[name]
+
+
+def enqueue(topic, payload):
+    """ Append ``payload`` for every handler of ``topic``; call inside the transaction making the write """
+    return enqueue_many([(topic, payload)])
+
+
+def enqueue_many(messages):
+    """ ``enqueue`` for several ``(topic, payload)`` pairs in one insert """
+    now = timezone.now()
+    rows = [
+        OutboxMessage(topic=topic, handler=name, payload=payload, available_at=now)
+        for topic, payload in messages
+        for name in handlers_for(topic)
+    ]
+    return OutboxMessage.objects.bulk_create(rows) if rows else []
+
+
+# ----------------- 🔹 Handlers 🔹 -----------------
+
+def post_webhook(topic, payload):
+    """ POST ``{"type": topic, **payload}`` as JSON to ``JIRA_WEBHOOK_URL``; non-2xx answers raise (and retry) """
+    body = json.dumps({"type": topic, **payload}).encode()
+    request = urllib.request.Request(
+        settings.JIRA_WEBHOOK_URL, data=body, method="POST",
+        headers={"Content-Type": "application/json", "X-Jira-Event": topic},
+    )
+    with urllib.request.urlopen(request, timeout=getattr(settings, "JIRA_WEBHOOK_TIMEOUT_SECONDS", 10)) as response:
+        response.read()
+
+
+# ----------------- 🔹 Worker 🔹 -----------------
+
+def retry_delay(attempts, base=None, cap=None):
+    """ Seconds before retry number ``attempts``: exponential from ``base``, capped, with jitter """
+    base = getattr(settings, "JIRA_OUTBOX_RETRY_BASE_SECONDS", 2) if base is None else base
+    cap = getattr(settings, "JIRA_OUTBOX_RETRY_MAX_SECONDS", 3600) if cap is None else cap
+    delay = min(cap, base * 2 ** max(0, attempts - 1))
+    # Jitter spreads retries of messages that failed together (e.g. a webhook outage)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _run(message):
+    """ Run one message's handler on a pool thread; ``(error or None, seconds)`` """
+    started = time.perf_counter()
+    try:
+        resolve(message.handler)(message.topic, message.payload)
+        return None, time.perf_counter() - started
+    except Exception:
+        return traceback.format_exc(limit=5), time.perf_counter() - started
+    finally:
+        close_old_connections()
+
+
+class OutboxWorker:
+    """ Claims, runs and settles outbox batches; ``run`` loops until ``stop`` is set """
+
+    def __init__(self, worker_id=None, batch_size=None, threads=None, lease_seconds=None, max_attempts=None,
+                 retry_base=None, retry_cap=None):
+        self.worker_id = worker_id or f"worker-{uuid.uuid4().hex[:12]}"
+        self.batch_size = batch_size or getattr(settings, "JIRA_OUTBOX_BATCH_SIZE", 100)
+        self.threads = threads or getattr(settings, "JIRA_OUTBOX_WORKER_THREADS", 8)
+        self.lease_seconds = lease_seconds or getattr(settings, "JIRA_OUTBOX_LEASE_SECONDS", 60)
+        self.max_attempts = max_attempts or getattr(settings, "JIRA_OUTBOX_MAX_ATTEMPTS", 8)
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.totals = {"delivered": 0, "retried": 0, "dead": 0}
+        self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="jira-outbox")
+
+    def claim(self, now=None):
+        """ Lease up to ``batch_size`` due messages to this worker; each claim counts as an attempt """
+        now = now or timezone.now()
+        until = now + datetime.timedelta(seconds=self.lease_seconds)
+        claimable = Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+        with transaction.atomic():
+            due = OutboxMessage.objects.filter(claimable, available_at__lte=now).order_by("available_at", "id")
+            if connection.features.has_select_for_update_skip_locked:
+                due = due.select_for_update(skip_locked=True)
+            ids = list(due.values_list("id", flat=True)[: self.batch_size])
+            if not ids:
+                return []
+            # ✅ The conditional UPDATE is the lease where SKIP LOCKED is missing (SQLite serializes writers)
+            OutboxMessage.objects.filter(claimable, id__in=ids).update(
+                locked_by=self.worker_id, locked_until=until, attempts=F("attempts") + 1,
+            )
+            return list(OutboxMessage.objects.filter(id__in=ids, locked_by=self.worker_id, locked_until=until))
+
+    def settle(self, outcomes, now=None):
+        """
+        Delete delivered messages, reschedule failed ones and dead-letter the
+        exhausted ones. Messages whose lease ran out and were claimed by
+        another worker meanwhile are left to that worker.
+        """
+        now = now or timezone.now()
+        settled = {"delivered": [], "retried": [], "dead": []}
+        with transaction.atomic():
+            mine = OutboxMessage.objects.filter(locked_by=self.worker_id)
+            owned = set(
+                mine.filter(id__in=[message.id for message, _ in outcomes]).select_for_update().values_list("id", flat=True)
+            )
+            for message, error in outcomes:
+                if message.id not in owned:
+                    continue
+                if error is None:
+                    settled["delivered"].append(message)
+                elif message.attempts >= self.max_attempts:
+                    message.last_error = error
+                    settled["dead"].append(message)
+                else:
+                    message.last_error = error
+                    message.available_at = now + datetime.timedelta(
+                        seconds=retry_delay(message.attempts, self.retry_base, self.retry_cap)
+                    )
+                    message.locked_by, message.locked_until = "", None
+                    settled["retried"].append(message)
+
+            mine.filter(id__in=[message.id for message in settled["delivered"] + settled["dead"]]).delete()
+            OutboxMessage.objects.bulk_update(settled["retried"], ["available_at", "locked_by", "locked_until", "last_error"])
+            DeadLetter.objects.bulk_create([
+                DeadLetter(
+                    topic=message.topic, handler=message.handler, payload=message.payload, attempts=message.attempts,
+                    error=message.last_error, created_at=message.created_at,
+                )
+                for message in settled["dead"]
+            ])
+
+        for outcome, messages in settled.items():
+            self.totals[outcome] += len(messages)
+            for message in messages:
+                metrics.OUTBOX_MESSAGES.inc((message.topic, outcome))
+        return {outcome: len(messages) for outcome, messages in settled.items()}
+
+    def run_once(self):
+        """ Claim one batch, run its handlers in parallel and settle it; per-outcome counts """
+        batch = self.claim()
+        if not batch:
+            return {"delivered": 0, "retried": 0, "dead": 0}
+        outcomes = []
+        for message, (error, seconds) in zip(batch, self._pool.map(_run, batch)):
+            outcomes.append((message, error))
+            metrics.OUTBOX_HANDLER_SECONDS.observe((message.topic,), seconds)
+        return self.settle(outcomes)
+
+    def next_available(self):
+        """ When the earliest unleased message becomes claimable (``None`` if there is none) """
+        now = timezone.now()
+        waiting = OutboxMessage.objects.filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+        return waiting.order_by("available_at", "id").values_list("available_at", flat=True).first()
+
+    def run(self, stop=None, poll_seconds=None):
+        """ Process batches back to back while there is work, otherwise sleep until the next message is due """
+        stop = stop or threading.Event()
+        poll_seconds = poll_seconds or getattr(settings, "JIRA_OUTBOX_POLL_SECONDS", 1.0)
+        while not stop.is_set():
+            close_old_connections()
+            if sum(self.run_once().values()):
+                continue
+            # New messages commit without notice, so never sleep longer than one poll interval
+            due = self.next_available()
+            delay = poll_seconds if due is None else (due - timezone.now()).total_seconds()
+            stop.wait(min(max(delay, 0.01), poll_seconds))
+
+    def close(self):
+        self._pool.shutdown(wait=True)
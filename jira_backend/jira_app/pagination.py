@@ -0,0 +1,160 @@
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a stable, unique ordering.
+
+    Every page is fetched with a ``WHERE (a, b) > (last_a, last_b)`` style
+    filter instead of OFFSET, so page N costs the same as page 1. The last
+    ordering field must be unique (``id``) to break ties. Ordering fields may
+    be nullable model fields (NULLs sort last) or queryset annotations.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 50
+    max_page_size = 200
+    ordering = ("updated_at", "id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """ ``paginate_queryset`` for async views """
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        """ The ordered, cursor-filtered slice holding this page plus one row """
+        self.request = request
+        self.model = queryset.model
+        self.limit = self.get_page_size(request)
+
+        self.annotations = queryset.query.annotations
+        position = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.get_order_by())
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        # Fetch one extra row to know whether there is a next page
+        return queryset[: self.limit + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.limit
+        self.page = rows[: self.limit]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {"next": self.get_next_link(), "results": data}
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # ----------------- Cursor handling -----------------
+
+    def get_order_by(self):
+        order_by = []
+        for name in self.ordering:
+            field, descending = self.split_ordering(name)
+            expression = F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True)
+            order_by.append(expression)
+        return order_by
+
+    def get_position_filter(self, position):
+        """ Expand ``(f1, f2, ...) > (v1, v2, ...)`` into OR-ed equality prefixes """
+        clauses = []
+        for index, (name, value) in enumerate(position):
+            after = self.after(name, value)
+            if after is None:
+                continue
+            equal = [self.equal(prev, prev_value) for prev, prev_value in position[:index]]
+            clauses.append(reduce(and_, equal + [after]))
+        if not clauses:
+            return Q(pk__in=[])
+        return reduce(or_, clauses)
+
+    def equal(self, name, value):
+        field = self.split_ordering(name)[0]
+        if value is None:
+            return Q(**{f"{field}__isnull": True})
+        return Q(**{field: value})
+
+    def after(self, name, value):
+        """ Rows strictly after ``value`` on one column, with NULLs sorted last """
+        field, descending = self.split_ordering(name)
+        if value is None:
+            return None
+        clause = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+        if self.is_nullable(field):
+            clause |= Q(**{f"{field}__isnull": True})
+        return clause
+
+    def is_nullable(self, field):
+        if field in self.annotations:
+            return False
+        return self.model._meta.get_field(field).null
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        # Pages may hold model instances or ``.values()`` dicts
+        get = last.get if isinstance(last, dict) else lambda field: getattr(last, field)
+        values = [self.encode_value(get(self.split_ordering(name)[0])) for name in self.ordering]
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        return None
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                (name, self.decode_value(name, value))
+                for name, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def decode_value(self, name, value):
+        if value is None:
+            return None
+        field = self.split_ordering(name)[0]
+        if field in self.annotations:
+            return self.annotations[field].output_field.to_python(value)
+        return self.model._meta.get_field(field).to_python(value)
+
+    @staticmethod
+    def encode_value(value):
+        # isoformat keeps microseconds, which keyset equality depends on
+        return value.isoformat() if hasattr(value, "isoformat") else value
+
+    @staticmethod
+    def split_ordering(name):
+        return (name[1:], True) if name.startswith("-") else (name, False)
@@ -0,0 +1,256 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Exists, OuterRef
+from rest_framework.permissions import BasePermission
+
+from .models import Project, Task, Comment
+
+ProjectMembership = Project.team_members.through
+
+
+# ----------------- 🔹 Membership Lookups 🔹 -----------------
+
+def _cache():
+    return caches[getattr(settings, "JIRA_MEMBERSHIP_CACHE", "default")]
+
+
+def _cache_timeout():
+    return getattr(settings, "JIRA_MEMBERSHIP_CACHE_TIMEOUT", 0)
+
+
+def _version_key(project_id):
+    return f"jira:membership-version:{project_id}"
+
+
+def _project_version(project_id):
+    cache = _cache()
+    key = _version_key(project_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp so an evicted version key never resurrects stale entries
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def _aproject_version(project_id):
+    cache = _cache()
+    key = _version_key(project_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_membership_version(project_ids):
+    """ Invalidate cached membership answers for ``project_ids`` (called on team changes) """
+    if not _cache_timeout():
+        return
+    cache = _cache()
+    for project_id in project_ids:
+        try:
+            cache.incr(_version_key(project_id))
+        except ValueError:
+            cache.set(_version_key(project_id), time.time_ns(), timeout=None)
+
+
+def _user_version_key(user_id):
+    return f"jira:user-membership-version:{user_id}"
+
+
+def user_membership_version(user_id):
+    """
+    The version stamped into access tokens as ``mv``; bumped whenever the
+    user joins or leaves a project so older embedded project lists are no
+    longer trusted. Needs a cache shared by all workers to be meaningful.
+    """
+    cache = _cache()
+    key = _user_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # A fresh seed never equals an older token's ``mv``, so an evicted key only costs a database check
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def auser_membership_version(user_id):
+    cache = _cache()
+    key = _user_version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_user_membership_versions(user_ids):
+    """ Stop trusting project lists embedded in the access tokens of ``user_ids`` """
+    cache = _cache()
+    for user_id in user_ids:
+        try:
+            cache.incr(_user_version_key(user_id))
+        except ValueError:
+            cache.set(_user_version_key(user_id), time.time_ns(), timeout=None)
+
+
+def claimed_project_ids(user):
+    """ Project ids from a stateless user's access token, ``None`` if absent or out of date """
+    return getattr(user, "claimed_project_ids", None)
+
+
+def query_membership(user_id, project_id):
+    """ A single EXISTS against the (project_id, user_id) unique index """
+    return ProjectMembership.objects.filter(project_id=project_id, user_id=user_id).exists()
+
+
+async def aquery_membership(user_id, project_id):
+    return await ProjectMembership.objects.filter(project_id=project_id, user_id=user_id).aexists()
+
+
+def _request_memo(request):
+    memo = getattr(request, "_project_memberships", None)
+    if memo is None:
+        memo = request._project_memberships = {}
+    return memo
+
+
+def is_project_member(request, project_id):
+    """
+    Is ``request.user`` a team member of ``project_id``?
+
+    Answers come from the access token's project list when it is current
+    (stateless auth), are memoized on the request, and across requests in a
+    versioned cache when ``JIRA_MEMBERSHIP_CACHE_TIMEOUT`` is set (use a
+    shared cache such as Redis when running several workers).
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return False
+    project_id = int(project_id)
+
+    memo = _request_memo(request)
+    if project_id in memo:
+        return memo[project_id]
+
+    claimed = claimed_project_ids(user)
+    if claimed is not None:
+        memo[project_id] = project_id in claimed
+        return memo[project_id]
+
+    timeout = _cache_timeout()
+    if timeout:
+        key = f"jira:member:{project_id}:{_project_version(project_id)}:{user.id}"
+        member = _cache().get(key)
+        if member is None:
+            member = query_membership(user.id, project_id)
+            _cache().set(key, member, timeout)
+    else:
+        member = query_membership(user.id, project_id)
+
+    memo[project_id] = member
+    return member
+
+
+async def ais_project_member(request, project_id):
+    """ ``is_project_member`` for async views, sharing the same memo and cache entries """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return False
+    project_id = int(project_id)
+
+    memo = _request_memo(request)
+    if project_id in memo:
+        return memo[project_id]
+
+    claimed = await user.aclaimed_project_ids() if hasattr(user, "aclaimed_project_ids") else None
+    if claimed is not None:
+        memo[project_id] = project_id in claimed
+        return memo[project_id]
+
+    timeout = _cache_timeout()
+    if timeout:
+        key = f"jira:member:{project_id}:{await _aproject_version(project_id)}:{user.id}"
+        member = await _cache().aget(key)
+        if member is None:
+            member = await aquery_membership(user.id, project_id)
+            await _cache().aset(key, member, timeout)
+    else:
+        member = await aquery_membership(user.id, project_id)
+
+    memo[project_id] = member
+    return member
+
+
+def member_project_ids(request, project_ids):
+    """ The subset of ``project_ids`` the user belongs to, resolved with at most one query """
+    user = request.user
+    project_ids = {int(project_id) for project_id in project_ids}
+    if not user or not user.is_authenticated or not project_ids:
+        return set()
+
+    memo = _request_memo(request)
+    missing = project_ids - memo.keys()
+    claimed = claimed_project_ids(user) if missing else None
+    if claimed is not None:
+        for project_id in missing:
+            memo[project_id] = project_id in claimed
+    elif missing:
+        found = set(
+            ProjectMembership.objects.filter(user_id=user.id, project_id__in=missing).values_list("project_id", flat=True)
+        )
+        for project_id in missing:
+            memo[project_id] = project_id in found
+    return {project_id for project_id in project_ids if memo[project_id]}
+
+
+def with_membership(queryset, request, project_field="project_id"):
+    """ Annotate ``is_member`` so a row and its membership check come back in one query """
+    members = ProjectMembership.objects.filter(project_id=OuterRef(project_field), user_id=request.user.id)
+    return queryset.annotate(is_member=Exists(members))
+
+
+def member_rows(queryset, request, project_field="project_id"):
+    """ Keep only rows of the user's projects; a correlated ``EXISTS``, so it also guards an ``UPDATE`` """
+    members = ProjectMembership.objects.filter(project_id=OuterRef(project_field), user_id=request.user.id)
+    return queryset.filter(Exists(members))
+
+
+def remember_membership(request, project_id, is_member):
+    """ Seed the per-request memo from a membership answer fetched alongside other data """
+    _request_memo(request)[int(project_id)] = bool(is_member)
+
+
+def project_id_for(obj):
+    if isinstance(obj, Project):
+        return obj.pk
+    if isinstance(obj, Task):
+        return obj.project_id
+    if isinstance(obj, Comment):
+        return obj.get_project_id()
+    raise TypeError(f"Cannot resolve a project for {type(obj).__name__}")
+
+
+# ----------------- 🔹 Permission Classes 🔹 -----------------
+
+class IsProjectMember(BasePermission):
+    """
+    Allow access only to team members of the project in the URL
+    (``view.project_url_kwarg``, ``project_id`` by default) or of the
+    object passed to ``check_object_permissions``.
+    """
+
+    message = "Not authorized or project not found"
+
+    def has_permission(self, request, view):
+        project_id = view.kwargs.get(getattr(view, "project_url_kwarg", "project_id"))
+        if project_id is None:
+            return True
+        return is_project_member(request, project_id)
+
+    def has_object_permission(self, request, view, obj):
+        project_id = project_id_for(obj)
+        return project_id is not None and is_project_member(request, project_id)
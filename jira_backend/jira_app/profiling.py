@@ -0,0 +1,144 @@
+"""
+On-demand profiling of single requests for ``RequestMetricsMiddleware``.
+
+With ``JIRA_PROFILE_REQUESTS`` on, a request sent with ``X-Profile: cprofile``
+runs under ``cProfile`` and one sent with ``X-Profile: stacks`` is watched
+by a sampling profiler that snapshots the handling thread's stack every few
+milliseconds. Profiling costs CPU and disk, so the header is honoured only
+with ``X-Profile-Token: <JIRA_METRICS_TOKEN>`` (or under DEBUG when no token
+is set), the same gate as ``/api/_metrics``. ``JIRA_PROFILE_SAMPLE_RATE`` additionally samples that
+fraction of all requests with the stack sampler. Either way a dump is only
+written for requests slower than ``JIRA_PROFILE_SLOW_MS``, to
+``JIRA_PROFILE_DIR``: ``.prof`` files for ``pstats``/snakeviz, ``.stacks``
+files in collapsed format for flamegraph.pl or speedscope.
+
+Under ASGI the middleware runs on the event loop while sync views run on a
+worker thread, so DRF views call ``follow_view_thread`` as they start and
+the stack sampler moves to the thread actually handling the request.
+"""
+import cProfile
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+MODES = ("cprofile", "stacks")
+
+_active = ContextVar("jira_profile", default=None)
+
+
+def _may_request(request):
+    """ The ``/api/_metrics`` gate: the metrics token in ``X-Profile-Token``, or DEBUG when no token is set """
+    token = getattr(settings, "JIRA_METRICS_TOKEN", "")
+    if not token:
+        return settings.DEBUG
+    return constant_time_compare(request.headers.get("X-Profile-Token", ""), token)
+
+
+def requested_mode(request):
+    """ The profiler to run for ``request``, or ``None`` """
+    if not getattr(settings, "JIRA_PROFILE_REQUESTS", False):
+        return None
+    mode = request.headers.get("X-Profile", "").strip().lower()
+    if mode in MODES and _may_request(request):
+        return mode
+    rate = getattr(settings, "JIRA_PROFILE_SAMPLE_RATE", 0.0)
+    if rate and random.random() < rate:
+        return "stacks"
+    return None
+
+
+def slow_enough(seconds):
+    return seconds * 1000 >= getattr(settings, "JIRA_PROFILE_SLOW_MS", 0)
+
+
+def _dump_path(endpoint, suffix):
+    directory = Path(getattr(settings, "JIRA_PROFILE_DIR", "profiles"))
+    directory.mkdir(parents=True, exist_ok=True)
+    safe = "".join(char if char.isalnum() or char in "-_" else "_" for char in endpoint)
+    return directory / f"{time.strftime('%Y%m%d-%H%M%S')}-{safe}-{uuid.uuid4().hex[:8]}{suffix}"
+
+
+class StackSampler:
+    """ Samples one thread's stack from a background thread and counts identical stacks """
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="jira-stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, endpoint):
+        path = _dump_path(endpoint, ".stacks")
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+        return path
+
+
+def follow_view_thread():
+    """ Point the current request's stack sampler at the calling thread (no-op when not sampling) """
+    profile = _active.get()
+    if profile is not None and profile._sampler is not None:
+        profile._sampler.thread_id = threading.get_ident()
+
+
+class Profile:
+    """ One profiled request: ``start()``, handle it, ``stop()``, then ``dump()`` if it was slow """
+
+    def __init__(self, mode):
+        self.mode = mode
+        self._profiler = None
+        self._sampler = None
+        self._token = None
+
+    def start(self):
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._sampler = StackSampler(threading.get_ident()).start()
+        # ✅ Context variables reach sync_to_async threads, so the view can find its sampler
+        self._token = _active.set(self)
+        return self
+
+    def stop(self):
+        _active.reset(self._token)
+        if self._profiler is not None:
+            self._profiler.disable()
+        else:
+            self._sampler.stop()
+
+    def dump(self, endpoint):
+        if self._profiler is not None:
+            path = _dump_path(endpoint, ".prof")
+            self._profiler.dump_stats(path)
+            return path
+        return self._sampler.dump(endpoint)
@@ -0,0 +1,311 @@
+"""
+Real-time board updates over WebSockets.
+
+Clients connect to ``ws/projects/<id>/?token=<access token>`` on the ASGI
+application (``jira_backend/asgi.py``) and receive one JSON text frame per
+event::
+
+    {"type": "task.updated", "project": 3, "data": {...}}
+
+Views call ``publish_event`` on their write paths. Events are buffered until
+the surrounding transaction commits (rolled-back writes never reach clients),
+coalesced so only the latest event per object is sent, and encoded to JSON
+once; every subscriber receives the same string.
+
+Subscriptions are authorized at connect and again every
+``JIRA_WEBSOCKET_REAUTH_SECONDS``, when the access token expires, and as soon
+as a membership change for the project commits (``revoke_subscriptions``,
+called from the team-membership signals). A failed check closes the socket
+with ``CLOSE_NOT_AUTHORIZED``.
+
+The fan-out is pluggable through ``JIRA_BROADCAST_BACKEND`` (a dotted path to
+a ``Broadcaster``). ``InProcessBroadcaster`` is the default: it reaches
+subscribers connected to the same process, which covers development, tests
+and single-worker deployments. Multi-worker setups need a shared backend
+(e.g. one built on Redis pub/sub) implementing the same interface.
+"""
+import asyncio
+import json
+import re
+import threading
+import time
+import weakref
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .permissions import query_membership
+
+SUBSCRIBER_QUEUE_SIZE = 1000
+CLOSE_NOT_AUTHORIZED = 4403
+CLOSE_TOO_SLOW = 4008
+
+_PATH_RE = re.compile(r"^/?ws/projects/(?P<project_id>\d+)/?$")
+
+
+# ----------------- 🔹 Broadcasters 🔹 -----------------
+
+class Broadcaster:
+    """ Fan-out interface: deliver an already-encoded message to a project's subscribers """
+
+    def publish(self, project_id, message):
+        raise NotImplementedError
+
+    def subscribe(self, project_id, user_id):
+        """ Return a ``Subscription`` bound to the running event loop """
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def revoke(self, project_id, user_ids=None):
+        """ Make the subscriptions of ``user_ids`` (``None`` = everyone) to ``project_id`` re-authorize """
+        raise NotImplementedError
+
+
+class Subscription:
+    def __init__(self, broadcaster, project_id, user_id):
+        self.broadcaster = broadcaster
+        self.project_id = project_id
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+        self.recheck = asyncio.Event()
+
+    def deliver(self, message):
+        """ Called on the subscriber's loop; a full queue marks the client as too slow """
+        if self.overflowed:
+            return
+        if self.queue.full():
+            # Drop the backlog; the writer closes the socket so the client resyncs
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = None
+        self.queue.put_nowait(message)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broadcaster.unsubscribe(self)
+
+
+class InProcessBroadcaster(Broadcaster):
+    """ Subscribers in this process only; thread-safe for publishers running in sync views """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, project_id, user_id):
+        subscription = Subscription(self, project_id, user_id)
+        with self._lock:
+            self._subscriptions.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.project_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscriptions.pop(subscription.project_id, None)
+
+    def publish(self, project_id, message):
+        with self._lock:
+            subscribers = list(self._subscriptions.get(project_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                self.unsubscribe(subscription)
+
+    def revoke(self, project_id, user_ids=None):
+        with self._lock:
+            subscribers = [
+                subscription for subscription in self._subscriptions.get(project_id, ())
+                if user_ids is None or subscription.user_id in user_ids
+            ]
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.recheck.set)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self, project_id):
+        with self._lock:
+            return len(self._subscriptions.get(project_id, ()))
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster():
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                path = getattr(settings, "JIRA_BROADCAST_BACKEND", "jira_app.realtime.InProcessBroadcaster")
+                _broadcaster = import_string(path)()
+    return _broadcaster
+
+
+# ----------------- 🔹 Publishing 🔹 -----------------
+
+class _EventBatch:
+    """ The events of one transaction, registered once with ``transaction.on_commit`` """
+
+    def __init__(self):
+        self.events = {}
+        self.sent = False
+
+    def add(self, project_id, event_type, data):
+        key = (project_id, event_type.split(".")[0], data["id"])
+        previous = self.events.pop(key, None)
+        if previous and previous["type"].endswith(".created"):
+            if event_type.endswith(".deleted"):
+                return  # Created and deleted in the same transaction: nobody needs to know
+            event_type = previous["type"]
+        self.events[key] = {"type": event_type, "project": project_id, "data": data}
+
+    def __call__(self):
+        self.sent = True
+        broadcaster = get_broadcaster()
+        for event in self.events.values():
+            broadcaster.publish(event["project"], json.dumps(event, cls=JSONEncoder))
+
+
+# Connection alias -> weak reference to the open transaction's batch, per thread. The only strong
+# reference is the on_commit registration, so a rolled-back transaction (which drops its callbacks)
+# takes the batch with it and the next transaction starts a new one.
+_pending = threading.local()
+
+
+def _current_batch():
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    batches = getattr(_pending, "batches", None)
+    if batches is None:
+        batches = _pending.batches = {}
+    ref = batches.get(connection.alias)
+    batch = ref() if ref is not None else None
+    if batch is None or batch.sent:
+        batch = _EventBatch()
+        transaction.on_commit(batch, using=connection.alias)
+        batches[connection.alias] = weakref.ref(batch)
+    return batch
+
+
+def publish_event(project_id, event_type, data):
+    """
+    Send ``event_type`` (e.g. ``"task.updated"``) to ``project_id``'s subscribers.
+
+    Inside a transaction, delivery waits for the commit and a later event for
+    the same object replaces an earlier one (a ``created`` followed by
+    ``updated`` is still reported as ``created``). Outside one it is sent
+    immediately.
+    """
+    batch = _current_batch()
+    if batch is None:
+        batch = _EventBatch()
+        batch.add(project_id, event_type, data)
+        batch()
+    else:
+        batch.add(project_id, event_type, data)
+
+
+def revoke_subscriptions(project_ids, user_ids=None):
+    """ Once the current transaction commits, re-authorize open subscriptions (``user_ids=None`` = all) """
+    project_ids, user_ids = list(project_ids), None if user_ids is None else set(user_ids)
+
+    def revoke():
+        broadcaster = get_broadcaster()
+        for project_id in project_ids:
+            broadcaster.revoke(project_id, user_ids)
+
+    transaction.on_commit(revoke)
+
+
+# ----------------- 🔹 ASGI WebSocket Application 🔹 -----------------
+
+def _authorize(token, project_id):
+    """ Validate the JWT and check membership; returns ``(user id, token expiry)`` or ``(None, None)`` """
+    close_old_connections()
+    try:
+        authenticator = JWTAuthentication()
+        validated = authenticator.get_validated_token(token)
+        user = authenticator.get_user(validated)
+        if query_membership(user.id, project_id):
+            return user.id, validated.get("exp")
+        return None, None
+    except (InvalidToken, AuthenticationFailed):
+        return None, None
+    finally:
+        close_old_connections()
+
+
+async def websocket_application(scope, receive, send):
+    """ One connection = one project subscription; incoming frames are ignored """
+    match = _PATH_RE.match(scope["path"])
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    if not match:
+        await send({"type": "websocket.close", "code": 4404})
+        return
+
+    project_id = int(match.group("project_id"))
+    token = parse_qs(scope.get("query_string", b"").decode()).get("token", [""])[0]
+    user_id, expires = await sync_to_async(_authorize)(token, project_id) if token else (None, None)
+    if user_id is None:
+        await send({"type": "websocket.close", "code": CLOSE_NOT_AUTHORIZED})
+        return
+
+    subscription = get_broadcaster().subscribe(project_id, user_id)
+    await send({"type": "websocket.accept"})
+
+    async def pump():
+        while True:
+            text = await subscription.get()
+            if text is None:
+                await send({"type": "websocket.close", "code": CLOSE_TOO_SLOW})
+                return
+            await send({"type": "websocket.send", "text": text})
+
+    async def drain():
+        while (await receive())["type"] != "websocket.disconnect":
+            pass
+
+    async def guard():
+        nonlocal expires
+        while True:
+            timeout = getattr(settings, "JIRA_WEBSOCKET_REAUTH_SECONDS", 300)
+            if expires is not None:
+                timeout = min(timeout, max(0, expires - time.time()))
+            try:
+                await asyncio.wait_for(subscription.recheck.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            subscription.recheck.clear()
+            checked_id, expires = await sync_to_async(_authorize)(token, project_id)
+            if checked_id != user_id:
+                await send({"type": "websocket.close", "code": CLOSE_NOT_AUTHORIZED})
+                return
+
+    tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(drain()), asyncio.ensure_future(guard())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        subscription.close()
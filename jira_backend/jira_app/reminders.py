@@ -0,0 +1,172 @@
+"""
+Deadline reminders: "due soon" and "overdue" notices for open tasks.
+
+Each reminder kind fires at a fixed lead time before the deadline (``due_soon``
+at ``JIRA_REMINDER_DUE_SOON_MINUTES``, ``overdue`` at the deadline itself).
+The open tasks' deadlines form a queue served by the partial
+``task_open_deadline_idx`` index, and a ``ReminderCursor`` per kind records
+how far it has been consumed. ``scan`` walks only the slice of the index
+between the cursor and now, in keyset batches, writing one ``Reminder`` per
+task (idempotent on task, kind and deadline) and publishing
+``reminder.<kind>`` board events and outbox messages. ``next_fire_time`` is
+one index lookup, so the ``run_reminders`` worker sleeps until the next
+deadline comes due instead of polling the table.
+
+Deadline and status edits behind the cursor are handled as they are saved:
+``reschedule`` (called from the task ``post_save`` signal and the bulk
+endpoint) emits the reminders a task missed because its new deadline falls
+in a slice already scanned. Edits ahead of the cursor need nothing; the scan
+reaches them. Imports are left to the scan too, so loading historic tasks
+does not flood anyone with overdue notices.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Reminder, ReminderCursor, Task
+from .outbox import enqueue_many
+from .realtime import publish_event
+
+# Fields whose change can make a task due again
+RESCHEDULE_FIELDS = {"deadline", "status"}
+
+
+def lead_times():
+    """ ``{kind: timedelta before the deadline}``, latest-firing kind last """
+    return {
+        "due_soon": datetime.timedelta(minutes=getattr(settings, "JIRA_REMINDER_DUE_SOON_MINUTES", 24 * 60)),
+        "overdue": datetime.timedelta(0),
+    }
+
+
+def open_deadlines():
+    """ Open tasks with a deadline; filters match ``task_open_deadline_idx`` so it serves the scan """
+    return Task.objects.filter(deadline__isnull=False).exclude(status="done")
+
+
+def _emit(kind, rows):
+    """ Store reminders for ``rows`` (task value dicts) and announce the new ones; returns how many were new """
+    if not rows:
+        return 0
+    existing = set(
+        Reminder.objects.filter(task_id__in=[row["id"] for row in rows], kind=kind).values_list("task_id", "deadline")
+    )
+    fresh = [row for row in rows if (row["id"], row["deadline"]) not in existing]
+    # ignore_conflicts covers a concurrent scheduler or save inserting the same reminder
+    Reminder.objects.bulk_create(
+        [Reminder(task_id=row["id"], user_id=row["assigned_to_id"], kind=kind, deadline=row["deadline"]) for row in fresh],
+        ignore_conflicts=True,
+    )
+    events = []
+    for row in fresh:
+        data = {"id": row["id"], "title": row["title"], "assigned_to": row["assigned_to_id"], "deadline": row["deadline"]}
+        publish_event(row["project_id"], f"reminder.{kind}", data)
+        events.append((f"reminder.{kind}", {"project": row["project_id"], "data": data}))
+    # Delivery (e-mail, chat, webhooks) happens in the outbox worker
+    enqueue_many(events)
+    return len(fresh)
+
+
+# ----------------- 🔹 Scheduler 🔹 -----------------
+
+def scan(now=None, batch_size=None):
+    """
+    Emit every reminder whose fire time passed since the last scan; ``{kind: reminders emitted}``.
+
+    The first scan of a kind starts its cursor at ``now``: deadlines that had
+    already passed before reminders were switched on are not reported.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, "JIRA_REMINDER_BATCH_SIZE", 1000)
+    emitted = {}
+    for kind, lead in lead_times().items():
+        cursor, _ = ReminderCursor.objects.get_or_create(kind=kind, defaults={"scanned_through": now})
+        emitted[kind] = 0
+        last = None
+        while True:
+            # One transaction per batch: the reminders and the cursor move together
+            with transaction.atomic():
+                cursor = ReminderCursor.objects.select_for_update().get(kind=kind)
+                if cursor.scanned_through >= now:
+                    break
+                due = open_deadlines().filter(deadline__gt=cursor.scanned_through + lead, deadline__lte=now + lead)
+                if last is not None:
+                    due = due.filter(Q(deadline__gt=last[0]) | Q(deadline=last[0], id__gt=last[1]))
+                rows = list(
+                    due.order_by("deadline", "id").values("id", "project_id", "title", "assigned_to_id", "deadline")[:batch_size]
+                )
+                emitted[kind] += _emit(kind, rows)
+                if len(rows) < batch_size:
+                    cursor.scanned_through = now
+                else:
+                    # Ties on the last deadline are rescanned after a crash; the unique constraint absorbs them
+                    last = (rows[-1]["deadline"], rows[-1]["id"])
+                    cursor.scanned_through = last[0] - lead - datetime.timedelta(microseconds=1)
+                cursor.save(update_fields=["scanned_through"])
+            if len(rows) < batch_size:
+                break
+    return emitted
+
+
+def next_fire_time():
+    """ When the next reminder comes due (``None`` if no open task has a deadline ahead of the cursors) """
+    cursors = dict(ReminderCursor.objects.values_list("kind", "scanned_through"))
+    times = []
+    for kind, lead in lead_times().items():
+        after = cursors.get(kind)
+        if after is None:
+            continue
+        deadline = (
+            open_deadlines().filter(deadline__gt=after + lead).order_by("deadline", "id").values_list("deadline", flat=True).first()
+        )
+        if deadline is not None:
+            times.append(deadline - lead)
+    return min(times, default=None)
+
+
+# ----------------- 🔹 Incremental Updates 🔹 -----------------
+
+def _deadline(task):
+    # Instances saved from create() or a form keep the assigned value, which may still be an ISO string
+    return Task._meta.get_field("deadline").to_python(task.deadline)
+
+
+def reschedule(tasks, now=None):
+    """
+    Emit the reminders ``tasks`` (just saved) missed because their deadline
+    now falls in a slice the scan already passed. Call inside the writing
+    transaction; only the latest-firing kind is sent (an overdue task gets no
+    "due soon").
+
+    The cursors are read once per call, and only when some task fires before
+    ``now``: scans never move a cursor past the time they run at, so tasks
+    firing later are left to the scan without a query.
+    """
+    now = now or timezone.now()
+    leads = lead_times()
+    first_lead = max(leads.values())
+    due = []
+    for task in tasks:
+        deadline = _deadline(task)
+        if deadline is not None and task.status != "done" and deadline - first_lead <= now:
+            due.append((task, deadline))
+    if not due:
+        return
+    cursors = dict(ReminderCursor.objects.values_list("kind", "scanned_through"))
+    pending = {}
+    for kind, lead in leads.items():
+        scanned_through = cursors.get(kind)
+        for task, deadline in due:
+            if scanned_through is not None and deadline - lead <= scanned_through:
+                pending[task.id] = (kind, task, deadline)
+    by_kind = {}
+    for kind, task, deadline in pending.values():
+        by_kind.setdefault(kind, []).append({
+            "id": task.id, "project_id": task.project_id, "title": task.title,
+            "assigned_to_id": task.assigned_to_id, "deadline": deadline,
+        })
+    for kind, rows in by_kind.items():
+        _emit(kind, rows)
@@ -0,0 +1,56 @@
+"""
+Fast renderers for large read-only responses.
+
+``FastJSONRenderer`` encodes with orjson when it is installed and produces
+the same bytes as DRF's ``JSONRenderer`` (compact separators, UTF-8, escaped
+U+2028/U+2029, DRF's datetime/decimal formatting); it falls back to DRF for
+indented output or when orjson is missing. ``MessagePackRenderer`` answers
+``Accept: application/msgpack`` when the ``msgpack`` package is installed.
+"""
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+_encoder = JSONEncoder()
+
+
+def _default(value):
+    """ Types orjson/msgpack do not handle natively get DRF's representation """
+    return _encoder.default(value)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Datetimes go through DRF's encoder so the output matches JSONRenderer exactly
+        ret = orjson.dumps(data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_default, use_bin_type=True, datetime=False)
+
+
+# Renderer stack for the read-heavy list endpoints
+FAST_RENDERER_CLASSES = [FastJSONRenderer] + ([MessagePackRenderer] if msgpack else []) + [BrowsableAPIRenderer]
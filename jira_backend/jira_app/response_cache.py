@@ -0,0 +1,124 @@
+"""
+Read-through cache for serialized project trees and task details.
+
+Entries are keyed by the owning project's version number, which every write
+to the project, its tasks, comments or team bumps (see ``signals.py`` and the
+bulk task path). Bumping makes old entries unreachable, so nothing has to be
+deleted and there is no invalidation race. The cache alias is
+``JIRA_RESPONSE_CACHE`` (``"responses"``); any Django cache backend works:
+``SizeBoundedLocMemCache`` for one process, ``FileBasedCache`` or
+``RedisCache`` when several workers must share entries and version bumps.
+Caching is enabled when ``JIRA_RESPONSE_CACHE_TIMEOUT`` is positive.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _cache():
+    return caches[getattr(settings, "JIRA_RESPONSE_CACHE", "responses")]
+
+
+def _timeout():
+    return getattr(settings, "JIRA_RESPONSE_CACHE_TIMEOUT", 0)
+
+
+def enabled():
+    return _timeout() > 0
+
+
+def _version_key(project_id):
+    return f"jira:project-version:{project_id}"
+
+
+def project_version(project_id):
+    cache = _cache()
+    key = _version_key(project_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp so an evicted version never points back at stale entries
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def _aproject_version(project_id):
+    cache = _cache()
+    key = _version_key(project_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_project_versions(project_ids):
+    """ Invalidate every cached response belonging to ``project_ids`` """
+    if not enabled():
+        return
+    cache = _cache()
+    for project_id in set(project_ids):
+        if project_id is None:
+            continue
+        try:
+            cache.incr(_version_key(project_id))
+        except ValueError:
+            cache.set(_version_key(project_id), time.time_ns(), timeout=None)
+
+
+def cached(name, object_id, project_id, build):
+    """
+    Return ``(data, hit)`` for the ``name``/``object_id`` response, calling
+    ``build()`` on a miss. Entries live under the project's current version.
+    """
+    if not enabled():
+        return build(), False
+
+    cache = _cache()
+    key = f"jira:response:{name}:{object_id}:{project_version(project_id)}"
+    data = cache.get(key)
+    if data is not None:
+        _count("hits")
+        return data, True
+
+    _count("misses")
+    data = build()
+    cache.set(key, data, _timeout())
+    return data, False
+
+
+async def acached(name, object_id, project_id, build):
+    """ ``cached`` for async views; ``build`` is a coroutine function """
+    if not enabled():
+        return await build(), False
+
+    cache = _cache()
+    key = f"jira:response:{name}:{object_id}:{await _aproject_version(project_id)}"
+    data = await cache.aget(key)
+    if data is not None:
+        _count("hits")
+        return data, True
+
+    _count("misses")
+    data = await build()
+    await cache.aset(key, data, _timeout())
+    return data, False
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def cache_stats():
+    """ Hit/miss counters for this process """
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / total if total else 0.0
+    return stats
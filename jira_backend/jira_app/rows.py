@@ -0,0 +1,156 @@
+"""
+Serializer-free row builders for the large read-only list endpoints.
+
+Each builder reads ``.values()`` querysets and assembles plain dicts with
+exactly the keys, key order and value formats of the matching serializer
+(``TaskSerializer``, ``UserSerializer``, ``ProjectSerializer``), skipping
+model instantiation and per-field ``to_representation`` calls. Pair them
+with ``renderers.FastJSONRenderer``/``MessagePackRenderer``.
+"""
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from rest_framework.fields import DateTimeField
+
+from .models import LATEST_COMMENTS, Project, Task, Comment
+
+ProjectMembership = Project.team_members.through
+
+TASK_VALUES = (
+    "id", "title", "description", "status", "priority", "deadline", "updated_at", "project_id",
+    "assigned_to_id", "assigned_to__username", "assigned_to__email", "comment_count",
+)
+USER_VALUES = ("id", "username", "email")
+
+_datetime = DateTimeField().to_representation
+
+
+def format_datetime(value):
+    """ Same output as the serializers' ``DateTimeField`` """
+    return None if value is None else _datetime(value)
+
+
+# ----------------- 🔹 Tasks 🔹 -----------------
+
+def task_values(queryset, ordering=()):
+    """
+    ``queryset`` as value rows carrying everything ``task_rows`` needs, plus
+    any ordering annotations (e.g. ``priority_rank``) so keyset pagination
+    can build its cursor from the rows.
+    """
+    extra = [name.lstrip("-") for name in ordering if name.lstrip("-") not in TASK_VALUES]
+    return queryset.with_comment_count().values(*TASK_VALUES, *extra)
+
+
+def _latest_comments(task_ids, latest):
+    newest = Window(RowNumber(), partition_by=[F("task_id")], order_by=[F("created_at").desc(), F("id").desc()])
+    return (
+        Comment.objects.filter(task_id__in=task_ids)
+        .annotate(position=newest)
+        .filter(position__lte=latest)
+        .order_by("task_id", "position")
+        .values("id", "task_id", "user__username", "text", "created_at")
+    )
+
+
+def _group_comments(rows):
+    by_task = {}
+    for row in rows:
+        by_task.setdefault(row["task_id"], []).append({
+            "id": row["id"],
+            "user": row["user__username"],
+            "text": row["text"],
+            "created_at": format_datetime(row["created_at"]),
+        })
+    return by_task
+
+
+def latest_comment_rows(task_ids, latest=LATEST_COMMENTS):
+    """ The ``latest`` newest comments of every task in one windowed query, keyed by task id """
+    return _group_comments(_latest_comments(task_ids, latest))
+
+
+async def alatest_comment_rows(task_ids, latest=LATEST_COMMENTS):
+    return _group_comments([row async for row in _latest_comments(task_ids, latest)])
+
+
+def _task_row(row, comments):
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "description": row["description"],
+        "status": row["status"],
+        "priority": row["priority"],
+        "assigned_to": {
+            "id": row["assigned_to_id"],
+            "username": row["assigned_to__username"],
+            "email": row["assigned_to__email"],
+        } if row["assigned_to_id"] is not None else None,
+        "deadline": format_datetime(row["deadline"]),
+        "comment_count": row["comment_count"],
+        "latest_comments": comments.get(row["id"], []),
+        "updated_at": format_datetime(row["updated_at"]),
+        "project": row["project_id"],
+    }
+
+
+def task_rows(rows):
+    """ ``TaskSerializer`` output for value rows from ``task_values`` """
+    rows = list(rows)
+    comments = latest_comment_rows([row["id"] for row in rows]) if rows else {}
+    return [_task_row(row, comments) for row in rows]
+
+
+async def atask_rows(rows):
+    """ ``task_rows`` for async views; ``rows`` must already be fetched """
+    comments = await alatest_comment_rows([row["id"] for row in rows]) if rows else {}
+    return [_task_row(row, comments) for row in rows]
+
+
+# ----------------- 🔹 Users & Projects 🔹 -----------------
+
+def user_rows(queryset):
+    """ ``UserSerializer`` output """
+    return list(queryset.values(*USER_VALUES))
+
+
+async def auser_rows(queryset):
+    return [row async for row in queryset.values(*USER_VALUES).aiterator()]
+
+
+def project_rows(projects):
+    """
+    ``ProjectSerializer`` output (members and full task rows included) for
+    ``projects`` in four queries: projects, members, tasks and latest comments.
+    """
+    projects = list(projects.values("id", "name", "description", "created_at", "updated_at"))
+    project_ids = [project["id"] for project in projects]
+    if not project_ids:
+        return []
+
+    members = {}
+    memberships = (
+        ProjectMembership.objects.filter(project_id__in=project_ids)
+        .order_by("project_id", "user_id")
+        .values("project_id", "user_id", "user__username", "user__email")
+    )
+    for row in memberships:
+        members.setdefault(row["project_id"], []).append(
+            {"id": row["user_id"], "username": row["user__username"], "email": row["user__email"]}
+        )
+
+    tasks = {}
+    for row in task_rows(task_values(Task.objects.filter(project_id__in=project_ids)).order_by("project_id", "id")):
+        tasks.setdefault(row["project"], []).append(row)
+
+    return [
+        {
+            "id": project["id"],
+            "team_members": members.get(project["id"], []),
+            "tasks": tasks.get(project["id"], []),
+            "name": project["name"],
+            "description": project["description"],
+            "created_at": format_datetime(project["created_at"]),
+            "updated_at": format_datetime(project["updated_at"]),
+        }
+        for project in projects
+    ]
@@ -0,0 +1,220 @@
+"""
+Full-text search over task titles, descriptions and comments.
+
+Documents live in a single ``jira_app_search`` table maintained incrementally
+by the signal handlers in ``signals.py``. The table is an FTS5 virtual table
+on SQLite and a ``tsvector`` table with a GIN index on PostgreSQL; the
+backend is picked from the database vendor or from the
+``JIRA_SEARCH_BACKEND`` setting (a dotted path to a ``SearchBackend``).
+
+Each task and comment maps to a fixed row id (``2 * id`` for tasks,
+``2 * id + 1`` for comments) so updates and deletes are primary-key
+operations rather than scans.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .models import Project, Task
+
+SEARCH_TABLE = "jira_app_search"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def task_rowid(task_id):
+    return task_id * 2
+
+
+def comment_rowid(comment_id):
+    return comment_id * 2 + 1
+
+
+def membership_table():
+    return Project.team_members.through._meta.db_table
+
+
+class SearchBackend:
+    """ Interface every search backend implements """
+
+    def index_task(self, task):
+        self.index_tasks([task])
+
+    def index_tasks(self, tasks):
+        """ Index many tasks at once, e.g. after ``bulk_create``/``bulk_update`` (which skip signals) """
+        rows = [self._task_row(task) for task in tasks]
+        if rows:
+            self._upsert(rows)
+
+    def index_comment(self, comment):
+        project_id = comment.get_project_id()
+        if project_id is not None:
+            self._upsert([self._comment_row(comment, project_id)])
+
+    def index_comments(self, comments, project_id):
+        """ Index many comments of one project at once (bulk paths) """
+        rows = [self._comment_row(comment, project_id) for comment in comments]
+        if rows:
+            self._upsert(rows)
+
+    def remove_task(self, task_id):
+        self._delete([task_rowid(task_id)])
+
+    def remove_tasks(self, task_ids):
+        self._delete([task_rowid(task_id) for task_id in task_ids])
+
+    def remove_comment(self, comment_id):
+        self._delete([comment_rowid(comment_id)])
+
+    def remove_comments(self, comment_ids):
+        self._delete([comment_rowid(comment_id) for comment_id in comment_ids])
+
+    def search(self, query, user_id, offset, limit):
+        """ Return ranked hits for ``query`` within the projects ``user_id`` belongs to """
+        raise NotImplementedError
+
+    def rebuild(self):
+        """ Re-index every task and comment from scratch """
+        raise NotImplementedError
+
+    def _upsert(self, rows):
+        raise NotImplementedError
+
+    def _delete(self, rowids):
+        if not rowids:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [[rowid] for rowid in rowids])
+
+    @staticmethod
+    def _task_row(task):
+        return [task_rowid(task.id), "task", task.id, task.id, task.project_id, task.title, task.description or ""]
+
+    @staticmethod
+    def _comment_row(comment, project_id):
+        return [comment_rowid(comment.id), "comment", comment.id, comment.task_id, project_id, "", comment.text]
+
+    @staticmethod
+    def _hits(rows):
+        return [
+            {
+                "type": kind,
+                "id": object_id,
+                "task_id": task_id,
+                "project_id": project_id,
+                "title": title,
+                "snippet": snippet,
+                "rank": rank,
+            }
+            for kind, object_id, task_id, project_id, title, snippet, rank in rows
+        ]
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """ SQLite FTS5 backend, ranked with bm25 (titles weigh more than bodies) """
+
+    def _upsert(self, rows):
+        # FTS5 tables have no ON CONFLICT support, so replace by rowid
+        self._delete([row[0] for row in rows])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, kind, object_id, task_id, project_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    @staticmethod
+    def build_match(query):
+        """ Quote every term (so user input cannot inject FTS syntax) and prefix-match the last one """
+        terms = ['"%s"' % term for term in _TOKEN_RE.findall(query)]
+        if not terms:
+            return None
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def search(self, query, user_id, offset, limit):
+        match = self.build_match(query)
+        if match is None:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT s.kind, s.object_id, s.task_id, s.project_id, t.title, "
+                f"snippet({SEARCH_TABLE}, -1, '[', ']', '…', 12), bm25({SEARCH_TABLE}, 0, 0, 0, 0, 10.0, 1.0) AS score "
+                f"FROM {SEARCH_TABLE} s JOIN {Task._meta.db_table} t ON t.id = s.task_id "
+                f"WHERE {SEARCH_TABLE} MATCH %s "
+                f"AND s.project_id IN (SELECT project_id FROM {membership_table()} WHERE user_id = %s) "
+                "ORDER BY score, s.rowid LIMIT %s OFFSET %s",
+                [match, user_id, limit, offset],
+            )
+            # bm25 is "lower is better"; flip it so clients can treat rank as a score
+            return self._hits((*row[:6], -row[6]) for row in cursor.fetchall())
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+            cursor.execute(REBUILD_SQL)
+
+
+class PostgresSearchBackend(SearchBackend):
+    """ PostgreSQL backend over a stored, weighted ``tsvector`` column with a GIN index """
+
+    config = "english"
+
+    def _upsert(self, rows):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, kind, object_id, task_id, project_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s) "
+                "ON CONFLICT (rowid) DO UPDATE SET project_id = EXCLUDED.project_id, "
+                "title = EXCLUDED.title, body = EXCLUDED.body",
+                rows,
+            )
+
+    def search(self, query, user_id, offset, limit):
+        if not _TOKEN_RE.search(query):
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT s.kind, s.object_id, s.task_id, s.project_id, t.title, "
+                f"ts_headline(%s, s.title || ' ' || s.body, q, 'StartSel=[,StopSel=],MaxWords=12'), "
+                f"ts_rank(s.document, q) AS score "
+                f"FROM {SEARCH_TABLE} s JOIN {Task._meta.db_table} t ON t.id = s.task_id, "
+                f"websearch_to_tsquery(%s, %s) q "
+                f"WHERE s.document @@ q "
+                f"AND s.project_id IN (SELECT project_id FROM {membership_table()} WHERE user_id = %s) "
+                "ORDER BY score DESC, s.rowid LIMIT %s OFFSET %s",
+                [self.config, self.config, query, user_id, limit, offset],
+            )
+            return self._hits(cursor.fetchall())
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {SEARCH_TABLE}")
+            cursor.execute(REBUILD_SQL)
+
+
+# Used by rebuild(); migration 0009 keeps its own frozen copy for the initial backfill
+REBUILD_SQL = (
+    f"INSERT INTO {SEARCH_TABLE} (rowid, kind, object_id, task_id, project_id, title, body) "
+    "SELECT id * 2, 'task', id, id, project_id, title, COALESCE(description, '') FROM jira_app_task "
+    "UNION ALL "
+    "SELECT c.id * 2 + 1, 'comment', c.id, c.task_id, t.project_id, '', c.text "
+    "FROM jira_app_comment c JOIN jira_app_task t ON t.id = c.task_id"
+)
+
+BACKENDS = {
+    "sqlite": "jira_app.search.SQLiteFTSBackend",
+    "postgresql": "jira_app.search.PostgresSearchBackend",
+}
+
+_backend = None
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "JIRA_SEARCH_BACKEND", None) or BACKENDS.get(connection.vendor)
+        _backend = import_string(path)() if path else None
+    return _backend
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Project, Task, Comment
+from .models import LATEST_COMMENTS, Project, Task, Comment
 
 # User Serializer
 class UserSerializer(serializers.ModelSerializer):
@@ -18,11 +18,16 @@ class CommentSerializer(serializers.ModelSerializer):
 
 class TaskSerializer(serializers.ModelSerializer):
     assigned_to = serializers.SerializerMethodField()
-    comments = CommentSerializer(many=True, read_only=True)  # ✅ Include comments
+    # ✅ Full threads are paged via /tasks/<id>/comments/; tasks carry a count and the newest few
+    comment_count = serializers.SerializerMethodField()
+    latest_comments = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
-        fields = ["id", "title", "description", "status", "priority", "assigned_to", "deadline", "comments", "updated_at", "project"]
+        fields = [
+            "id", "title", "description", "status", "priority", "assigned_to", "deadline",
+            "comment_count", "latest_comments", "updated_at", "project",
+        ]
 
     def get_assigned_to(self, obj):
         if obj.assigned_to:
@@ -33,6 +38,38 @@ class TaskSerializer(serializers.ModelSerializer):
             }
         return None
 
+    def get_comment_count(self, obj):
+        # Annotated by Task.objects.with_comment_summary(); fall back to a query otherwise
+        count = getattr(obj, "comment_count", None)
+        return obj.comments.count() if count is None else count
+
+    def get_latest_comments(self, obj):
+        comments = getattr(obj, "latest_comments", None)
+        if comments is None:
+            comments = obj.comments.select_related("user").order_by("-created_at", "-id")[:LATEST_COMMENTS]
+        return CommentSerializer(comments, many=True).data
+
+
+# Minimal Task Serializer (for `return=minimal` responses)
+class TaskMinimalSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Task
+        fields = ["id", "status", "priority", "deadline", "updated_at"]
+
+
+# Sync Serializers (rows of the "changes since" feed; comments travel as their own changes)
+class TaskSyncSerializer(TaskSerializer):
+    comment_count = None
+    latest_comments = None
+
+    class Meta(TaskSerializer.Meta):
+        fields = [field for field in TaskSerializer.Meta.fields if field not in ("comment_count", "latest_comments")]
+
+
+class CommentSyncSerializer(CommentSerializer):
+    class Meta(CommentSerializer.Meta):
+        fields = ["id", "task", "user", "text", "created_at"]
+
 
 # Project Serializer
 class ProjectSerializer(serializers.ModelSerializer):
@@ -41,5 +78,18 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
-        fields = "__all__"
+        exclude = ["changes_compacted_through"]
+
+
 
+# Bulk Task Item Serializer
+class BulkTaskItemSerializer(serializers.Serializer):
+    """ Validates one item of a bulk task request; related ids are checked in bulk by the caller """
+    id = serializers.IntegerField(required=False)
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, allow_null=True, required=False)
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    project = serializers.IntegerField()
+    assigned_to = serializers.IntegerField(allow_null=True, required=False)
+    deadline = serializers.DateTimeField(allow_null=True, required=False)
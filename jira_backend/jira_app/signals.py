@@ -0,0 +1,228 @@
+from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import changes, counters, realtime, reminders
+from .models import Project, Task, Comment
+from .permissions import bump_membership_version, bump_user_membership_versions
+from .response_cache import bump_project_versions, enabled as response_cache_enabled
+from .search import get_search_backend
+
+
+# ----------------- 🔹 Search Index 🔹 -----------------
+
+SEARCHABLE_TASK_FIELDS = {"title", "description", "project"}
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, raw=False, update_fields=None, **kwargs):
+    backend = get_search_backend()
+    if not backend or raw:
+        return
+    # Status/priority/deadline saves with update_fields leave the indexed text untouched
+    if update_fields is not None and not SEARCHABLE_TASK_FIELDS & set(update_fields):
+        return
+    backend.index_task(instance)
+
+
+@receiver(post_delete, sender=Task)
+def unindex_task(sender, instance, **kwargs):
+    backend = get_search_backend()
+    if backend:
+        backend.remove_task(instance.id)
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, raw=False, **kwargs):
+    backend = get_search_backend()
+    if backend and not raw:
+        backend.index_comment(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, **kwargs):
+    backend = get_search_backend()
+    if backend:
+        backend.remove_comment(instance.id)
+
+
+# ----------------- 🔹 Membership Cache 🔹 -----------------
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def team_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove"):
+        project_ids = pk_set if reverse else [instance.pk]
+        user_ids = [instance.pk] if reverse else pk_set
+    elif action == "pre_clear":
+        project_ids = list(instance.projects.values_list("id", flat=True)) if reverse else [instance.pk]
+        user_ids = [instance.pk] if reverse else list(instance.team_members.values_list("id", flat=True))
+    else:
+        return
+    bump_membership_version(project_ids)
+    bump_project_versions(project_ids)
+    bump_user_membership_versions(user_ids)
+    if action != "post_add":
+        # Open WebSocket subscriptions re-check membership once the removal commits
+        realtime.revoke_subscriptions(project_ids, user_ids)
+
+
+@receiver(pre_delete, sender=Project)
+def project_deleting(sender, instance, **kwargs):
+    # The cascade skips m2m_changed; members' tokens must stop listing the project
+    bump_user_membership_versions(instance.team_members.values_list("id", flat=True))
+    realtime.revoke_subscriptions([instance.pk])
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    # Memberships go with the user (no m2m_changed), so close the user's subscriptions here
+    realtime.revoke_subscriptions(instance.projects.values_list("id", flat=True), [instance.pk])
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    bump_membership_version([instance.pk])
+
+
+# ----------------- 🔹 Change Log 🔹 -----------------
+
+@receiver(post_save, sender=Project)
+def log_project_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        changes.record(instance.pk, "project", [instance.pk], "created" if created else "updated")
+
+
+@receiver(post_save, sender=Task)
+def log_task_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        changes.record(instance.project_id, "task", [instance.pk], "created" if created else "updated")
+
+
+@receiver(post_delete, sender=Task)
+def log_task_deleted(sender, instance, origin=None, **kwargs):
+    # Tasks removed along with their project need no tombstone (the log goes too)
+    if changes.started_by(origin, Task):
+        changes.record(instance.project_id, "task", [instance.pk], "deleted")
+
+
+@receiver(post_save, sender=Comment)
+def log_comment_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        changes.record(instance.get_project_id(), "comment", [instance.pk], "created" if created else "updated")
+
+
+@receiver(post_delete, sender=Comment)
+def log_comment_deleted(sender, instance, origin=None, **kwargs):
+    # A deleted task's tombstone implies its comments are gone
+    if changes.started_by(origin, Comment):
+        project_id = instance.get_project_id()
+        if project_id is not None:
+            changes.record(project_id, "comment", [instance.pk], "deleted")
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def log_team_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    change = "created" if action == "post_add" else "deleted"
+    if action == "pre_clear":
+        pk_set = set(instance.projects.values_list("id", flat=True) if reverse
+                     else instance.team_members.values_list("id", flat=True))
+    if reverse:
+        for project_id in pk_set:
+            changes.record(project_id, "member", [instance.pk], change)
+    else:
+        changes.record(instance.pk, "member", pk_set, change)
+
+
+# ----------------- 🔹 Response Cache 🔹 -----------------
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_written(sender, instance, **kwargs):
+    bump_project_versions([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_written(sender, instance, **kwargs):
+    bump_project_versions([instance.project_id])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_written(sender, instance, **kwargs):
+    if response_cache_enabled():
+        bump_project_versions([instance.get_project_id()])
+
+
+# Cached trees embed users as members, assignees and comment authors
+CACHED_USER_FIELDS = {"username", "email"}
+
+
+@receiver(post_save, sender=User)
+def user_written(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # New users appear nowhere yet; logins (last_login, rehashed passwords) change nothing shown
+    if created or raw or not response_cache_enabled():
+        return
+    if update_fields is not None and not CACHED_USER_FIELDS & set(update_fields):
+        return
+    projects = Project.objects.filter(
+        Q(Exists(Project.team_members.through.objects.filter(project=OuterRef("pk"), user=instance)))
+        | Q(Exists(Task.objects.filter(project=OuterRef("pk"), assigned_to=instance)))
+        | Q(Exists(Comment.objects.filter(task__project=OuterRef("pk"), user=instance)))
+    )
+    bump_project_versions(projects.values_list("id", flat=True))
+
+
+# ----------------- 🔹 Dashboard Counters 🔹 -----------------
+
+@receiver(pre_save, sender=Task)
+def remember_counter_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    # New rows have no previous key; a hand-built instance with a pk may be overwriting one
+    if raw or instance.pk is None or counters.loaded_key(instance) is not None:
+        return
+    if update_fields is not None and not counters.COUNTED_FIELDS & set(update_fields):
+        return
+    # Only instances built by hand or loaded with deferred fields get here; loaded ones carry their key
+    row = Task.objects.filter(pk=instance.pk).values_list(*counters.KEY_FIELDS[:-1], "deadline").first()
+    if row:
+        instance._counter_key = row[:-1] + (counters.due_week(row[-1]),)
+
+
+@receiver(post_save, sender=Task)
+def count_task_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not counters.COUNTED_FIELDS & set(update_fields):
+        return
+    previous = counters.loaded_key(instance)
+    if created:
+        counters.track(added=[instance])
+    elif previous is not None:
+        counters.track(removed=[previous], added=[instance])
+    counters.remember_key(instance)
+
+
+@receiver(post_delete, sender=Task)
+def count_task_deleted(sender, instance, origin=None, **kwargs):
+    # A deleted project takes its counter rows with it
+    if changes.started_by(origin, Task):
+        counters.track(removed=[instance])
+
+
+@receiver(pre_delete, sender=User)
+def count_user_deleting(sender, instance, **kwargs):
+    counters.unassign_user(instance.pk)
+
+
+# ----------------- 🔹 Deadline Reminders 🔹 -----------------
+
+@receiver(post_save, sender=Task)
+def reschedule_task_reminders(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not reminders.RESCHEDULE_FIELDS & set(update_fields):
+        return
+    reminders.reschedule([instance])
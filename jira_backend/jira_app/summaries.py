@@ -0,0 +1,102 @@
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Project, Task, Comment
+
+
+def _member_count_subquery():
+    members = (
+        Project.team_members.through.objects.filter(project=OuterRef("pk"))
+        .values("project")
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(members, output_field=IntegerField()), 0)
+
+
+def _project_rows(projects):
+    return (
+        projects.annotate(member_count=_member_count_subquery())
+        .order_by("id")
+        .values("id", "name", "description", "created_at", "updated_at", "member_count")
+    )
+
+
+def _task_groups(project_ids):
+    # 🔹 One grouped scan of tasks for status/priority/overdue counts and latest update
+    return (
+        Task.objects.filter(project_id__in=project_ids)
+        .values("project_id", "status", "priority")
+        .annotate(
+            count=Count("id"),
+            overdue=Count("id", filter=Task.overdue()),
+            last_update=Max("updated_at"),
+        )
+        .order_by()
+    )
+
+
+def _comment_groups(project_ids):
+    return (
+        Comment.objects.filter(task__project_id__in=project_ids)
+        .values("task__project_id")
+        .annotate(last_comment=Max("created_at"))
+        .order_by()
+    )
+
+
+def summarize_projects(projects):
+    """
+    Build sidebar summaries for ``projects`` with all counting done in SQL.
+
+    Runs three queries no matter how many projects, tasks or comments exist:
+    the projects (with member counts), task counts grouped by
+    project/status/priority, and the latest comment per project.
+    """
+    projects = list(_project_rows(projects))
+    project_ids = [project["id"] for project in projects]
+    return _summaries(projects, _task_groups(project_ids), _comment_groups(project_ids))
+
+
+async def asummarize_projects(projects):
+    """ ``summarize_projects`` for async views """
+    projects = [project async for project in _project_rows(projects)]
+    project_ids = [project["id"] for project in projects]
+    task_groups = [group async for group in _task_groups(project_ids)]
+    comment_groups = [group async for group in _comment_groups(project_ids)]
+    return _summaries(projects, task_groups, comment_groups)
+
+
+def _summaries(projects, task_groups, comment_groups):
+    summaries = {}
+    for project in projects:
+        summaries[project["id"]] = {
+            "id": project["id"],
+            "name": project["name"],
+            "description": project["description"],
+            "created_at": project["created_at"],
+            "member_count": project["member_count"],
+            "task_count": 0,
+            "status_counts": {value: 0 for value, _ in Task.STATUS_CHOICES},
+            "priority_counts": {value: 0 for value, _ in Task.PRIORITY_CHOICES},
+            "overdue_count": 0,
+            "last_activity": project["updated_at"],
+        }
+
+    for group in task_groups:
+        summary = summaries[group["project_id"]]
+        summary["task_count"] += group["count"]
+        summary["status_counts"][group["status"]] = summary["status_counts"].get(group["status"], 0) + group["count"]
+        summary["priority_counts"][group["priority"]] = summary["priority_counts"].get(group["priority"], 0) + group["count"]
+        summary["overdue_count"] += group["overdue"]
+        _touch(summary, group["last_update"])
+
+    for group in comment_groups:
+        _touch(summaries[group["task__project_id"]], group["last_comment"])
+
+    return list(summaries.values())
+
+
+def _touch(summary, moment):
+    if moment and (summary["last_activity"] is None or moment > summary["last_activity"]):
+        summary["last_activity"] = moment
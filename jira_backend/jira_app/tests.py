@@ -1,3 +1,1969 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection, transaction
+from django.db.utils import ConnectionHandler
+from django.db.models import Max, Q
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from jira_app import (
+    async_views, benchmarks, changes, counters, datasets, export, imports, outbox, permissions, profiling, realtime,
+    reminders, renderers, rows, search, views,
+)
+from jira_app.filters import TASK_SORTS
+from jira_app.models import LATEST_COMMENTS, Change, Comment, DeadLetter, OutboxMessage, Project, Reminder, ReminderCursor, Task, TaskCounter
+from jira_app.serializers import TaskSerializer, UserSerializer
+from jira_backend.database import database_config
+
+
+# ----------------- 🔹 Keyset Pagination 🔹 -----------------
+
+class KeysetPaginationTests(TestCase):
+    """ /api/projects/<id>/tasks/ pages on (updated_at, id): no OFFSET, no gaps or repeats, bounded pages """
+
+    def setUp(self):
+        self.owner, helper = User.objects.create(username="owner"), User.objects.create(username="helper")
+        project = Project.objects.create(name="Board")
+        project.team_members.add(self.owner, helper)
+        self.project = project.id
+        tasks = Task.objects.bulk_create([
+            Task(project=project, title=f"Task {n}", assigned_to=[self.owner, helper, None][n % 3]) for n in range(120)
+        ])
+        Comment.objects.bulk_create([Comment(task=task, user=helper, text=f"Note {m}") for task in tasks for m in range(2)])
+        self.client = benchmarks.authenticated_client(self.owner)
+        # Half the tasks share one timestamp, so the id tiebreaker decides their order
+        tied = Task.objects.filter(project_id=self.project).order_by("id").values_list("id", flat=True)[:60]
+        Task.objects.filter(id__in=list(tied)).update(updated_at=timezone.now())
+        self.ordered = list(Task.objects.filter(project_id=self.project).order_by("updated_at", "id").values_list("id", flat=True))
+
+    def walk(self, page_size):
+        """ Ids of every page in order, and the queries each page ran """
+        ids, counts, url = [], [], f"/api/projects/{self.project}/tasks/?page_size={page_size}"
+        while url:
+            with CaptureQueriesContext(connection) as captured:
+                body = self.client.get(url).json()
+            ids += [row["id"] for row in body["results"]]
+            counts.append(len(captured))
+            self.assertFalse([query for query in captured.captured_queries if "OFFSET" in query["sql"]], url)
+            url = body["next"]
+        return ids, counts
+
+    def test_pages_cover_every_task_once_in_order(self):
+        for fast in (True, False):
+            with self.subTest(fast_rows=fast), self.settings(JIRA_FAST_LIST_RESPONSES=fast):
+                ids, counts = self.walk(50)
+                self.assertEqual(ids, self.ordered)
+                self.assertEqual(len(counts), 3)
+                # Page 3 costs what page 1 does
+                self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_writes_between_pages_neither_skip_nor_repeat_unchanged_tasks(self):
+        first = self.client.get(f"/api/projects/{self.project}/tasks/?page_size=50").json()
+        seen = [row["id"] for row in first["results"]]
+        # An edit moves a task to the end of the (updated_at, id) order; a new task lands there too
+        Task.objects.filter(id=seen[0]).update(updated_at=timezone.now() + datetime.timedelta(minutes=1))
+        created = Task.objects.create(project_id=self.project, title="Late arrival").id
+        rest, url = [], first["next"]
+        while url:
+            body = self.client.get(url).json()
+            rest += [row["id"] for row in body["results"]]
+            url = body["next"]
+        self.assertEqual(rest, self.ordered[50:] + [created, seen[0]])
+
+    def test_page_size_is_bounded(self):
+        url = f"/api/projects/{self.project}/tasks/?page_size="
+        self.assertEqual(len(self.client.get(url + "1000").json()["results"]), 120)
+        Task.objects.bulk_create([Task(project_id=self.project, title=f"Extra {n}") for n in range(100)])
+        self.assertEqual(len(self.client.get(url + "1000").json()["results"]), 200)
+        self.assertEqual(len(self.client.get(url + "0").json()["results"]), 1)
+        self.assertEqual(len(self.client.get(url + "abc").json()["results"]), 50)
+
+
+# ----------------- 🔹 Project Summaries 🔹 -----------------
+
+class ProjectSummaryTests(TestCase):
+    """ /api/projects/summary/: per-project counts computed in SQL, nothing nested """
+
+    def setUp(self):
+        self.owner, self.teammate = User.objects.create(username="owner"), User.objects.create(username="teammate")
+        self.project = Project.objects.create(name="Board")
+        self.project.team_members.add(self.owner, self.teammate)
+        self.empty = Project.objects.create(name="Empty")
+        self.empty.team_members.add(self.owner)
+        Project.objects.create(name="Someone else's")
+        self.client = benchmarks.authenticated_client(self.owner)
+
+        past, future = timezone.now() - datetime.timedelta(days=1), timezone.now() + datetime.timedelta(days=1)
+        for status_value, priority, deadline in [
+            ("to_do", "high", past), ("in_progress", "high", past), ("done", "low", past),
+            ("to_do", "medium", future), ("to_do", "medium", None),
+        ]:
+            Task.objects.create(project=self.project, title=status_value, status=status_value, priority=priority, deadline=deadline)
+        self.comment = Comment.objects.create(task=Task.objects.first(), user=self.owner, text="Latest word")
+
+    def summaries(self):
+        response = self.client.get("/api/projects/summary/")
+        self.assertEqual(response.status_code, 200)
+        return {summary["name"]: summary for summary in response.json()}
+
+    def test_counts(self):
+        summaries = self.summaries()
+        self.assertEqual(set(summaries), {"Board", "Empty"})
+        board = summaries["Board"]
+        self.assertEqual(
+            {key: board[key] for key in ("task_count", "status_counts", "priority_counts", "overdue_count", "member_count")},
+            {
+                "task_count": 5,
+                "status_counts": {"to_do": 3, "in_progress": 1, "done": 1},
+                "priority_counts": {"low": 1, "medium": 2, "high": 2},
+                # A done task past its deadline is not overdue
+                "overdue_count": 2,
+                "member_count": 2,
+            },
+        )
+        self.assertNotIn("tasks", board)
+        self.assertEqual(summaries["Empty"]["task_count"], 0)
+        self.assertEqual(summaries["Empty"]["status_counts"], {"to_do": 0, "in_progress": 0, "done": 0})
+
+    def test_last_activity_is_the_newest_write(self):
+        later = timezone.now() + datetime.timedelta(hours=1)
+        Comment.objects.filter(id=self.comment.id).update(created_at=later)
+        self.assertEqual(self.summaries()["Board"]["last_activity"], later.isoformat().replace("+00:00", "Z"))
+
+        latest = later + datetime.timedelta(hours=1)
+        Task.objects.filter(project=self.project, status="done").update(updated_at=latest)
+        self.assertEqual(self.summaries()["Board"]["last_activity"], latest.isoformat().replace("+00:00", "Z"))
+
+    def test_query_count_does_not_grow_with_projects(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.get("/api/projects/summary/")
+        for n in range(20):
+            project = Project.objects.create(name=f"More {n}")
+            project.team_members.add(self.owner)
+            Task.objects.create(project=project, title="Task")
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(len(self.client.get("/api/projects/summary/").json()), 22)
+        self.assertEqual(len(few), len(many))
+
+
+# ----------------- 🔹 Task Filters 🔹 -----------------
+
+class TaskFilterTests(TestCase):
+    """ Task list query parameters: filters, sorts and keyset pages over every sort """
+
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+        self.other = User.objects.create(username="other")
+        self.project = Project.objects.create(name="Board")
+        self.project.team_members.add(self.owner, self.other)
+        self.client = benchmarks.authenticated_client(self.owner)
+        base = datetime.datetime(2024, 3, 1, 12, tzinfo=datetime.timezone.utc)
+        statuses, priorities = ["to_do", "in_progress", "done"], ["low", "medium", "high"]
+        assignees = [self.owner, self.other, None]
+        for n in range(12):
+            Task.objects.create(
+                project=self.project, title=f"Task {n:02}", status=statuses[n % 3], priority=priorities[n // 3 % 3],
+                assigned_to=assignees[n % 3], deadline=base + datetime.timedelta(days=n) if n % 4 else None,
+            )
+        self.tasks = {task.title: task for task in Task.objects.all()}
+
+    def titles(self, query="", **params):
+        response = self.client.get(f"/api/projects/{self.project.id}/tasks/?page_size=200&{query}", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["title"] for row in response.json()["results"]]
+
+    def expected(self, keep, key=None):
+        tasks = [task for task in self.tasks.values() if keep(task)]
+        return [task.title for task in sorted(tasks, key=key or (lambda task: task.title))]
+
+    def test_filters(self):
+        self.assertEqual(self.titles("sort=title&status=to_do,done"), self.expected(lambda t: t.status != "in_progress"))
+        self.assertEqual(self.titles("sort=title&priority=high"), self.expected(lambda t: t.priority == "high"))
+        self.assertEqual(self.titles("sort=title&assigned_to=me"), self.expected(lambda t: t.assigned_to_id == self.owner.id))
+        self.assertEqual(self.titles(f"sort=title&assigned_to={self.other.id}"), self.expected(lambda t: t.assigned_to_id == self.other.id))
+        self.assertEqual(self.titles("sort=title&assigned_to=none"), self.expected(lambda t: t.assigned_to_id is None))
+        # A date bound covers the whole day
+        self.assertEqual(
+            self.titles("sort=title&deadline_after=2024-03-03&deadline_before=2024-03-06"),
+            self.expected(lambda t: t.deadline and 2 <= (t.deadline.day - 1) <= 5),
+        )
+        Task.objects.filter(title="Task 05").update(updated_at=timezone.now() + datetime.timedelta(hours=1))
+        since = (timezone.now() + datetime.timedelta(minutes=30)).isoformat()
+        self.assertEqual(self.titles(updated_since=since), ["Task 05"])
+
+    def test_sorts_follow_declared_choice_order(self):
+        priority_rank = {"low": 0, "medium": 1, "high": 2}
+        self.assertEqual(self.titles("sort=priority"), self.expected(lambda t: True, lambda t: (priority_rank[t.priority], t.id)))
+        self.assertEqual(
+            self.titles("sort=-status"),
+            self.expected(lambda t: True, lambda t: (-["to_do", "in_progress", "done"].index(t.status), -t.id)),
+        )
+        # NULL deadlines sort last in both directions
+        undated = self.expected(lambda t: t.deadline is None, lambda t: t.id)
+        self.assertEqual(self.titles("sort=deadline")[-3:], undated)
+        self.assertEqual(self.titles("sort=-deadline")[-3:], undated[::-1])
+
+    def test_pages_walk_every_sort_without_gaps(self):
+        for sort in TASK_SORTS:
+            full = self.titles(f"sort={sort}&status=to_do,in_progress")
+            walked, url = [], f"/api/projects/{self.project.id}/tasks/?sort={sort}&status=to_do,in_progress&page_size=3"
+            while url:
+                body = self.client.get(url).json()
+                walked += [row["title"] for row in body["results"]]
+                url = body["next"]
+            self.assertEqual(walked, full, sort)
+
+    def test_invalid_parameters(self):
+        for query in (
+            "status=x", "priority=urgent", "sort=foo", "assigned_to=abc", "assigned_to=\u00b2",
+            "deadline_after=nope", "deadline_before=2024-02-30", "updated_since=2024-01-01T25:00:00",
+        ):
+            response = self.client.get(f"/api/projects/{self.project.id}/tasks/?{query}")
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn("error", response.json())
+        self.assertEqual(self.client.get(f"/api/projects/{self.project.id}/tasks/?cursor=garbage").status_code, 404)
+
+
+# ----------------- 🔹 Index Usage 🔹 -----------------
+
+class IndexUsageTests(TestCase):
+    """ The hot task queries are served by their composite indexes (SQLite ``EXPLAIN QUERY PLAN``) """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create([User(username=f"user{n}") for n in range(10)])
+        cls.owner, start = users[0], timezone.now()
+        for n in range(3):
+            project = Project.objects.create(name=f"Project {n}")
+            project.team_members.add(*users[:5])
+            Task.objects.bulk_create([
+                Task(
+                    project=project, title=f"Task {m}", status=["to_do", "in_progress", "done"][m % 3],
+                    assigned_to=users[m % 6] if m % 6 < 5 else None,
+                    deadline=start + datetime.timedelta(hours=m - 100) if m % 4 else None,
+                )
+                for m in range(200)
+            ])
+        cls.project = Project.objects.first().id
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(index, plan)
+        self.assertNotIn("USE TEMP B-TREE", plan)
+
+    def test_task_list_filters(self):
+        tasks = Task.objects.filter(project_id=self.project)
+        self.assertUsesIndex(tasks.filter(status="done").values("id"), "task_project_status_idx")
+        self.assertUsesIndex(tasks.filter(assigned_to=self.owner).values("id"), "task_project_assignee_idx")
+        self.assertUsesIndex(
+            tasks.filter(deadline__gte=timezone.now()).order_by("deadline").values("id"), "task_project_deadline_idx"
+        )
+
+    def test_keyset_page(self):
+        task = Task.objects.filter(project_id=self.project).order_by("updated_at", "id")[50]
+        page = (
+            Task.objects.filter(project_id=task.project_id)
+            .filter(Q(updated_at__gt=task.updated_at) | Q(updated_at=task.updated_at, id__gt=task.id))
+            .order_by("updated_at", "id")[:51]
+        )
+        self.assertUsesIndex(page, "task_project_updated_idx")
+
+
+    def test_reminder_queue(self):
+        due = reminders.open_deadlines().filter(deadline__gt=timezone.now(), deadline__lte=timezone.now() + datetime.timedelta(days=1))
+        self.assertUsesIndex(due.order_by("deadline", "id").values("id")[:1000], "task_open_deadline_idx")
+        # The partial index only covers open tasks, so it cannot answer for done ones
+        done = Task.objects.filter(status="done", deadline__gt=timezone.now()).order_by("deadline", "id").values("id")
+        self.assertNotIn("task_open_deadline_idx", done.explain())
+
+
+# ----------------- 🔹 Search 🔹 -----------------
+
+class SearchTests(TestCase):
+    """ /api/search/: FTS5 over titles, descriptions and comments, kept in step with writes, scoped to the user """
+
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+        self.project = Project.objects.create(name="Board")
+        self.project.team_members.add(self.owner)
+        hidden = Project.objects.create(name="Hidden")
+        self.client = benchmarks.authenticated_client(self.owner)
+
+        self.titled = Task.objects.create(project=self.project, title="Deploy pipeline", description="Ship it")
+        self.described = Task.objects.create(project=self.project, title="Cleanup", description="after the deploy window")
+        self.commented = Task.objects.create(project=self.project, title="Flaky test")
+        self.comment = Comment.objects.create(task=self.commented, user=self.owner, text="crash during deploy")
+        Task.objects.create(project=hidden, title="Deploy secrets")
+
+    def search(self, query, **params):
+        response = self.client.get("/api/search/", {"q": query, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_finds_titles_bodies_and_comments_in_the_users_projects(self):
+        hits = self.search("deploy")["results"]
+        self.assertEqual(
+            {(hit["type"], hit["task_id"]) for hit in hits},
+            {("task", self.titled.id), ("task", self.described.id), ("comment", self.commented.id)},
+        )
+        # Title matches weigh more than body matches
+        self.assertEqual(hits[0]["task_id"], self.titled.id)
+        self.assertEqual(self.search("depl")["results"][0]["task_id"], self.titled.id)
+        self.assertIn("[deploy]", next(hit for hit in hits if hit["type"] == "comment")["snippet"])
+
+    def test_index_follows_writes(self):
+        self.titled.title = "Release pipeline"
+        self.titled.save()
+        self.comment.delete()
+        self.assertEqual([hit["task_id"] for hit in self.search("deploy")["results"]], [self.described.id])
+        self.assertEqual(self.search("release")["results"][0]["task_id"], self.titled.id)
+
+        search.get_search_backend().rebuild()
+        self.assertEqual([hit["task_id"] for hit in self.search("deploy")["results"]], [self.described.id])
+
+    def test_user_input_cannot_inject_match_syntax(self):
+        self.assertEqual(search.SQLiteFTSBackend.build_match('"crash" OR NEAR('), '"crash" "OR" "NEAR"*')
+        self.assertEqual(search.SQLiteFTSBackend.build_match("*:^()"), None)
+        for query in ('"crash" OR NEAR(', "title:deploy", "deploy AND", "*:^()", "-deploy"):
+            self.search(query)
+        self.assertEqual(self.search("*:^()")["results"], [])
+        self.assertEqual(self.client.get("/api/search/", {"q": " "}).status_code, 400)
+
+    def test_pages(self):
+        first = self.search("deploy", page_size=2)
+        self.assertEqual(len(first["results"]), 2)
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(len(second["results"]), 1)
+        self.assertIsNone(second["next"])
+
+
+# ----------------- 🔹 Membership Checks 🔹 -----------------
+
+class MembershipCacheTests(TestCase):
+    """ permissions.is_project_member: memoized per request, cached across requests, invalidated by team changes """
+
+    def setUp(self):
+        caches["membership"].clear()
+        self.user = User.objects.create(username="member")
+        self.projects = [Project.objects.create(name=f"Project {n}") for n in range(3)]
+        self.projects[0].team_members.add(self.user)
+        self.projects[1].team_members.add(self.user)
+
+    def request(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return request
+
+    def check(self, project, request=None):
+        """ ``(answer, queries run)`` for one membership check """
+        with CaptureQueriesContext(connection) as captured:
+            answer = permissions.is_project_member(request or self.request(), project.id)
+        return answer, len(captured)
+
+    def test_answers_are_memoized_per_request(self):
+        request = self.request()
+        self.assertEqual(self.check(self.projects[0], request), (True, 1))
+        self.assertEqual(self.check(self.projects[0], request), (True, 0))
+        self.assertEqual(self.check(self.projects[2], request), (False, 1))
+        # Without the cross-request cache a new request asks again
+        self.assertEqual(self.check(self.projects[0]), (True, 1))
+
+    @override_settings(JIRA_MEMBERSHIP_CACHE_TIMEOUT=60)
+    def test_cached_across_requests_until_the_team_changes(self):
+        self.assertEqual(self.check(self.projects[0]), (True, 1))
+        self.assertEqual(self.check(self.projects[0]), (True, 0))
+        self.assertEqual(self.check(self.projects[2]), (False, 1))
+        self.assertEqual(self.check(self.projects[2]), (False, 0))
+
+        self.projects[0].team_members.remove(self.user)
+        self.projects[2].team_members.add(self.user)
+        self.assertEqual(self.check(self.projects[0]), (False, 1))
+        self.assertEqual(self.check(self.projects[2]), (True, 1))
+
+    def test_many_projects_in_one_query(self):
+        request = self.request()
+        with CaptureQueriesContext(connection) as captured:
+            found = permissions.member_project_ids(request, [project.id for project in self.projects])
+        self.assertEqual((found, len(captured)), ({self.projects[0].id, self.projects[1].id}, 1))
+        self.assertEqual(self.check(self.projects[1], request), (True, 0))
+
+    @override_settings(JIRA_MEMBERSHIP_CACHE_TIMEOUT=60)
+    def test_removed_members_are_refused_at_once(self):
+        client = benchmarks.authenticated_client(self.user)
+        url = f"/api/projects/{self.projects[0].id}/tasks/"
+        self.assertEqual(client.get(url).status_code, 200)
+        self.projects[0].team_members.remove(self.user)
+        self.assertEqual(client.get(url).status_code, 403)
+
+
+# ----------------- 🔹 Bulk Tasks 🔹 -----------------
+
+class BulkTaskTests(TestCase):
+    """ POST /api/tasks/bulk/: validated up front, applied all together, deletes without per-row signals """
+
+    def setUp(self):
+        owner, helper = User.objects.create(username="owner"), User.objects.create(username="helper")
+        project = Project.objects.create(name="Board")
+        project.team_members.add(owner, helper)
+        tasks = Task.objects.bulk_create([Task(project=project, title=f"Task {n}", assigned_to=owner) for n in range(15)])
+        Comment.objects.bulk_create([
+            Comment(task=task, user=helper, text=f"Remark {task.id} {m}") for task in tasks for m in range(2)
+        ])
+        self.client = benchmarks.authenticated_client(owner)
+        self.project = project.id
+        self.tasks = list(Task.objects.filter(project_id=self.project).order_by("id").values_list("id", flat=True))
+        # bulk_create skips the counter signals
+        counters.rebuild()
+
+    def bulk(self, payload):
+        return self.client.post("/api/tasks/bulk/", payload, content_type="application/json")
+
+    def test_creates_updates_and_deletes_apply_together(self):
+        doomed = self.tasks[:3]
+        response = self.bulk({
+            "create": [{"project": self.project, "title": "Bulk zebra"}],
+            "update": [{"id": self.tasks[3], "status": "done", "title": "Renamed"}],
+            "delete": doomed,
+        })
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([item["index"] for item in response.json()["delete"]], [0, 1, 2])
+
+        self.assertFalse(Task.objects.filter(id__in=doomed).exists())
+        self.assertFalse(Comment.objects.filter(task_id__in=doomed).exists())
+        self.assertEqual(Task.objects.get(id=self.tasks[3]).title, "Renamed")
+        self.assertEqual(counters.drift(), [])
+        self.assertEqual(
+            set(Change.objects.filter(action="deleted", kind="task").values_list("object_id", flat=True)), set(doomed)
+        )
+        hits = self.client.get("/api/search/?q=Remark").json()["results"]
+        self.assertFalse([hit for hit in hits if hit["task_id"] in doomed])
+        self.assertEqual(self.client.get("/api/search/?q=zebra").json()["results"][0]["title"], "Bulk zebra")
+
+    def test_delete_cost_does_not_grow_with_the_batch(self):
+        def delete(task_ids):
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(self.bulk({"delete": task_ids}).status_code, 200)
+            return len(captured)
+
+        self.assertEqual(delete(self.tasks[:1]), delete(self.tasks[1:13]))
+        self.assertEqual(counters.drift(), [])
+
+    def test_one_invalid_item_rejects_the_whole_batch(self):
+        other_project = Project.objects.create(name="Not mine")
+        before = (Task.objects.count(), Change.objects.count())
+        response = self.bulk({
+            "create": [{"project": self.project, "title": "Fine"}, {"project": self.project}, {"project": other_project.id, "title": "X"}],
+            "update": [{"id": self.tasks[0], "priority": "urgent"}],
+            "delete": [self.tasks[1], 999999, "seven"],
+        })
+        self.assertEqual(response.status_code, 400)
+        report = response.json()
+        self.assertEqual([item["index"] for item in report["create"]], [1, 2])
+        self.assertIn("title", report["create"][0]["errors"])
+        self.assertEqual(report["create"][1]["errors"], {"project": ["Not authorized or project not found"]})
+        self.assertIn("priority", report["update"][0]["errors"])
+        self.assertEqual(report["delete"], [
+            {"index": 1, "errors": {"id": ["Task not found."]}},
+            {"index": 2, "errors": {"id": ["A valid integer is required."]}},
+        ])
+        self.assertEqual((Task.objects.count(), Change.objects.count()), before)
+        self.assertTrue(Task.objects.filter(id=self.tasks[1]).exists())
+
+    def test_malformed_requests(self):
+        self.assertEqual(self.bulk({"delete": 5}).json(), {"error": "'delete' must be a list"})
+        self.assertEqual(
+            self.bulk({"update": [{"id": self.tasks[0], "title": "T"}], "delete": [self.tasks[0]]}).json(),
+            {"error": "Each task id may appear only once across update and delete"},
+        )
+        self.assertEqual(self.bulk({"create": [{"project": self.project, "title": "T"}] * 1001}).status_code, 400)
+
+
+# ----------------- 🔹 Task Updates 🔹 -----------------
+
+class UpdateTaskStatusTests(TestCase):
+    """ PATCH /api/tasks/<id>/update-status/: one read and one conditional UPDATE, plus one write per side effect """
+
+    def setUp(self):
+        owner = User.objects.create(username="owner")
+        project = Project.objects.create(name="Board")
+        project.team_members.add(owner)
+        self.client = benchmarks.authenticated_client(owner)
+        self.task = Task.objects.create(project=project, title="Drag me", assigned_to=owner)
+        Comment.objects.bulk_create([Comment(task=self.task, user=owner, text=f"Note {n}") for n in range(2)])
+        self.url = f"/api/tasks/{self.task.id}/update-status/"
+
+    def patch(self, body, url=None, client=None, **headers):
+        return (client or self.client).patch(url or self.url, body, content_type="application/json", **headers)
+
+    def test_minimal_patch_is_one_read_one_update_and_one_write_per_side_effect(self):
+        # Both counter rows exist after a round trip, which is the steady state being measured; a distant
+        # deadline keeps the reminder cursors out of it (they are read only for tasks due by now)
+        self.patch({"status": "done", "deadline": "2031-05-01T09:00:00Z"})
+        self.patch({"status": self.task.status})
+
+        def statements(status_value):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.patch({"status": status_value}, url=self.url + "?return=minimal")
+            self.assertEqual(response.status_code, 200)
+            return response, [
+                query["sql"] for query in captured.captured_queries if not query["sql"].startswith(("SAVEPOINT", "RELEASE"))
+            ]
+
+        response, sql = statements("done")
+        log = "\n".join(sql)
+        # Authentication loads the user; the PATCH itself is the task read (with membership) and one
+        # conditional UPDATE. The counters and the change log must commit with the row, so each adds one
+        # write to the same transaction rather than moving after it.
+        expected = ['SELECT "auth_user"', 'SELECT "jira_app_task"', 'UPDATE "jira_app_task"', 'UPDATE "jira_app_taskcounter"', 'INSERT INTO "jira_app_change"']
+        self.assertEqual(len(sql), len(expected), log)
+        self.assertTrue(all(statement.startswith(prefix) for statement, prefix in zip(sql, expected)), log)
+        self.assertIn("jira_app_project_team_members", sql[2])
+        self.assertEqual(sum('FROM "jira_app_project_team_members"' in statement for statement in sql), 2, log)
+        self.assertEqual(response["Preference-Applied"], "return=minimal")
+        self.assertEqual(set(response.json()["task"]), {"id", "status", "updated_at"})
+
+        # A subscribed outbox handler is one more INSERT
+        with self.settings(JIRA_OUTBOX_HANDLERS={"task.updated": ["jira_app.tests.record_delivery"]}):
+            _, sql = statements(self.task.status)
+        self.assertEqual(len(sql), 6)
+        self.assertTrue(sql[-1].startswith('INSERT INTO "jira_app_outboxmessage"'), sql[-1])
+
+        # The Prefer header works like the query parameter
+        self.assertEqual(set(self.patch({"priority": "low"}, HTTP_PREFER="return=minimal").json()["task"]), {"id", "priority", "updated_at"})
+
+    def test_side_effects_follow_the_update(self):
+        response = self.patch({"status": "in_progress", "priority": "high", "deadline": "2031-05-01T09:00:00Z"})
+        self.assertEqual(response.status_code, 200)
+        task = response.json()["task"]
+        self.assertEqual((task["status"], task["priority"], task["deadline"]), ("in_progress", "high", "2031-05-01T09:00:00Z"))
+        self.assertEqual(task["comment_count"], 2)
+        self.assertEqual(counters.drift(), [])
+        self.assertEqual(Change.objects.filter(kind="task", object_id=self.task.id, action="updated").count(), 1)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.priority, "high")
+
+    def test_outsiders_and_bad_values_change_nothing(self):
+        outsider = benchmarks.authenticated_client(User.objects.create(username="outsider"))
+        self.assertEqual(self.patch({"status": "done"}, client=outsider).status_code, 404)
+        self.assertEqual(self.patch({"status": "done"}, url="/api/tasks/999999/update-status/").status_code, 404)
+        self.assertEqual(self.patch({"status": "finished"}).status_code, 400)
+        self.assertEqual(self.patch({"deadline": "someday"}).json(), {"error": "Invalid deadline value"})
+        self.assertEqual(Task.objects.get(id=self.task.id).updated_at, self.task.updated_at)
+
+
+# ----------------- 🔹 Conditional Requests 🔹 -----------------
+
+class ConditionalGetTests(TestCase):
+    """ ETag / Last-Modified on project and task reads: 304 only while nothing the user sees changed """
+
+    def setUp(self):
+        self.owner, self.other = User.objects.create(username="owner"), User.objects.create(username="other")
+        project = Project.objects.create(name="Board")
+        project.team_members.add(self.owner, self.other)
+        tasks = Task.objects.bulk_create([
+            Task(project=project, title=f"Task {n}", assigned_to=[self.owner, self.other][n % 2]) for n in range(6)
+        ])
+        Comment.objects.bulk_create([Comment(task=task, user=self.other, text="Noted") for task in tasks])
+        self.project, self.task, self.tasks = project.id, tasks[0].id, [task.id for task in tasks]
+        self.client = benchmarks.authenticated_client(self.owner)
+        self.url = f"/api/projects/{self.project}/tasks/"
+
+    def test_etag_answers_304_until_something_changes(self):
+        for url in (self.url, f"/api/projects/{self.project}/", f"/api/tasks/{self.task}/"):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertIn("Authorization", first["Vary"])
+            self.assertEqual(self.client.get(url, headers={"If-None-Match": first["ETag"]}).status_code, 304, url)
+
+        etag = self.client.get(self.url)["ETag"]
+        self.client.post(f"/api/tasks/{self.task}/comments/", {"text": "New"}, content_type="application/json")
+        fresh = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh["ETag"], etag)
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get(f"{self.url}?assigned_to=me")["ETag"]
+        response = benchmarks.authenticated_client(self.other).get(f"{self.url}?assigned_to=me", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since_sees_deletes(self):
+        hour_ago = timezone.now() - datetime.timedelta(hours=1)
+        Task.objects.update(updated_at=hour_ago)
+        Comment.objects.update(created_at=hour_ago)
+        Change.objects.update(created_at=hour_ago)
+
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        self.assertEqual(self.client.get(self.url, headers={"If-Modified-Since": last_modified}).status_code, 304)
+
+        self.client.post("/api/tasks/bulk/", {"delete": [self.tasks[-1]]}, content_type="application/json")
+        response = self.client.get(self.url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["Last-Modified"], last_modified)
+
+    def test_outsiders_never_get_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        outsider = benchmarks.authenticated_client(User.objects.create(username="outsider"))
+        self.assertEqual(outsider.get(self.url, headers={"If-None-Match": etag}).status_code, 403)
+
+
+# ----------------- 🔹 Change Feed 🔹 -----------------
+
+class ChangeFeedTests(TestCase):
+    """ /api/projects/<id>/changes/: collapsed per object, held back while unsettled, 410 behind compaction """
+
+    def setUp(self):
+        owner = User.objects.create(username="owner")
+        project = Project.objects.create(name="Board")
+        project.team_members.add(owner, User.objects.create(username="helper"))
+        Task.objects.bulk_create([Task(project=project, title=f"Task {n}") for n in range(3)])
+        self.client = benchmarks.authenticated_client(owner)
+        self.project = project.id
+        self.start = Change.objects.filter(project_id=self.project).aggregate(last=Max("id"))["last"] or 0
+
+    def feed(self, since, **params):
+        query = "&".join(f"{key}={value}" for key, value in {"since": since, **params}.items())
+        return self.client.get(f"/api/projects/{self.project}/changes/?{query}")
+
+    def create_task(self, title):
+        response = self.client.post(f"/api/projects/{self.project}/tasks/", {"title": title}, content_type="application/json")
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def test_replays_one_entry_per_object(self):
+        kept, dropped = self.create_task("Kept"), self.create_task("Dropped")
+        self.client.patch(f"/api/tasks/{kept}/update-status/", {"status": "done"}, content_type="application/json")
+        self.client.post("/api/tasks/bulk/", {"delete": [dropped]}, content_type="application/json")
+
+        body = self.feed(self.start).json()
+        entries = {(entry["type"], entry["id"]): entry for entry in body["changes"]}
+        self.assertEqual(entries[("task", kept)]["action"], "created")
+        self.assertEqual(entries[("task", kept)]["data"]["status"], "done")
+        self.assertEqual(entries[("task", dropped)], {"type": "task", "id": dropped, "action": "deleted"})
+        self.assertFalse(body["has_more"])
+        self.assertEqual(self.feed(body["cursor"]).json()["changes"], [])
+
+    def test_pages_with_limit(self):
+        for n in range(3):
+            self.create_task(f"Task {n}")
+        first = self.feed(self.start, limit=2).json()
+        self.assertTrue(first["has_more"])
+        second = self.feed(first["cursor"], limit=2).json()
+        self.assertFalse(second["has_more"])
+        self.assertEqual(len(first["changes"]) + len(second["changes"]), 3)
+        self.assertEqual(self.feed("abc").status_code, 400)
+
+    @override_settings(JIRA_CHANGES_SETTLE_SECONDS=60)
+    def test_unsettled_rows_hold_the_cursor(self):
+        older, newer = self.create_task("Older"), self.create_task("Newer")
+        body = self.feed(self.start).json()
+        self.assertEqual((body["changes"], body["cursor"], body["has_more"]), ([], str(self.start), False))
+
+        # A settled row behind a pending one stays hidden: the pending row may still be committing
+        settled = timezone.now() - datetime.timedelta(minutes=5)
+        Change.objects.filter(object_id=newer, kind="task").update(created_at=settled)
+        self.assertEqual(self.feed(self.start).json()["changes"], [])
+
+        Change.objects.filter(object_id=older, kind="task").update(created_at=settled)
+        body = self.feed(self.start).json()
+        self.assertEqual([entry["id"] for entry in body["changes"]], [older, newer])
+
+    def test_compaction_expires_old_cursors(self):
+        task_id = self.create_task("Edited")
+        for status_value in ("in_progress", "done"):
+            self.client.patch(f"/api/tasks/{task_id}/update-status/", {"status": status_value}, content_type="application/json")
+        self.assertEqual(Change.objects.filter(kind="task", object_id=task_id).count(), 3)
+
+        changes.compact(datetime.timedelta(days=30))
+        self.assertEqual(Change.objects.filter(kind="task", object_id=task_id).count(), 1)
+        self.assertEqual(self.feed(self.start).json()["changes"][0]["data"]["status"], "done")
+
+        Change.objects.update(created_at=timezone.now() - datetime.timedelta(days=31))
+        changes.compact(datetime.timedelta(days=30))
+        floor = Project.objects.get(id=self.project).changes_compacted_through
+        self.assertGreater(floor, self.start)
+        self.assertEqual(self.feed(self.start).status_code, 410)
+        self.assertEqual(self.feed(floor).json(), {"cursor": str(floor), "has_more": False, "changes": []})
+
+
+# ----------------- 🔹 Real-time Updates 🔹 -----------------
+
+class WebSocketTests(TransactionTestCase):
+    """ ws/projects/<id>/: members only, one frame per committed event, slow clients cut off """
+
+    def setUp(self):
+        self.member, self.outsider = User.objects.create(username="member"), User.objects.create(username="outsider")
+        self.project = Project.objects.create(name="Board")
+        self.project.team_members.add(self.member)
+        self.tokens = {
+            user: benchmarks.authenticated_client(user).defaults["HTTP_AUTHORIZATION"].split()[1]
+            for user in (self.member, self.outsider)
+        }
+
+    def communicator(self, user=None, path=None):
+        query = f"token={self.tokens[user]}" if user else ""
+        scope = {"type": "websocket", "path": path or f"/ws/projects/{self.project.id}/", "query_string": query.encode()}
+        return ApplicationCommunicator(realtime.websocket_application, scope)
+
+    async def connect(self, communicator):
+        await communicator.send_input({"type": "websocket.connect"})
+        return await communicator.receive_output(timeout=5)
+
+    async def test_only_members_may_subscribe(self):
+        for communicator, code in (
+            (self.communicator(), realtime.CLOSE_NOT_AUTHORIZED),
+            (self.communicator(self.outsider), realtime.CLOSE_NOT_AUTHORIZED),
+            (self.communicator(path="/ws/projects/nope/"), 4404),
+        ):
+            self.assertEqual(await self.connect(communicator), {"type": "websocket.close", "code": code})
+        scope = {"type": "websocket", "path": f"/ws/projects/{self.project.id}/", "query_string": b"token=junk"}
+        closed = await self.connect(ApplicationCommunicator(realtime.websocket_application, scope))
+        self.assertEqual(closed["code"], realtime.CLOSE_NOT_AUTHORIZED)
+
+    async def test_events_arrive_after_commit_coalesced(self):
+        communicator = self.communicator(self.member)
+        self.assertEqual(await self.connect(communicator), {"type": "websocket.accept"})
+
+        def write():
+            with transaction.atomic():
+                realtime.publish_event(self.project.id, "task.created", {"id": 1, "title": "Draft"})
+                realtime.publish_event(self.project.id, "task.updated", {"id": 1, "title": "Final"})
+                realtime.publish_event(self.project.id, "task.created", {"id": 2, "title": "Gone"})
+                realtime.publish_event(self.project.id, "task.deleted", {"id": 2})
+            with transaction.atomic():
+                realtime.publish_event(self.project.id, "task.updated", {"id": 3, "title": "Rolled back"})
+                transaction.set_rollback(True)
+            # The rolled-back batch is gone; the next transaction gets its own
+            with transaction.atomic():
+                realtime.publish_event(self.project.id, "task.updated", {"id": 4, "title": "After the rollback"})
+            realtime.publish_event(self.project.id, "comment.created", {"id": 9, "text": "Outside a transaction"})
+
+        await sync_to_async(write)()
+        frames = [json.loads((await communicator.receive_output(timeout=5))["text"]) for _ in range(3)]
+        self.assertEqual(frames, [
+            {"type": "task.created", "project": self.project.id, "data": {"id": 1, "title": "Final"}},
+            {"type": "task.updated", "project": self.project.id, "data": {"id": 4, "title": "After the rollback"}},
+            {"type": "comment.created", "project": self.project.id, "data": {"id": 9, "text": "Outside a transaction"}},
+        ])
+        self.assertTrue(await communicator.receive_nothing())
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait(timeout=5)
+        self.assertEqual(realtime.get_broadcaster().subscriber_count(self.project.id), 0)
+
+    async def test_slow_clients_are_closed(self):
+        communicator = self.communicator(self.member)
+        with mock.patch.object(realtime, "SUBSCRIBER_QUEUE_SIZE", 2):
+            self.assertEqual(await self.connect(communicator), {"type": "websocket.accept"})
+        # Delivered in one loop iteration, before the writer can drain any of them
+        for n in range(5):
+            realtime.publish_event(self.project.id, "task.updated", {"id": n})
+        self.assertEqual(await communicator.receive_output(timeout=5), {"type": "websocket.close", "code": realtime.CLOSE_TOO_SLOW})
+
+    async def test_members_who_leave_are_closed(self):
+        leaving, later = self.communicator(self.member), self.communicator(self.member)
+        other = await Project.objects.acreate(name="Other")
+        await sync_to_async(other.team_members.add)(self.member)
+        elsewhere = self.communicator(self.member, f"/ws/projects/{other.id}/")
+        for communicator in (leaving, elsewhere):
+            self.assertEqual(await self.connect(communicator), {"type": "websocket.accept"})
+
+        await sync_to_async(self.project.team_members.remove)(self.member)
+        self.assertEqual(await leaving.receive_output(timeout=5), {"type": "websocket.close", "code": realtime.CLOSE_NOT_AUTHORIZED})
+        # Other projects' subscriptions stay open
+        self.assertTrue(await elsewhere.receive_nothing())
+        self.assertEqual(await self.connect(later), {"type": "websocket.close", "code": realtime.CLOSE_NOT_AUTHORIZED})
+
+    async def test_subscriptions_reauthorize_periodically(self):
+        communicator = self.communicator(self.member)
+        with self.settings(JIRA_WEBSOCKET_REAUTH_SECONDS=0.05):
+            self.assertEqual(await self.connect(communicator), {"type": "websocket.accept"})
+            self.assertTrue(await communicator.receive_nothing(timeout=0.2))
+            # A queryset update sends no signal; only the periodic check notices
+            await User.objects.filter(id=self.member.id).aupdate(is_active=False)
+            self.assertEqual(await communicator.receive_output(timeout=5), {"type": "websocket.close", "code": realtime.CLOSE_NOT_AUTHORIZED})
+
+    async def test_subscriptions_close_when_the_token_expires(self):
+        communicator = self.communicator(self.member)
+        with mock.patch.object(realtime, "_authorize") as authorize:
+            authorize.side_effect = lambda token, project_id: (self.member.id, time.time() + 0.1)
+            self.assertEqual(await self.connect(communicator), {"type": "websocket.accept"})
+            authorize.side_effect = lambda token, project_id: (None, None)
+            self.assertEqual(await communicator.receive_output(timeout=5), {"type": "websocket.close", "code": realtime.CLOSE_NOT_AUTHORIZED})
+        self.assertEqual(authorize.call_count, 2)
+
+
+# ----------------- 🔹 Comment Threads 🔹 -----------------
+
+class CommentThreadTests(TestCase):
+    """ Tasks carry a comment count and the newest few; full threads are paged oldest first """
+
+    def setUp(self):
+        self.user = User.objects.create(username="member")
+        self.project = Project.objects.create(name="Board")
+        self.project.team_members.add(self.user)
+        self.client = benchmarks.authenticated_client(self.user)
+        self.busy = Task.objects.create(project=self.project, title="Busy")
+        self.quiet = Task.objects.create(project=self.project, title="Quiet")
+        moment = timezone.now()
+        Comment.objects.bulk_create(
+            # Pairs share a timestamp, so the id tiebreaker matters
+            [Comment(task=self.busy, user=self.user, text=f"Comment {n}", created_at=moment + datetime.timedelta(seconds=n // 2)) for n in range(130)]
+            + [Comment(task=self.quiet, user=self.user, text="Only one", created_at=moment)]
+        )
+        self.thread = list(Comment.objects.filter(task=self.busy).order_by("created_at", "id").values_list("id", flat=True))
+
+    def test_thread_pages_oldest_first(self):
+        ids, url, pages = [], f"/api/tasks/{self.busy.id}/comments/", 0
+        while url:
+            body = self.client.get(url).json()
+            ids += [comment["id"] for comment in body["results"]]
+            url, pages = body["next"], pages + 1
+        self.assertEqual((ids, pages), (self.thread, 3))
+        self.assertEqual(self.client.get(f"/api/tasks/{self.busy.id}/comments/?page_size=5").json()["results"][0]["text"], "Comment 0")
+
+    def test_tasks_carry_counts_and_their_own_newest_comments(self):
+        for fast in (True, False):
+            with self.subTest(fast_rows=fast), self.settings(JIRA_FAST_LIST_RESPONSES=fast):
+                rows = {row["id"]: row for row in self.client.get(f"/api/projects/{self.project.id}/tasks/").json()["results"]}
+                self.assertEqual(rows[self.busy.id]["comment_count"], 130)
+                self.assertEqual([c["id"] for c in rows[self.busy.id]["latest_comments"]], self.thread[::-1][:LATEST_COMMENTS])
+                self.assertEqual([c["text"] for c in rows[self.quiet.id]["latest_comments"]], ["Only one"])
+                self.assertNotIn("comments", rows[self.busy.id])
+
+        detail = self.client.get(f"/api/tasks/{self.busy.id}/").json()
+        self.assertEqual((detail["comment_count"], len(detail["latest_comments"])), (130, LATEST_COMMENTS))
+
+    def test_new_comments_join_the_end(self):
+        response = self.client.post(f"/api/tasks/{self.busy.id}/comments/", {"text": "Newest"}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        detail = self.client.get(f"/api/tasks/{self.busy.id}/").json()
+        self.assertEqual((detail["comment_count"], detail["latest_comments"][0]["text"]), (131, "Newest"))
+        self.assertEqual(self.client.post(f"/api/tasks/{self.busy.id}/comments/", {}, content_type="application/json").status_code, 400)
+
+    def test_outsiders_see_nothing(self):
+        outsider = benchmarks.authenticated_client(User.objects.create(username="outsider"))
+        self.assertEqual(outsider.get(f"/api/tasks/{self.busy.id}/comments/").status_code, 403)
+        self.assertEqual(outsider.post(f"/api/tasks/{self.busy.id}/comments/", {"text": "Hi"}, content_type="application/json").status_code, 403)
+        self.assertEqual(self.client.get("/api/tasks/999999/comments/").status_code, 403)
+
+
+# ----------------- 🔹 Response Cache 🔹 -----------------
+
+@override_settings(JIRA_RESPONSE_CACHE_TIMEOUT=60)
+class ResponseCacheTests(TestCase):
+    """ Project trees and task details are cached under a project version every write bumps """
+
+    def setUp(self):
+        caches["responses"].clear()
+        self.user = User.objects.create(username="member")
+        self.project = Project.objects.create(name="Board")
+        self.other = Project.objects.create(name="Elsewhere")
+        for project in (self.project, self.other):
+            project.team_members.add(self.user)
+        self.task = Task.objects.create(project=self.project, title="Cached")
+        self.client = benchmarks.authenticated_client(self.user)
+
+    def fetch(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response["X-Cache"], response.json()
+
+    def test_second_read_is_a_hit(self):
+        for url in (f"/api/projects/{self.project.id}/", f"/api/tasks/{self.task.id}/"):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as built:
+                    first, body = self.fetch(url)
+                with CaptureQueriesContext(connection) as served:
+                    second, cached_body = self.fetch(url)
+                self.assertEqual((first, second), ("MISS", "HIT"))
+                self.assertEqual(cached_body, body)
+                # ✅ A hit skips the tree queries; only the freshness and membership checks remain
+                self.assertFalse([q for q in served.captured_queries if '"jira_app_comment"."text"' in q["sql"]])
+                self.assertLess(len(served), len(built))
+
+    def test_writes_invalidate_their_project_only(self):
+        project_url, task_url, other_url = f"/api/projects/{self.project.id}/", f"/api/tasks/{self.task.id}/", f"/api/projects/{self.other.id}/"
+        writes = {
+            "status update": lambda: self.client.patch(f"/api/tasks/{self.task.id}/update-status/", {"priority": "high"}, content_type="application/json"),
+            "comment": lambda: self.client.post(f"/api/tasks/{self.task.id}/comments/", {"text": "Hi"}, content_type="application/json"),
+            "bulk": lambda: self.client.post("/api/tasks/bulk/", {"update": [{"id": self.task.id, "title": "Renamed"}]}, content_type="application/json"),
+            "team": lambda: self.project.team_members.add(User.objects.create(username="joiner")),
+        }
+        for name, write in writes.items():
+            with self.subTest(write=name):
+                for url in (project_url, task_url, other_url):
+                    self.fetch(url)
+                response = write()
+                if response is not None:
+                    self.assertLess(response.status_code, 300)
+                self.assertEqual(self.fetch(project_url)[0], "MISS")
+                self.assertEqual(self.fetch(task_url)[0], "MISS")
+                self.assertEqual(self.fetch(other_url)[0], "HIT")
+
+        tree, task = self.fetch(project_url)[1], self.fetch(task_url)[1]
+        self.assertEqual((task["title"], task["priority"], task["comment_count"]), ("Renamed", "high", 1))
+        self.assertEqual(len(tree["team_members"]), 2)
+
+    def test_renamed_users_invalidate_their_projects(self):
+        author = User.objects.create(username="author", email="author@example.com")
+        Comment.objects.create(task=self.task, user=author, text="From a former member")
+        project_url, other_url = f"/api/projects/{self.project.id}/", f"/api/projects/{self.other.id}/"
+        for url in (project_url, other_url):
+            self.fetch(url)
+        # Logging in touches last_login only
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        self.assertEqual([self.fetch(url)[0] for url in (project_url, other_url)], ["HIT", "HIT"])
+
+        author.username = "writer"
+        author.save()
+        status, tree = self.fetch(project_url)
+        self.assertEqual(status, "MISS")
+        self.assertEqual(tree["tasks"][0]["latest_comments"][0]["user"], "writer")
+        self.assertEqual(self.fetch(other_url)[0], "HIT")
+
+        self.user.email = "member@example.org"
+        self.user.save(update_fields=["email"])
+        self.assertEqual([self.fetch(url)[0] for url in (project_url, other_url)], ["MISS", "MISS"])
+        self.assertEqual(self.fetch(other_url)[1]["team_members"][0]["email"], "member@example.org")
+
+    @override_settings(JIRA_RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled_cache_always_builds(self):
+        self.assertEqual([self.fetch(f"/api/tasks/{self.task.id}/")[0] for _ in range(2)], ["MISS", "MISS"])
+
+
+# ----------------- 🔹 Fast Rows & Renderers 🔹 -----------------
+
+class FastRowsTests(TestCase):
+    """ ``rows.py`` builders and the orjson/msgpack renderers must match the serializers and DRF byte for byte """
+
+    def setUp(self):
+        users = User.objects.bulk_create([User(username=f"user{n}", email=f"user{n}@example.com") for n in range(8)])
+        owner, start = users[0], timezone.now()
+        for n in range(2):
+            project = Project.objects.create(name=f"Project {n}", description=f"Board {n}")
+            project.team_members.add(*users[n * 4:n * 4 + 4])
+            tasks = Task.objects.bulk_create([
+                Task(
+                    project=project, title=f"Task {m}", description=f"Details {m}", status=["to_do", "in_progress", "done"][m % 3],
+                    priority=["low", "medium", "high"][m % 3], assigned_to=users[n * 4 + m % 4],
+                    deadline=start + datetime.timedelta(days=m, seconds=m),
+                )
+                for m in range(12)
+            ])
+            Comment.objects.bulk_create([
+                Comment(task=task, user=users[n * 4 + k], text=f"Comment {k} on {task.title}") for task in tasks for k in range(4)
+            ])
+        self.client = benchmarks.authenticated_client(owner)
+        self.project = Project.objects.order_by("id").first().id
+        # Edge cases: no assignee or deadline, microseconds, line separators
+        Task.objects.create(project_id=self.project, title="Bare \u2028 task", description="Ünïcode ✅")
+        Task.objects.create(
+            project_id=self.project, title="Precise", assigned_to=owner,
+            deadline=timezone.now().replace(microsecond=123456), status="done", priority="high",
+        )
+
+    def both(self, path):
+        responses = []
+        for fast in (True, False):
+            with self.settings(JIRA_FAST_LIST_RESPONSES=fast):
+                response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            responses.append(response)
+        return responses
+
+    def test_list_endpoints_match_the_serializers(self):
+        for path in ("/api/projects/", f"/api/projects/{self.project}/tasks/?page_size=100"):
+            with self.subTest(path=path):
+                fast, slow = self.both(path)
+                # ✅ Same bytes means same keys, key order and value formats
+                self.assertEqual(fast.content, slow.content)
+                self.assertIn(b"\\u2028", fast.content)
+
+    def test_row_builders_match_field_for_field(self):
+        tasks = Task.objects.filter(project_id=self.project).order_by("id")
+        expected = TaskSerializer(tasks.with_comment_summary().select_related("assigned_to"), many=True).data
+        self.assertEqual(rows.task_rows(rows.task_values(tasks)), [dict(row) for row in expected])
+
+        users = User.objects.filter(is_superuser=False).order_by("id")
+        self.assertEqual(rows.user_rows(users), [dict(row) for row in UserSerializer(users, many=True).data])
+        self.assertEqual(self.client.get("/api/users/").json(), json.loads(json.dumps(rows.user_rows(User.objects.filter(is_superuser=False)))))
+
+    def test_fast_renderer_matches_drf(self):
+        data = {
+            "when": timezone.now().replace(microsecond=5), "day": datetime.date(2024, 2, 29),
+            "price": Decimal("10.50"), "id": uuid.UUID(int=7), "text": "a\u2028b\u2029c é ✅", "nested": [{"n": 1.5}, None],
+        }
+        self.assertEqual(renderers.FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(renderers.FastJSONRenderer().render(None), JSONRenderer().render(None))
+
+    @skipUnless(renderers.msgpack, "msgpack is not installed")
+    def test_msgpack_carries_the_json_values(self):
+        fast = self.client.get("/api/projects/", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(fast["Content-Type"], "application/msgpack")
+        self.assertEqual(renderers.msgpack.unpackb(fast.content), self.client.get("/api/projects/").json())
+
+
+# ----------------- 🔹 Export 🔹 -----------------
+
+class ExportTests(TestCase):
+    """ Exports stream every task and comment once, as NDJSON or CSV, optionally gzipped """
+
+    def setUp(self):
+        self.user = User.objects.create(username="member", email="member@example.com")
+        self.project = Project.objects.create(name="Board")
+        self.project.team_members.add(self.user)
+        self.client = benchmarks.authenticated_client(self.user)
+        self.busy = Task.objects.create(
+            project=self.project, title='Quotes "and", commas', description="Line one\nline two", assigned_to=self.user,
+            deadline=timezone.now().replace(microsecond=0), priority="high",
+        )
+        self.bare = Task.objects.create(project=self.project, title="No comments")
+        Comment.objects.bulk_create([Comment(task=self.busy, user=self.user, text=f"Comment {n} ✅") for n in range(3)])
+        Task.objects.create(project=Project.objects.create(name="Elsewhere"), title="Not exported")
+
+    def export(self, export_format, **headers):
+        response = self.client.get(f"/api/projects/{self.project.id}/export/?format={export_format}", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content)
+
+    def test_ndjson_lists_each_task_then_its_comments(self):
+        response, body = self.export("ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(
+            [(line["type"], line["id"]) for line in lines],
+            [("task", self.busy.id)]
+            + [("comment", pk) for pk in Comment.objects.filter(task=self.busy).order_by("id").values_list("id", flat=True)]
+            + [("task", self.bare.id)],
+        )
+        task = TaskSerializer(Task.objects.with_comment_summary().get(pk=self.busy.id)).data
+        self.assertEqual(
+            {key: lines[0][key] for key in ("title", "description", "deadline", "updated_at")},
+            {key: task[key] for key in ("title", "description", "deadline", "updated_at")},
+        )
+        self.assertEqual(lines[0]["assigned_to"], {"id": self.user.id, "username": "member", "email": "member@example.com"})
+        self.assertEqual((lines[1]["task"], lines[1]["user"], lines[1]["text"]), (self.busy.id, "member", "Comment 0 ✅"))
+        self.assertIsNone(lines[-1]["assigned_to"])
+
+    def test_csv_has_one_row_per_task_comment_pair(self):
+        response, body = self.export("csv")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(response["Content-Disposition"], f'attachment; filename="project-{self.project.id}.csv"')
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual([row["task_id"] for row in rows], [str(self.busy.id)] * 3 + [str(self.bare.id)])
+        self.assertEqual((rows[0]["title"], rows[0]["description"]), ('Quotes "and", commas', "Line one\nline two"))
+        self.assertEqual([row["comment_text"] for row in rows], ["Comment 0 ✅", "Comment 1 ✅", "Comment 2 ✅", ""])
+        self.assertEqual((rows[-1]["assignee_username"], rows[-1]["deadline"]), ("", ""))
+
+    def test_gzip_when_accepted(self):
+        for export_format in ("ndjson", "csv"):
+            with self.subTest(format=export_format):
+                plain_response, plain = self.export(export_format)
+                gzipped_response, gzipped = self.export(export_format, accept_encoding="br, gzip;q=0.8")
+                self.assertNotIn("Content-Encoding", plain_response)
+                self.assertEqual(gzipped_response["Content-Encoding"], "gzip")
+                self.assertIn("Accept-Encoding", gzipped_response["Vary"])
+                self.assertEqual(gzip.decompress(gzipped), plain)
+
+    async def test_asgi_streams_chunk_by_chunk(self):
+        # Small chunks so the export needs several fetches and writes
+        self.enterContext(mock.patch.object(export, "CHUNK_SIZE", 2))
+        self.enterContext(mock.patch.object(export, "ROWS_PER_WRITE", 1))
+        headers = {"Authorization": self.client.defaults["HTTP_AUTHORIZATION"]}
+        for export_format in ("ndjson", "csv"):
+            for encoding in ("identity", "gzip"):
+                with self.subTest(format=export_format, encoding=encoding):
+                    url = f"/api/projects/{self.project.id}/export/?format={export_format}"
+                    expected = await sync_to_async(self.export)(export_format, accept_encoding=encoding)
+                    response = await AsyncClient().get(url, headers={**headers, "Accept-Encoding": encoding})
+                    # ✅ An async iterator: Django sends it as it goes instead of buffering a sync one
+                    self.assertTrue(response.is_async)
+                    chunks = [chunk async for chunk in response.streaming_content]
+                    self.assertGreater(len(chunks), 2)
+                    self.assertEqual(b"".join(chunks), expected[1])
+
+    def test_export_is_one_streamed_query(self):
+        Comment.objects.bulk_create([Comment(task=self.bare, user=self.user, text="More") for _ in range(50)])
+        response = self.client.get(f"/api/projects/{self.project.id}/export/")
+        with CaptureQueriesContext(connection) as captured:
+            lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual((len(captured), len(lines)), (1, 2 + 3 + 50))
+
+    def test_bad_format_and_outsiders(self):
+        response = self.client.get(f"/api/projects/{self.project.id}/export/?format=xml")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ndjson", response.json()["error"])
+        outsider = benchmarks.authenticated_client(User.objects.create(username="outsider"))
+        self.assertEqual(outsider.get(f"/api/projects/{self.project.id}/export/").status_code, 403)
+
+
+# ----------------- 🔹 Import 🔹 -----------------
+
+class ImportTests(TestCase):
+    """ Imports read what exports write, skip bad rows with their line numbers and batch the writes """
+
+    def setUp(self):
+        self.user = User.objects.create(username="member", email="member@example.com")
+        self.helper = User.objects.create(username="helper", email="Helper@Example.com")
+        self.source = Project.objects.create(name="Source")
+        self.target = Project.objects.create(name="Target")
+        for project in (self.source, self.target):
+            project.team_members.add(self.user, self.helper)
+        self.client = benchmarks.authenticated_client(self.user)
+
+        earlier = timezone.now() - datetime.timedelta(days=3)
+        for n in range(5):
+            task = Task.objects.create(
+                project=self.source, title=f'Task {n}, "quoted"', description="Multi\nline ✅" if n % 2 else None,
+                status=["to_do", "in_progress", "done"][n % 3], priority=["low", "medium", "high"][n % 3],
+                assigned_to=[self.user, self.helper, None][n % 3], deadline=earlier if n % 2 else None,
+            )
+            comments = Comment.objects.bulk_create([Comment(task=task, user=self.helper, text=f"Note {m}") for m in range(n)])
+            for m, comment in enumerate(comments):
+                comment.created_at = earlier + datetime.timedelta(minutes=m)
+            Comment.objects.bulk_update(comments, ["created_at"])
+
+    def upload(self, body, query="", content_type="application/x-ndjson"):
+        return self.client.post(f"/api/projects/{self.target.id}/import/{query}", body, content_type=content_type)
+
+    def snapshot(self, project):
+        """ The project's tasks and comments without ids or write times """
+        lines = [json.loads(line) for line in b"".join(
+            self.client.get(f"/api/projects/{project.id}/export/").streaming_content
+        ).decode().splitlines()]
+        return [{key: value for key, value in line.items() if key not in ("id", "task", "updated_at")} for line in lines]
+
+    def test_round_trip(self):
+        expected = self.snapshot(self.source)
+        for export_format in ("ndjson", "csv"):
+            with self.subTest(format=export_format):
+                Task.objects.filter(project=self.target).delete()
+                body = b"".join(self.client.get(f"/api/projects/{self.source.id}/export/?format={export_format}").streaming_content)
+                # A batch of two splits some tasks from their comments
+                response = self.upload(body, f"?format={export_format}&batch_size=2", content_type="text/csv" if export_format == "csv" else "application/x-ndjson")
+                self.assertEqual(response.json(), {"tasks": 5, "comments": 10, "error_count": 0, "errors": []})
+                self.assertEqual(self.snapshot(self.target), expected)
+
+    def test_bad_rows_are_reported_and_skipped(self):
+        body = "\n".join([
+            json.dumps({"id": "a", "title": "Good", "assigned_to": "helper@example.com"}),
+            "{not json",
+            json.dumps({"id": "b", "title": "", "status": "someday"}),
+            json.dumps({"type": "comment", "task": "a", "text": "Kept"}),
+            json.dumps({"type": "comment", "task": "b", "text": "Orphan"}),
+            json.dumps({"id": "c", "title": "Nobody", "assigned_to": "ghost"}),
+            json.dumps({"type": "epic"}),
+        ]).encode()
+        report = self.upload(body).json()
+        self.assertEqual((report["tasks"], report["comments"], report["error_count"]), (1, 1, 5))
+        self.assertEqual([error["line"] for error in report["errors"]], [2, 3, 5, 6, 7])
+        self.assertEqual(set(report["errors"][1]["errors"]), {"title", "status"})
+        self.assertEqual(list(report["errors"][2]["errors"]), ["task"])
+
+        task = Task.objects.get(project=self.target)
+        self.assertEqual((task.title, task.assigned_to_id), ("Good", self.helper.id))
+        # Comments without an author belong to whoever ran the import
+        self.assertEqual(task.comments.get().user_id, self.user.id)
+
+    def test_only_project_members_resolve(self):
+        outsider = User.objects.create(username="outsider", email="outsider@example.com")
+        body = "\n".join([
+            json.dumps({"id": "a", "title": "Assigned out", "assigned_to": "outsider"}),
+            json.dumps({"id": "b", "title": "Kept", "assigned_to": "HELPER@example.com"}),
+            json.dumps({"type": "comment", "task": "b", "user": "outsider@example.com", "text": "Impersonated"}),
+            json.dumps({"type": "comment", "task": "b", "user": "helper", "text": "Genuine"}),
+        ]).encode()
+        with self.assertNumQueries(1):
+            importer = imports.TaskImporter(self.target)
+        self.assertNotIn(outsider.id, importer.usernames.values())
+
+        report = self.upload(body).json()
+        self.assertEqual([error["line"] for error in report["errors"]], [1, 3])
+        self.assertEqual(list(report["errors"][0]["errors"]), ["assigned_to"])
+        self.assertEqual(list(report["errors"][1]["errors"]), ["user"])
+        task = Task.objects.get(project=self.target)
+        self.assertEqual(task.assigned_to_id, self.helper.id)
+        self.assertEqual(list(task.comments.values_list("user_id", "text")), [(self.helper.id, "Genuine")])
+
+    def test_decode_error_after_a_committed_batch_keeps_the_report(self):
+        body = b"\n".join([
+            json.dumps({"id": "a", "title": "First"}).encode(),
+            json.dumps({"id": "b", "title": ""}).encode(),
+            json.dumps({"id": "c", "title": "Second"}).encode(),
+            b'{"title": "\xff"}',
+            json.dumps({"id": "d", "title": "Never read"}).encode(),
+        ])
+        response = self.upload(body, "?batch_size=2")
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual((report["tasks"], report["error_count"]), (2, 2))
+        self.assertEqual([error["line"] for error in report["errors"]], [2, 4])
+        self.assertEqual(list(report["errors"][1]["errors"]), ["line"])
+        self.assertEqual(
+            sorted(Task.objects.filter(project=self.target).values_list("title", flat=True)), ["First", "Second"]
+        )
+
+    def test_multipart_csv_upload(self):
+        # A spreadsheet-style file: BOM, no ?format= (the .csv name decides) and a repeated key adding a second comment
+        upload = SimpleUploadedFile(
+            "tasks.csv", "\ufefftask_id,title,status,comment_text\n7,From a file,done,First\n7,,,Second\n".encode()
+        )
+        response = self.client.post(f"/api/projects/{self.target.id}/import/", {"file": upload})
+        self.assertEqual(response.json(), {"tasks": 1, "comments": 2, "error_count": 0, "errors": []})
+        task = Task.objects.get(project=self.target)
+        self.assertEqual((task.title, task.status), ("From a file", "done"))
+        self.assertEqual(sorted(task.comments.values_list("text", flat=True)), ["First", "Second"])
+
+    def test_unreadable_uploads(self):
+        cases = {
+            "no header": (b"1,2,3\n", "", "text/csv"),
+            "bad format": (b"{}", "?format=xml", "application/x-ndjson"),
+            "bad batch size": (b"{}", "?batch_size=lots", "application/x-ndjson"),
+            "not utf-8": (b'{"title": "\xff"}', "", "application/x-ndjson"),
+        }
+        for name, (body, query, content_type) in cases.items():
+            with self.subTest(name):
+                response = self.upload(body, query, content_type)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+        self.assertFalse(Task.objects.filter(project=self.target).exists())
+
+        outsider = benchmarks.authenticated_client(User.objects.create(username="outsider"))
+        response = outsider.post(f"/api/projects/{self.target.id}/import/", b'{"title": "x"}', content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 403)
+
+
+# ----------------- 🔹 Database Profile 🔹 -----------------
+
+class SQLiteConcurrencyTests(SimpleTestCase):
+    """
+    The SQLite profile from ``jira_backend.database`` against a file database:
+    the PRAGMAs and ``BEGIN IMMEDIATE`` are applied, and the lock conflicts
+    they exist for are replayed step by step on two connections (stock
+    settings deadlock a read-then-write transaction; the tuned profile makes
+    the second writer wait at ``BEGIN`` instead).
+    """
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def connect(self, config):
+        # A private handler under aliases the test database guard ignores; "first" and "second" are two connections
+        handler = ConnectionHandler({"default": config, "first": config, "second": config})
+        with handler["first"].cursor() as cursor:
+            cursor.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, body TEXT)")
+        self.addCleanup(handler.close_all)
+        # ✅ transaction.atomic() itself, so its BEGIN honours the configured transaction_mode
+        self.enterContext(mock.patch.object(transaction, "get_connection", lambda using=None: handler[using]))
+        return handler
+
+    @staticmethod
+    def execute(handler, alias, sql):
+        with handler[alias].cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchall()
+
+    def test_tuned_connections_apply_the_profile(self):
+        handler = self.connect(database_config("sqlite:///tuned.db", self.directory))
+        pragmas = {
+            name: self.execute(handler, "first", f"PRAGMA {name}")[0][0]
+            for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "temp_store")
+        }
+        # synchronous=NORMAL is 1, temp_store=MEMORY is 2
+        self.assertEqual(pragmas, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000, "cache_size": -20000, "temp_store": 2})
+        self.assertEqual(handler["first"].transaction_mode, "IMMEDIATE")
+
+    def test_stock_settings_deadlock_a_read_then_write(self):
+        handler = self.connect({"ENGINE": "django.db.backends.sqlite3", "NAME": str(self.directory / "stock.db"), "OPTIONS": {"timeout": 1}})
+        with self.assertRaisesMessage(OperationalError, "database is locked"):
+            with transaction.atomic(using="first"):
+                self.execute(handler, "first", "SELECT COUNT(*) FROM item")
+                with transaction.atomic(using="second"):
+                    self.execute(handler, "second", "SELECT COUNT(*) FROM item")
+                    self.execute(handler, "second", "INSERT INTO item (body) VALUES ('second')")
+                    # Both hold read locks and one already writes: no waiting resolves this, SQLite fails at once
+                    self.execute(handler, "first", "INSERT INTO item (body) VALUES ('first')")
+
+    def test_tuned_writers_wait_at_begin(self):
+        handler = self.connect(database_config("sqlite:///tuned.db", self.directory, sqlite_busy_timeout_ms=200))
+        with transaction.atomic(using="first"):
+            self.execute(handler, "first", "SELECT COUNT(*) FROM item")
+            # WAL: readers are never blocked by the writer
+            self.assertEqual(self.execute(handler, "second", "SELECT COUNT(*) FROM item"), [(0,)])
+            # The second writer is turned away at BEGIN, before it has read or written anything
+            with self.assertRaisesMessage(OperationalError, "database is locked"):
+                with transaction.atomic(using="second"):
+                    self.fail("BEGIN IMMEDIATE should not get the write lock")
+            self.execute(handler, "first", "INSERT INTO item (body) VALUES ('first')")
+
+        with transaction.atomic(using="second"):
+            self.execute(handler, "second", "INSERT INTO item (body) VALUES ('second')")
+        self.assertEqual(self.execute(handler, "first", "SELECT body FROM item ORDER BY id"), [("first",), ("second",)])
+
+
+# ----------------- 🔹 Async Views 🔹 -----------------
+
+class AsyncViewParityTests(TestCase):
+    """ Each async read view answers exactly like the sync DRF view it replaces under ASGI """
+
+    pairs = {
+        "user-list": (async_views.AsyncUserListView, views.UserListView),
+        "project-summary": (async_views.AsyncProjectSummaryView, views.ProjectSummaryView),
+        "task-list": (async_views.AsyncTaskListView, views.TaskListCreateView),
+        "task-detail": (async_views.AsyncTaskDetailView, views.TaskDetailView),
+        "comment-list": (async_views.AsyncCommentListView, views.CommentListCreateView),
+    }
+
+    def setUp(self):
+        users = User.objects.bulk_create([User(username=f"user{n}", email=f"user{n}@example.com") for n in range(4)])
+        projects, tasks = [], []
+        for n in range(2):
+            project = Project.objects.create(name=f"Project {n}")
+            project.team_members.add(users[0], users[n + 1])
+            projects.append(project.id)
+            tasks += Task.objects.bulk_create([
+                Task(
+                    project=project, title=f"Task {m}", status=["to_do", "in_progress", "done"][m % 3],
+                    priority=["low", "medium", "high"][m % 3], assigned_to=users[m % 2 * (n + 1)],
+                )
+                for m in range(7)
+            ])
+        Comment.objects.bulk_create([Comment(task=task, user=users[0], text=f"Note {k}") for task in tasks for k in range(3)])
+        self.dataset = {"projects": projects, "tasks": [task.id for task in tasks]}
+        token = benchmarks.authenticated_client(users[0]).defaults["HTTP_AUTHORIZATION"]
+        self.headers = {"HTTP_AUTHORIZATION": token}
+
+    def both(self, name, path, headers=None, **kwargs):
+        """ ``(async response, sync response)`` for one GET """
+        async_view, sync_view = self.pairs[name]
+        headers = self.headers if headers is None else headers
+        answer = async_to_sync(async_view.as_view())(RequestFactory().get(path, **headers), **kwargs)
+        expected = sync_view.as_view()(RequestFactory().get(path, **headers), **kwargs)
+        if hasattr(expected, "render"):
+            expected.render()
+        return answer, expected
+
+    def assertSameAnswer(self, name, path, headers=None, **kwargs):
+        answer, expected = self.both(name, path, headers, **kwargs)
+        self.assertEqual(answer.status_code, expected.status_code, path)
+        self.assertEqual(answer.content, expected.content, path)
+        self.assertEqual(answer.get("ETag"), expected.get("ETag"), path)
+        self.assertEqual(answer.get("Vary"), expected.get("Vary"), path)
+        return answer
+
+    def test_reads_match_the_sync_views(self):
+        project, task = self.dataset["projects"][0], self.dataset["tasks"][0]
+        self.assertSameAnswer("user-list", "/api/users/")
+        self.assertSameAnswer("project-summary", "/api/projects/summary/")
+        self.assertSameAnswer("task-list", f"/api/projects/{project}/tasks/?page_size=3&sort=-priority", project_id=project)
+        self.assertSameAnswer("task-list", f"/api/projects/{project}/tasks/?status=done", project_id=project)
+        self.assertSameAnswer("task-detail", f"/api/tasks/{task}/", pk=task)
+        self.assertSameAnswer("comment-list", f"/api/tasks/{task}/comments/?page_size=1", task_id=task)
+
+    def test_errors_match_the_sync_views(self):
+        project = self.dataset["projects"][0]
+        self.assertEqual(self.assertSameAnswer("task-list", f"/api/projects/{project}/tasks/?sort=bogus", project_id=project).status_code, 400)
+        self.assertEqual(self.assertSameAnswer("task-detail", "/api/tasks/999999/", pk=999999).status_code, 404)
+        self.assertEqual(self.assertSameAnswer("user-list", "/api/users/", headers={}).status_code, 401)
+        self.assertEqual(
+            self.assertSameAnswer("user-list", "/api/users/", headers={"HTTP_AUTHORIZATION": "Bearer junk"}).status_code, 401
+        )
+
+    def test_outsiders_are_refused(self):
+        outsider = User.objects.create(username="outsider")
+        project, task = self.dataset["projects"][0], self.dataset["tasks"][0]
+        headers = {"HTTP_AUTHORIZATION": benchmarks.authenticated_client(outsider).defaults["HTTP_AUTHORIZATION"]}
+        self.assertEqual(self.assertSameAnswer("task-list", f"/api/projects/{project}/tasks/", headers, project_id=project).status_code, 403)
+        self.assertEqual(self.assertSameAnswer("task-detail", f"/api/tasks/{task}/", headers, pk=task).status_code, 403)
+        self.assertEqual(self.assertSameAnswer("comment-list", f"/api/tasks/{task}/comments/", headers, task_id=task).status_code, 403)
+
+    def test_unchanged_task_list_is_not_modified(self):
+        project = self.dataset["projects"][0]
+        answer, _ = self.both("task-list", f"/api/projects/{project}/tasks/", project_id=project)
+        headers = {**self.headers, "HTTP_IF_NONE_MATCH": answer["ETag"]}
+        answer, expected = self.both("task-list", f"/api/projects/{project}/tasks/", headers, project_id=project)
+        self.assertEqual((answer.status_code, expected.status_code), (304, 304))
+
+
+# ----------------- 🔹 Stateless Authentication 🔹 -----------------
+
+class StatelessAuthTests(TestCase):
+    """ Claims-based auth on a membership cache every worker shares (a file cache here) """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        shared = {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": directory}
+        self.enterContext(self.settings(JIRA_STATELESS_AUTH=True, CACHES={**settings.CACHES, "membership": shared}))
+        owner, self.user = User.objects.create(username="owner"), User.objects.create(username="member")
+        project, other = Project.objects.create(name="Mine"), Project.objects.create(name="Theirs")
+        project.team_members.add(owner, self.user)
+        other.team_members.add(owner)
+        task = Task.objects.create(project=project, title="Task", status="to_do", priority="low", assigned_to=owner)
+        self.project, self.other = project.id, other.id
+        self.dataset = {"tasks": [task.id]}
+        self.client = benchmarks.authenticated_client(self.user)
+
+    def test_requests_do_not_load_the_user(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(f"/api/projects/{self.project}/tasks/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query["sql"] for query in captured.captured_queries if 'FROM "auth_user"' in query["sql"]])
+        self.assertFalse([query["sql"] for query in captured.captured_queries if "jira_app_project_team_members" in query["sql"]])
+
+    def test_revoked_membership_is_enforced(self):
+        self.assertEqual(self.client.get(f"/api/projects/{self.project}/tasks/").status_code, 200)
+        Project.objects.get(id=self.project).team_members.remove(self.user)
+        # The same access token still lists the project, but its membership version is stale
+        self.assertEqual(self.client.get(f"/api/projects/{self.project}/tasks/").status_code, 403)
+        self.assertEqual(self.client.get(f"/api/tasks/{self.dataset['tasks'][0]}/").status_code, 403)
+
+    def test_new_membership_is_seen_before_the_token_is_refreshed(self):
+        self.assertEqual(self.client.get(f"/api/projects/{self.other}/tasks/").status_code, 403)
+        Project.objects.get(id=self.other).team_members.add(self.user)
+        self.assertEqual(self.client.get(f"/api/projects/{self.other}/tasks/").status_code, 200)
+
+    def test_settings_refuse_a_per_process_membership_cache(self):
+        def check(**env):
+            return subprocess.run(
+                [sys.executable, "manage.py", "check"], cwd=settings.BASE_DIR, capture_output=True, text=True,
+                env={**os.environ, "STATELESS_AUTH": "True", **env},
+            )
+        refused = check(MEMBERSHIP_CACHE_BACKEND="memory")
+        self.assertNotEqual(refused.returncode, 0)
+        self.assertIn("STATELESS_AUTH needs a membership cache shared by all workers", refused.stderr)
+        self.assertEqual(check(MEMBERSHIP_CACHE_BACKEND="file", MEMBERSHIP_CACHE_LOCATION=tempfile.gettempdir()).returncode, 0)
+
+
+# ----------------- 🔹 Login 🔹 -----------------
+
+@override_settings(JIRA_PBKDF2_ITERATIONS=1000)
+class LoginTests(TestCase):
+    """ /api/login/: username or email, equal work for unknown accounts, failures throttled per identifier """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ada", "ada@example.com", "correct horse")
+
+    def login(self, identifier, password="correct horse"):
+        return self.client.post("/api/login/", {"username": identifier, "password": password}, content_type="application/json")
+
+    def test_username_or_email(self):
+        for identifier in ("ada", "ada@example.com"):
+            response = self.login(identifier)
+            self.assertEqual(response.status_code, 200, identifier)
+            self.assertEqual(response.json()["user"]["id"], self.user.id)
+        self.assertEqual(self.login("ada", "wrong").status_code, 401)
+        self.assertEqual(self.client.post("/api/login/", {"username": "ada"}, content_type="application/json").status_code, 400)
+        # Bodies that are not JSON objects are rejected, not a server error
+        for body in ([{"username": "ada"}], '"ada"', 7):
+            self.assertEqual(self.client.post("/api/login/", body, content_type="application/json").status_code, 400, body)
+
+    def test_unknown_accounts_still_hash_the_password(self):
+        with mock.patch("django.contrib.auth.base_user.make_password", wraps=make_password) as hashed:
+            self.assertEqual(self.login("nobody@example.com").status_code, 401)
+        hashed.assert_called_once_with("correct horse")
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+        with self.settings(JIRA_PBKDF2_ITERATIONS=1200):
+            self.assertEqual(self.login("ada").status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1200$"))
+
+    def test_only_failures_are_throttled(self):
+        for _ in range(12):
+            self.assertEqual(self.login("ada").status_code, 200)
+        for _ in range(10):
+            self.assertEqual(self.login("ADA", "wrong").status_code, 401)
+        # The identifier is locked, right password or not; other accounts are not
+        self.assertEqual(self.login("ada").status_code, 429)
+        self.assertEqual(self.login("ada@example.com", "wrong").status_code, 401)
+
+
+# ----------------- 🔹 Dashboard Counters 🔹 -----------------
+
+class TaskCounterTests(TestCase):
+    """ The counters follow every task write without re-reading the task being saved """
+
+    def setUp(self):
+        owner, helper = User.objects.create(username="owner"), User.objects.create(username="helper")
+        project = Project.objects.create(name="Board")
+        project.team_members.add(owner, helper)
+        start = datetime.datetime(2030, 3, 1, 9, 0, tzinfo=datetime.timezone.utc)
+        tasks = [
+            Task.objects.create(
+                project=project, title=f"Task {n}", status=["to_do", "in_progress", "done"][n % 3],
+                priority=["low", "medium", "high"][n % 3], assigned_to=[owner, helper, None][n % 3],
+                deadline=start + datetime.timedelta(days=4 * n) if n % 2 else None,
+            )
+            for n in range(5)
+        ]
+        self.dataset = {"owner": owner, "tasks": [task.id for task in tasks]}
+        self.project_id = project.id
+
+    def test_string_deadline_counts_in_its_week(self):
+        task = Task.objects.create(project_id=self.project_id, title="Launch", deadline="2030-01-03T00:00:00Z")
+        self.assertEqual(TaskCounter.objects.get(project_id=self.project_id, due_week=datetime.date(2029, 12, 31)).count, 1)
+        # Another deadline in the same week shares the row
+        Task.objects.create(project_id=self.project_id, title="Follow-up", deadline="2030-01-06T23:00:00Z")
+        self.assertEqual(TaskCounter.objects.get(project_id=self.project_id, due_week=datetime.date(2029, 12, 31)).count, 2)
+
+        task.deadline = "2030-02-01T10:00:00Z"
+        task.save()
+        self.assertEqual(counters.due_week("2030-02-01T10:00:00Z"), datetime.date(2030, 1, 28))
+        self.assertEqual(counters.drift(), [])
+
+    def test_overdue_means_the_deadline_has_passed(self):
+        user = self.dataset["owner"]
+        project = Project.objects.create(name="Deadlines")
+        project.team_members.add(user)
+        now = datetime.datetime(2030, 1, 9, 12, 0, tzinfo=datetime.timezone.utc)  # A Wednesday
+        for deadline, status, assignee in (
+            (now - datetime.timedelta(minutes=1), "to_do", user),  # Overdue and due today
+            (now + datetime.timedelta(minutes=1), "to_do", None),  # Due today, not overdue yet
+            (now - datetime.timedelta(days=2), "in_progress", None),  # Monday: this week, overdue
+            (now - datetime.timedelta(days=3), "to_do", user),  # Last Sunday: an earlier week, overdue
+            (now + datetime.timedelta(days=7), "to_do", user),  # Next week
+            (now - datetime.timedelta(minutes=1), "done", user),  # Done is never overdue
+        ):
+            Task.objects.create(project=project, title="Due", deadline=deadline, status=status, assigned_to=user if assignee else None)
+        client = benchmarks.authenticated_client(user)
+
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            board = next(row for row in client.get("/api/dashboard/").json()["projects"] if row["id"] == project.id)
+            summary = next(row for row in client.get("/api/projects/summary/").json() if row["id"] == project.id)
+            mine = counters.dashboard(user.id, [project.id])["assigned_to_me"]
+        self.assertEqual((board["overdue_count"], board["due_today_count"], board["open_count"]), (3, 2, 5))
+        self.assertEqual(summary["overdue_count"], 3)
+        self.assertEqual((mine["overdue_count"], mine["due_today_count"], mine["open_count"]), (2, 1, 3))
+        self.assertEqual(counters.drift(), [])
+
+    def test_saving_a_loaded_task_does_not_select_it_again(self):
+        task = Task.objects.get(id=self.dataset["tasks"][0])
+        task.status, task.priority = "done", "high"
+        with CaptureQueriesContext(connection) as captured:
+            task.save(update_fields=["status", "priority"])
+        selects = [query["sql"] for query in captured.captured_queries if query["sql"].startswith("SELECT")]
+        self.assertFalse([sql for sql in selects if '"jira_app_task"' in sql.split("WHERE")[0]], selects)
+        self.assertEqual(counters.drift(), [])
+
+        task.save()
+        task.assigned_to_id = None
+        task.save(update_fields=["assigned_to"])
+        self.assertEqual(counters.drift(), [])
+
+    def test_deferred_and_hand_built_tasks_still_count(self):
+        task = Task.objects.only("id", "status").get(id=self.dataset["tasks"][1])
+        task.status = "in_progress" if task.status != "in_progress" else "done"
+        task.save(update_fields=["status"])
+        Task(id=self.dataset["tasks"][2], project_id=self.project_id, title="Rewritten", status="done").save()
+        self.assertEqual(counters.drift(), [])
+
+
+# ----------------- 🔹 Metrics & Profiling 🔹 -----------------
+
+class MetricsEndpointTests(TestCase):
+    """ /api/_metrics and X-Profile need the metrics token (or DEBUG); the stack sampler follows sync views off the event loop """
+
+    def setUp(self):
+        self.bearer = benchmarks.authenticated_client(User.objects.create(username="profiled")).defaults["HTTP_AUTHORIZATION"]
+
+    def test_metrics_need_a_token_or_debug(self):
+        with self.settings(JIRA_METRICS_TOKEN=""):
+            self.assertEqual(self.client.get("/api/_metrics").status_code, 403)
+            with self.settings(DEBUG=True):
+                self.assertEqual(self.client.get("/api/_metrics").status_code, 200)
+
+        with self.settings(JIRA_METRICS_TOKEN="scrape-me"):
+            self.assertEqual(self.client.get("/api/_metrics").status_code, 401)
+            self.assertEqual(self.client.get("/api/_metrics", headers={"Authorization": "Bearer nope"}).status_code, 401)
+            response = self.client.get("/api/_metrics", headers={"Authorization": "Bearer scrape-me"})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b"# TYPE", response.content)
+
+    @override_settings(JIRA_PROFILE_REQUESTS=True, JIRA_METRICS_TOKEN="profile-me")
+    def test_profiling_needs_the_metrics_token(self):
+        def mode(token=None, profile="cprofile"):
+            headers = {"X-Profile": profile, **({"X-Profile-Token": token} if token else {})}
+            return profiling.requested_mode(RequestFactory().get("/api/users/", headers=headers))
+
+        self.assertIsNone(mode())
+        self.assertIsNone(mode("guess"))
+        self.assertEqual(mode("profile-me"), "cprofile")
+        with self.settings(JIRA_METRICS_TOKEN=""):
+            self.assertIsNone(mode(profile="stacks"))
+            with self.settings(DEBUG=True):
+                self.assertEqual(mode(profile="stacks"), "stacks")
+
+    @override_settings(JIRA_PROFILE_REQUESTS=True, JIRA_PROFILE_SLOW_MS=60_000, JIRA_METRICS_TOKEN="profile-me")
+    async def test_stack_sampler_moves_to_the_view_thread(self):
+        sampled, stop = [], profiling.StackSampler.stop
+
+        def record(sampler):
+            sampled.append(sampler.thread_id)
+            stop(sampler)
+
+        with mock.patch.object(profiling.StackSampler, "stop", record):
+            response = await AsyncClient().get("/api/users/", headers={"Authorization": self.bearer, "X-Profile": "stacks", "X-Profile-Token": "profile-me"})
+        self.assertEqual(response.status_code, 200, response.content)
+        # The middleware ran on this (event loop) thread; the sync view did not
+        self.assertEqual(len(sampled), 1)
+        self.assertNotEqual(sampled[0], threading.get_ident())
+
+
+# ----------------- 🔹 API Benchmarks 🔹 -----------------
+
+class BenchmarkGateTests(SimpleTestCase):
+    """ ``benchmarks.regressions``: query counts and sizes always gate, latency only on request """
+
+    baseline = {"small": {"GET task-list": {"queries": 4, "bytes": 1000, "p50_ms": 10.0, "p95_ms": 12.0}}}
+
+    def result(self, **changes):
+        result = {"queries": 4, "bytes": 1000, "p50_ms": 10.0, "p95_ms": 12.0, "check_size": True, "_sql": [], **changes}
+        return {"GET task-list": result}
+
+    def test_latency_is_reported_only_when_asked(self):
+        slow = self.result(p50_ms=100.0, p95_ms=150.0)
+        self.assertEqual(benchmarks.regressions("small", slow, self.baseline), [])
+        self.assertEqual(len(benchmarks.regressions("small", slow, self.baseline, latency_tolerance=3)), 1)
+        self.assertEqual(benchmarks.regressions("small", self.result(p50_ms=14.0), self.baseline, latency_tolerance=3), [])
+
+    def test_queries_and_sizes_always_gate(self):
+        self.assertIn("5 queries", benchmarks.regressions("small", self.result(queries=5), self.baseline)[0])
+        self.assertIn("1200 bytes", benchmarks.regressions("small", self.result(bytes=1200), self.baseline)[0])
+        self.assertEqual(benchmarks.regressions("small", self.result(bytes=1050), self.baseline), [])
+        self.assertEqual(benchmarks.regressions("small", self.result(bytes=1200, check_size=False), self.baseline), [])
+
+
+# Cheap password hashing: login and register cost is measured by bench_login, not here
+@override_settings(JIRA_PBKDF2_ITERATIONS=1000)
+class APIBenchmarkTests(TestCase):
+    """
+    Every endpoint at each scale in ``BENCH_SCALES`` (default ``small,medium``),
+    ``BENCH_REPEAT`` timed requests each, checked against
+    ``jira_app/benchmark_baseline.json``. Query counts and sizes always gate;
+    latencies are only reported unless ``BENCH_LATENCY=True``, with
+    ``BENCH_LATENCY_TOLERANCE`` as the allowed median slowdown factor
+    (default 3). ``BENCH_UPDATE_BASELINE=True`` rewrites the baseline from
+    this run instead of checking it. The result tables are printed with
+    ``BENCH_REPORT=True`` and otherwise appear only in a failure message.
+    """
+
+    scales = [scale.strip() for scale in os.getenv("BENCH_SCALES", "small,medium").split(",") if scale.strip()]
+    repeat = int(os.getenv("BENCH_REPEAT", "10"))
+    # ✅ Shared CI machines are too noisy for a timing gate by default
+    check_latency = os.getenv("BENCH_LATENCY", "False") == "True"
+    latency_tolerance = float(os.getenv("BENCH_LATENCY_TOLERANCE", "3"))
+    update_baseline = os.getenv("BENCH_UPDATE_BASELINE", "False") == "True"
+    print_report = os.getenv("BENCH_REPORT", "False") == "True"
+
+    @override_settings(JIRA_METRICS_TOKEN="bench-metrics")
+    def test_endpoints_within_baseline(self):
+        baseline = benchmarks.load_baseline()
+        results, found, reports = {}, [], []
+        for scale in self.scales:
+            cache.clear()
+            with transaction.atomic():
+                dataset = datasets.generate(seed=0, **datasets.SCALES[scale])
+                results[scale] = benchmarks.run(dataset, repeat=self.repeat)
+                transaction.set_rollback(True)
+            reports.append(benchmarks.report(scale, results[scale]))
+            if self.print_report or self.update_baseline:
+                sys.stderr.write("\n" + reports[-1] + "\n")
+
+            for key, result in results[scale].items():
+                self.assertLess(result["status"], 400, f"{scale} {key} answered {result['status']}")
+            if not self.update_baseline:
+                found += benchmarks.regressions(
+                    scale, results[scale], baseline, latency_tolerance=self.latency_tolerance if self.check_latency else None,
+                )
+
+        if self.update_baseline:
+            benchmarks.save_baseline(results)
+            return
+        self.assertFalse(found, "Benchmark regressions:\n" + "\n".join(found) + "\n\n" + "\n\n".join(reports))
+
+
+# ----------------- 🔹 Query Counts 🔹 -----------------
+
+class QueryCountTests(TestCase):
+    """
+    Every list and detail view must run the same number of queries whatever
+    the number of projects, members, tasks or comments behind it. Each test
+    requests the same endpoint against a tiny and a large dataset (on the
+    default in-memory SQLite test database) and fails with both captured SQL
+    logs when the counts differ, which is what a serializer doing a per-row
+    lookup looks like.
+    """
+
+    def capture(self, path, scale):
+        """ ``(response, captured queries)`` for one cold request as ``bench-user-0`` """
+        with transaction.atomic():
+            dataset = datasets.generate(seed=0, **scale)
+            cache.clear()
+            client = benchmarks.authenticated_client(dataset["owner"])
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(path.format(**benchmarks.context_for(dataset)))
+                if response.streaming:
+                    b"".join(response.streaming_content)
+            transaction.set_rollback(True)
+        self.assertEqual(response.status_code, 200, f"GET {path} answered {response.status_code}")
+        return response, captured
+
+    def assertConstantQueries(self, path, few, many):
+        few_response, few_queries = self.capture(path, few)
+        many_response, many_queries = self.capture(path, many)
+        # The larger dataset must really show more, or the comparison proves nothing
+        self.assertGreater(len(many_response.content), len(few_response.content), f"GET {path} did not grow")
+        if len(few_queries) != len(many_queries):
+            log = "\n".join(
+                f"--- {len(captured)} queries for {scale}:\n" + "\n".join(query["sql"] for query in captured.captured_queries)
+                for scale, captured in ((few, few_queries), (many, many_queries))
+            )
+            self.fail(f"GET {path} ran {len(few_queries)} queries on the small dataset but {len(many_queries)} on the large one\n{log}")
+
+    def test_user_list(self):
+        self.assertConstantQueries(
+            "/api/users/",
+            {"users": 1, "projects": 1, "members": 0, "tasks": 1, "comments": 0},
+            {"users": 50, "projects": 1, "members": 0, "tasks": 1, "comments": 0},
+        )
+
+    def test_project_list(self):
+        few = {"users": 2, "projects": 1, "members": 1, "tasks": 1, "comments": 1}
+        many = {"users": 20, "projects": 100, "members": 10, "tasks": 5, "comments": 3}
+        for fast in (True, False):
+            with self.subTest(fast_rows=fast), self.settings(JIRA_FAST_LIST_RESPONSES=fast):
+                self.assertConstantQueries("/api/projects/", few, many)
+
+    def test_project_summary(self):
+        self.assertConstantQueries(
+            "/api/projects/summary/",
+            {"users": 2, "projects": 1, "members": 1, "tasks": 1, "comments": 1},
+            {"users": 20, "projects": 100, "members": 10, "tasks": 5, "comments": 3},
+        )
+
+    def test_project_detail(self):
+        self.assertConstantQueries(
+            "/api/projects/{project}/",
+            {"users": 2, "projects": 1, "members": 1, "tasks": 1, "comments": 1},
+            {"users": 50, "projects": 1, "members": 40, "tasks": 100, "comments": 10},
+        )
+
+    def test_task_list(self):
+        few = {"users": 2, "projects": 1, "members": 1, "tasks": 1, "comments": 1}
+        many = {"users": 50, "projects": 1, "members": 40, "tasks": 100, "comments": 10}
+        for fast in (True, False):
+            with self.subTest(fast_rows=fast), self.settings(JIRA_FAST_LIST_RESPONSES=fast):
+                self.assertConstantQueries("/api/projects/{project}/tasks/", few, many)
+
+    def test_task_detail(self):
+        self.assertConstantQueries(
+            "/api/tasks/{task}/",
+            {"users": 2, "projects": 1, "members": 1, "tasks": 1, "comments": 1},
+            {"users": 50, "projects": 1, "members": 40, "tasks": 1, "comments": 1000},
+        )
+
+    def test_comment_list(self):
+        self.assertConstantQueries(
+            "/api/tasks/{task}/comments/",
+            {"users": 2, "projects": 1, "members": 1, "tasks": 1, "comments": 1},
+            {"users": 50, "projects": 1, "members": 40, "tasks": 1, "comments": 1000},
+        )
+
+    def test_dashboard(self):
+        self.assertConstantQueries(
+            "/api/dashboard/",
+            {"users": 2, "projects": 1, "members": 1, "tasks": 1, "comments": 0},
+            {"users": 20, "projects": 100, "members": 10, "tasks": 20, "comments": 0},
+        )
+
+
+# ----------------- 🔹 Deadline Reminders 🔹 -----------------
+
+class ReminderTests(TestCase):
+    """
+    Scans run with explicit times a few days in the past, so every cursor
+    stays behind the wall clock as it does under ``run_reminders``.
+    """
+
+    def setUp(self):
+        self.base = timezone.now() - datetime.timedelta(days=5)
+        self.project = Project.objects.create(name="Reminders")
+        self.soon = self.task("Due in two hours", hours=2)
+        self.later = self.task("Due in two days", hours=48)
+        self.late = self.task("Overdue before reminders existed", hours=-1)
+        self.done = self.task("Finished", hours=1, status="done")
+
+    def task(self, title, hours, **fields):
+        return Task.objects.create(
+            project=self.project, title=title, deadline=self.base + datetime.timedelta(hours=hours), **fields
+        )
+
+    def at(self, hours):
+        return self.base + datetime.timedelta(hours=hours)
+
+    def kinds(self, task):
+        return list(Reminder.objects.filter(task=task).order_by("id").values_list("kind", flat=True))
+
+    def test_first_scan_starts_at_now_without_backfilling(self):
+        self.assertEqual(reminders.scan(now=self.base), {"due_soon": 0, "overdue": 0})
+        self.assertFalse(Reminder.objects.exists())
+        self.assertEqual(set(ReminderCursor.objects.values_list("scanned_through", flat=True)), {self.base})
+
+    def test_scans_emit_due_soon_then_overdue(self):
+        reminders.scan(now=self.base)
+        self.assertEqual(reminders.scan(now=self.at(3)), {"due_soon": 0, "overdue": 1})
+        self.assertEqual(self.kinds(self.soon), ["overdue"])
+        self.assertEqual(reminders.scan(now=self.at(25)), {"due_soon": 1, "overdue": 0})
+        self.assertEqual(self.kinds(self.later), ["due_soon"])
+        self.assertEqual(reminders.scan(now=self.at(49)), {"due_soon": 0, "overdue": 1})
+        self.assertEqual(self.kinds(self.later), ["due_soon", "overdue"])
+        # Done tasks and deadlines that had passed before the first scan are never reported
+        self.assertEqual(self.kinds(self.done) + self.kinds(self.late), [])
+
+    def test_rescanning_is_idempotent(self):
+        reminders.scan(now=self.base)
+        reminders.scan(now=self.at(49), batch_size=1)
+        emitted = Reminder.objects.count()
+        ReminderCursor.objects.update(scanned_through=self.base)
+        self.assertEqual(reminders.scan(now=self.at(49), batch_size=1), {"due_soon": 0, "overdue": 0})
+        self.assertEqual(Reminder.objects.count(), emitted)
+
+    def test_moving_a_deadline_behind_the_cursor_emits_the_latest_kind(self):
+        reminders.scan(now=self.base)
+        reminders.scan(now=self.at(10))
+        self.late.deadline = self.at(5)
+        self.late.save(update_fields=["deadline"])
+        self.assertEqual(self.kinds(self.late), ["overdue"])
+        # An ISO string (as create() keeps it) is parsed, and lands in the scanned "due soon" slice
+        moved = self.task("Imported", hours=24 * 30)
+        moved.deadline = self.at(20).isoformat()
+        moved.save()
+        self.assertEqual(self.kinds(moved), ["due_soon"])
+        self.assertEqual(reminders.scan(now=self.at(10)), {"due_soon": 0, "overdue": 0})
+
+    def test_far_deadlines_are_left_to_the_scan_without_reading_the_cursors(self):
+        reminders.scan(now=self.base)
+        far = Task(project=self.project, title="Next year", deadline=timezone.now() + datetime.timedelta(days=365))
+        with CaptureQueriesContext(connection) as captured:
+            reminders.reschedule([far])
+        self.assertEqual(len(captured), 0)
+
+    def test_next_fire_time_is_the_earliest_pending_reminder(self):
+        reminders.scan(now=self.base)
+        self.assertEqual(reminders.next_fire_time(), self.soon.deadline)
+        reminders.scan(now=self.at(3))
+        self.assertEqual(reminders.next_fire_time(), self.later.deadline - reminders.lead_times()["due_soon"])
+
+
+# ----------------- 🔹 Outbox 🔹 -----------------
+
+DELIVERED = []
+
+
+def record_delivery(topic, payload):
+    DELIVERED.append((topic, payload))
+
+
+def failing_handler(topic, payload):
+    raise RuntimeError("webhook down")
+
+
+@override_settings(JIRA_OUTBOX_HANDLERS={"comment.created": ["jira_app.tests.record_delivery"]})
+class OutboxTests(TestCase):
+    """ Messages commit with the write that produced them and the worker retries, dead-letters and re-leases """
+
+    def setUp(self):
+        DELIVERED.clear()
+        self.dataset = datasets.generate(seed=0, users=2, projects=1, members=1, tasks=1, comments=0)
+        self.client = benchmarks.authenticated_client(self.dataset["owner"])
+        self.worker = outbox.OutboxWorker(worker_id="test", threads=2, max_attempts=2)
+        self.addCleanup(self.worker.close)
+
+    def post_comment(self):
+        return self.client.post(f"/api/tasks/{self.dataset['tasks'][0]}/comments/", {"text": "Hi"}, content_type="application/json")
+
+    def test_comment_is_delivered_by_the_worker(self):
+        self.assertEqual(self.post_comment().status_code, 201)
+        self.assertEqual(list(OutboxMessage.objects.values_list("topic", flat=True)), ["comment.created"])
+
+        self.assertEqual(self.worker.run_once(), {"delivered": 1, "retried": 0, "dead": 0})
+        self.assertEqual(DELIVERED[0][1]["data"]["text"], "Hi")
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_bulk_deletes_are_delivered(self):
+        task_id = self.dataset["tasks"][0]
+        with self.settings(JIRA_OUTBOX_HANDLERS={"task.deleted": ["jira_app.tests.record_delivery"]}):
+            response = self.client.post("/api/tasks/bulk/", {"delete": [task_id]}, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.worker.run_once(), {"delivered": 1, "retried": 0, "dead": 0})
+        self.assertEqual(DELIVERED, [("task.deleted", {"project": self.dataset["projects"][0], "data": {"id": task_id}})])
+        with self.settings(JIRA_WEBHOOK_URL="https://hooks.example.com/jira"):
+            self.assertIn(outbox.handler_name(outbox.post_webhook), outbox.handlers_for("task.deleted"))
+
+    def test_rolled_back_write_leaves_no_message(self):
+        with transaction.atomic():
+            self.post_comment()
+            transaction.set_rollback(True)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_topics_without_handlers_are_not_stored(self):
+        self.assertEqual(outbox.enqueue("task.created", {"project": 1, "data": {}}), [])
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_failures_back_off_then_dead_letter(self):
+        with self.settings(JIRA_OUTBOX_HANDLERS={"comment.created": ["jira_app.tests.failing_handler"]}):
+            self.post_comment()
+        self.assertEqual(self.worker.run_once(), {"delivered": 0, "retried": 1, "dead": 0})
+        message = OutboxMessage.objects.get()
+        self.assertGreater(message.available_at, timezone.now())
+        self.assertIn("webhook down", message.last_error)
+        self.assertEqual(self.worker.run_once(), {"delivered": 0, "retried": 0, "dead": 0})
+
+        OutboxMessage.objects.update(available_at=timezone.now())
+        self.assertEqual(self.worker.run_once(), {"delivered": 0, "retried": 0, "dead": 1})
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(DeadLetter.objects.get().attempts, 2)
+
+    def test_expired_lease_is_claimed_again(self):
+        self.post_comment()
+        claimed = self.worker.claim()
+        self.assertEqual(len(claimed), 1)
+        other = outbox.OutboxWorker(worker_id="other", threads=1)
+        self.addCleanup(other.close)
+        self.assertEqual(other.claim(), [])
+
+        OutboxMessage.objects.update(locked_until=timezone.now() - datetime.timedelta(seconds=1))
+        self.assertEqual(other.run_once(), {"delivered": 1, "retried": 0, "dead": 0})
+        # The first worker lost the message; settling it late changes nothing
+        self.assertEqual(self.worker.settle([(claimed[0], None)]), {"delivered": 0, "retried": 0, "dead": 0})
+        self.assertEqual(len(DELIVERED), 1)
@@ -0,0 +1,40 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginIdentifierThrottle(SimpleRateThrottle):
+    """
+    Limit failed login attempts per username/email (rate ``DEFAULT_THROTTLE_RATES['login']``),
+    whichever address they come from. Successful logins are not counted: the view
+    reports failures with ``record_failure``. Counts live in the default cache, so
+    use a shared backend when running several workers.
+    """
+
+    scope = "login"
+
+    def get_cache_key(self, request, view):
+        # A JSON body may be a list or a scalar; only objects carry a username
+        identifier = request.data.get("username") if isinstance(request.data, dict) else None
+        if not isinstance(identifier, str) or not identifier.strip():
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": identifier.strip().lower()}
+
+    def allow_request(self, request, view):
+        """ Refuse while the identifier has ``num_requests`` failures in the window; records nothing """
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        self.history = [moment for moment in self.cache.get(self.key, []) if moment > self.now - self.duration]
+        if len(self.history) >= self.num_requests:
+            return self.throttle_failure()
+        return True
+
+    def record_failure(self, request, view):
+        """ Count one failed attempt against the identifier """
+        if self.rate is None or self.get_cache_key(request, view) is None:
+            return
+        self.allow_request(request, view)
+        self.history.insert(0, self.now)
+        self.cache.set(self.key, self.history, self.duration)
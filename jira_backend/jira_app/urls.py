@@ -1,19 +1,50 @@
+from django.conf import settings
 from django.urls import path
+from rest_framework_simplejwt.views import TokenRefreshView
+from .metrics import metrics_view
 from .views import (
     RegisterView, LoginView, UserListView,
-    ProjectListCreateView, ProjectDetailView, ProjectAssignedUsersView,
-    TaskListCreateView, TaskDetailView, UpdateTaskStatusView,
-    CommentListCreateView
+    ProjectListCreateView, ProjectSummaryView, ProjectDetailView, ProjectChangesView, ProjectExportView, ProjectImportView, ProjectAssignedUsersView,
+    TaskListCreateView, TaskDetailView, UpdateTaskStatusView, BulkTaskView,
+    CommentListCreateView, DashboardView, SearchView
 )
 
+# ✅ Under ASGI the hot read endpoints are served by native async views
+if settings.JIRA_ASYNC_VIEWS:
+    from .async_views import (
+        AsyncCommentListView, AsyncProjectSummaryView, AsyncTaskDetailView, AsyncTaskListView,
+        AsyncUserListView, read_async,
+    )
+
+    user_list = AsyncUserListView.as_view()
+    project_summary = AsyncProjectSummaryView.as_view()
+    task_list = read_async(AsyncTaskListView.as_view(), TaskListCreateView.as_view())
+    task_detail = AsyncTaskDetailView.as_view()
+    comment_list = read_async(AsyncCommentListView.as_view(), CommentListCreateView.as_view())
+else:
+    user_list = UserListView.as_view()
+    project_summary = ProjectSummaryView.as_view()
+    task_list = TaskListCreateView.as_view()
+    task_detail = TaskDetailView.as_view()
+    comment_list = CommentListCreateView.as_view()
+
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
-    path("users/", UserListView.as_view(), name="user-list"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
+    path("users/", user_list, name="user-list"),
     path("projects/", ProjectListCreateView.as_view(), name="project-list"),
+    path("projects/summary/", project_summary, name="project-summary"),
     path("projects/<int:pk>/", ProjectDetailView.as_view(), name="project-detail"),
-    path("projects/<int:project_id>/tasks/", TaskListCreateView.as_view(), name="task-list"),
-    path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
+    path("projects/<int:project_id>/changes/", ProjectChangesView.as_view(), name="project-changes"),
+    path("projects/<int:project_id>/export/", ProjectExportView.as_view(), name="project-export"),
+    path("projects/<int:project_id>/import/", ProjectImportView.as_view(), name="project-import"),
+    path("projects/<int:project_id>/tasks/", task_list, name="task-list"),
+    path("tasks/bulk/", BulkTaskView.as_view(), name="task-bulk"),
+    path("tasks/<int:pk>/", task_detail, name="task-detail"),
     path("tasks/<int:task_id>/update-status/", UpdateTaskStatusView.as_view(), name="update-task-status"),
-    path("tasks/<int:task_id>/comments/", CommentListCreateView.as_view(), name="comment-list"),
+    path("tasks/<int:task_id>/comments/", comment_list, name="comment-list"),
+    path("dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("_metrics", metrics_view, name="metrics"),
 ]
@@ -1,17 +1,47 @@
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth.models import User
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from . import counters, reminders
+from .authentication import ClaimsRefreshToken
+from .bulk import BulkTaskError, apply_bulk_tasks
+from .changes import MAX_CHANGES_PAGE, CursorExpired, changes_since, record_tasks
+from .export import FORMATS as EXPORT_FORMATS, accepts_gzip, aexport_stream, export_stream
+from .conditional import conditional_get, project_state, task_list_state, task_state
+from .filters import FilterError, filter_tasks
+from .imports import DEFAULT_BATCH_SIZE, ImportFormatError, import_tasks
+from .metrics import MetricsMixin
 from .models import Project, Task, Comment
-from .serializers import ProjectSerializer, TaskSerializer, CommentSerializer, UserSerializer
+from .outbox import enqueue
+from .pagination import KeysetPagination
+from .permissions import (
+    IsProjectMember, ProjectMembership, claimed_project_ids, is_project_member, member_rows, with_membership,
+)
+from .search import get_search_backend
+from .realtime import publish_event
+from .renderers import FAST_RENDERER_CLASSES
+from .response_cache import bump_project_versions, cached
+from .rows import project_rows, task_rows, task_values, user_rows
+from .serializers import (
+    ProjectSerializer, TaskSerializer, TaskMinimalSerializer, TaskSyncSerializer,
+    CommentSerializer, CommentSyncSerializer, UserSerializer,
+)
+from .summaries import summarize_projects
+from .throttles import LoginIdentifierThrottle
 
 # ----------------- 🔹 Authentication Views 🔹 -----------------
 
-class RegisterView(APIView):
+class RegisterView(MetricsMixin, APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
@@ -22,34 +52,37 @@ class RegisterView(APIView):
         if not all([username, email, password]):
             return Response({"error": "All fields are required"}, status=400)
 
-        if User.objects.filter(username=username).exists():
+        # ✅ One query for both uniqueness checks
+        taken = User.objects.filter(Q(username=username) | Q(email=email)).values_list("username", flat=True)
+        if username in taken:
             return Response({"error": "Username already exists"}, status=400)
-
-        if User.objects.filter(email=email).exists():
+        if taken:
             return Response({"error": "Email already registered"}, status=400)
-        
-        user = User.objects.create_user(username=username, email=email, password=password)
+
+        try:
+            User.objects.create_user(username=username, email=email, password=password)
+        except IntegrityError:
+            # Registered by a concurrent request since the check
+            return Response({"error": "Username already exists"}, status=400)
         return Response({"message": "User created successfully"}, status=201)
 
-class LoginView(APIView):
+class LoginView(MetricsMixin, APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginIdentifierThrottle]
 
     def post(self, request):
-        identifier = request.data.get("username")  # Can be either username or email
-        password = request.data.get("password")
+        data = request.data if isinstance(request.data, dict) else {}
+        identifier = data.get("username")  # Can be either username or email
+        password = data.get("password")
 
         if not identifier or not password:
             return Response({"error": "Both fields are required"}, status=400)
 
-        user = authenticate(username=identifier, password=password)
+        # ✅ UsernameOrEmailBackend resolves either in one query
+        user = authenticate(request, username=identifier, password=password)
 
-        if not user:
-            user = User.objects.filter(email=identifier).first()
-            if user:
-                user = authenticate(username=user.username, password=password)
-            
         if user:
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 "refresh": str(refresh),
                 "access": str(refresh.access_token),
@@ -60,36 +93,54 @@ class LoginView(APIView):
                 },
             })
         
+        LoginIdentifierThrottle().record_failure(request, self)
         return Response({"error": "Invalid credentials"}, status=401)
     
 
-class UserListView(APIView):
+class UserListView(MetricsMixin, APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = FAST_RENDERER_CLASSES
 
     def get(self, request):
-        users = User.objects.filter(is_superuser=False).values("id", "username", "email")
+        users = user_rows(User.objects.filter(is_superuser=False))
         return Response(users, status=status.HTTP_200_OK)
 
 
 # ----------------- 🔹 Helper Function 🔹 -----------------
 
-def get_project_or_403(pk, user):
+def get_project_or_403(pk, request, queryset=None):
     """ Fetch project only if user is authorized """
-    try:
-        project = Project.objects.prefetch_related("team_members").get(pk=pk)
-        if user not in project.team_members.all():
-            return None
-        return project
-    except Project.DoesNotExist:
+    if not is_project_member(request, pk):
         return None
+    return (queryset if queryset is not None else Project.objects).filter(pk=pk).first()
+
+def fast_rows_enabled():
+    """ Build list responses from ``.values()`` rows instead of serializers (same output) """
+    return getattr(settings, "JIRA_FAST_LIST_RESPONSES", True)
+
+def wants_minimal_response(request):
+    """ ``?return=minimal`` or ``Prefer: return=minimal`` (RFC 7240) """
+    if request.query_params.get("return") == "minimal":
+        return True
+    prefer = request.headers.get("Prefer", "")
+    return "return=minimal" in [token.strip() for token in prefer.split(",")]
 
 # ----------------- 🔹 Project Views 🔹 -----------------
 
-class ProjectListCreateView(APIView):
+class ProjectListCreateView(MetricsMixin, APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = FAST_RENDERER_CLASSES
 
     def get(self, request):
-        projects = Project.objects.filter(team_members=request.user)
+        projects = Project.objects.filter(team_members=request.user.id)
+        if fast_rows_enabled():
+            return Response(project_rows(projects))
+
+        # ✅ Members, tasks (with assignees) and the newest comments load in a fixed number of queries
+        projects = projects.prefetch_related(
+            "team_members",
+            Prefetch("tasks", queryset=Task.objects.with_comment_summary().select_related("assigned_to")),
+        )
         serializer = ProjectSerializer(projects, many=True)
         return Response(serializer.data)
 
@@ -99,7 +150,7 @@ class ProjectListCreateView(APIView):
             project = serializer.save()  # Save project first
 
             # 🔹 Add the creator as a team member
-            project.team_members.add(request.user)
+            project.team_members.add(request.user.id)
 
             # 🔹 Add additional team members from request
             team_member_ids = request.data.get("team_members", [])
@@ -112,22 +163,38 @@ class ProjectListCreateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ProjectDetailView(APIView):
+class ProjectSummaryView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """ Names and SQL-computed counts for the user's projects, without tasks or comments """
+        projects = Project.objects.filter(team_members=request.user.id)
+        return Response(summarize_projects(projects))
+
+
+class ProjectDetailView(MetricsMixin, APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(project_state)
     def get(self, request, pk):
-        project = get_project_or_403(pk, request.user)
-        if not project:
+        if not is_project_member(request, pk):
             return Response({"error": "Not authorized or project not found"}, status=status.HTTP_403_FORBIDDEN)
 
-        # ✅ Prefetch tasks along with their comments
-        project = Project.objects.prefetch_related("tasks__comments").get(pk=pk)
+        def build():
+            # ✅ Prefetch members and tasks with their comment counts and newest comments
+            project = Project.objects.prefetch_related(
+                "team_members",
+                Prefetch("tasks", queryset=Task.objects.with_comment_summary().select_related("assigned_to")),
+            ).filter(pk=pk).first()
+            return ProjectSerializer(project).data if project else None
 
-        serializer = ProjectSerializer(project)
-        return Response(serializer.data)
+        data, hit = cached("project-tree", pk, pk, build)
+        if data is None:
+            return Response({"error": "Not authorized or project not found"}, status=status.HTTP_403_FORBIDDEN)
+        return Response(data, headers={"X-Cache": "HIT" if hit else "MISS"})
 
     def put(self, request, pk):
-        project = get_project_or_403(pk, request.user)
+        project = get_project_or_403(pk, request)
         if not project:
             return Response({"error": "Not authorized or project not found"}, status=status.HTTP_403_FORBIDDEN)
         serializer = ProjectSerializer(project, data=request.data, partial=True)
@@ -137,61 +204,168 @@ class ProjectDetailView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        project = get_project_or_403(pk, request.user)
+        project = get_project_or_403(pk, request)
         if not project:
             return Response({"error": "Not authorized or project not found"}, status=status.HTTP_403_FORBIDDEN)
         project.delete()
         return Response({"message": "Project deleted"}, status=status.HTTP_204_NO_CONTENT)
     
-class ProjectAssignedUsersView(APIView):
-    permission_classes = [IsAuthenticated]
+class ProjectChangesView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated, IsProjectMember]
+
+    def get(self, request, project_id):
+        """ Tasks, comments and members created, updated or deleted after ``?since=<cursor>`` """
+        project = get_object_or_404(Project, id=project_id)
+        try:
+            since = int(request.query_params.get("since", 0))
+            limit = min(max(1, int(request.query_params.get("limit", MAX_CHANGES_PAGE))), MAX_CHANGES_PAGE)
+        except ValueError:
+            return Response({"error": "since and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            changes, cursor, has_more = changes_since(project, since, limit)
+        except CursorExpired:
+            return Response(
+                {"error": "Cursor is older than the retained change log; resync the project"},
+                status=status.HTTP_410_GONE,
+            )
+        return Response({"cursor": cursor, "has_more": has_more, "changes": changes})
+
+
+class ProjectExportView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated, IsProjectMember]
+
+    def perform_content_negotiation(self, request, force=False):
+        # ✅ ?format= selects the export format here, not a DRF renderer
+        return super().perform_content_negotiation(request, force=True)
 
     def get(self, request, project_id):
+        """ Stream every task (with assignee) and comment of the project as NDJSON or CSV """
+        get_object_or_404(Project, id=project_id)
+        export_format = request.query_params.get("format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"Invalid format, expected one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        gzip = accepts_gzip(request)
+        # ✅ Django buffers sync iterators under ASGI, so ASGI requests get the async stream
+        stream = aexport_stream if isinstance(request._request, ASGIRequest) else export_stream
+        response = StreamingHttpResponse(stream(project_id, export_format, gzip=gzip), content_type=EXPORT_FORMATS[export_format])
+        response["Content-Disposition"] = f'attachment; filename="project-{project_id}.{export_format}"'
+        response["Vary"] = "Accept-Encoding"
+        if gzip:
+            response["Content-Encoding"] = "gzip"
+        return response
+
+
+class ProjectImportView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated, IsProjectMember]
+    max_batch_size = 5000
+
+    def perform_content_negotiation(self, request, force=False):
+        # ✅ ?format= names the upload format here, not a DRF renderer
+        return super().perform_content_negotiation(request, force=True)
+
+    def post(self, request, project_id):
         """
-        Fetch all users assigned to a specific project.
+        Import tasks and comments from an NDJSON or CSV body (or a multipart
+        ``file``) in batches; invalid rows are skipped and reported per line.
         """
         project = get_object_or_404(Project, id=project_id)
-        
-        # Assuming there's a ManyToManyField `team_members` in the Project model
-        assigned_users = project.team_members.all()
+        if request.content_type.startswith("multipart/form-data"):
+            stream = request.FILES.get("file")
+            name = stream.name if stream else ""
+        else:
+            stream, name = request.stream, ""
+        if stream is None:
+            return Response({"error": "No data to import"}, status=status.HTTP_400_BAD_REQUEST)
+
+        is_csv = request.content_type.startswith("text/csv") or name.lower().endswith(".csv")
+        import_format = request.query_params.get("format", "csv" if is_csv else "ndjson")
+        try:
+            batch_size = int(request.query_params.get("batch_size", DEFAULT_BATCH_SIZE))
+        except ValueError:
+            return Response({"error": "batch_size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            report = import_tasks(
+                project, stream, import_format, default_user=request.user,
+                batch_size=min(max(1, batch_size), self.max_batch_size),
+            )
+        except ImportFormatError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class ProjectAssignedUsersView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated, IsProjectMember]
+
+    def get(self, request, project_id):
+        """
+        Fetch all users assigned to a specific project.
+        """
+        assigned_users = User.objects.filter(projects=project_id)
 
         serializer = UserSerializer(assigned_users, many=True)
         return Response(serializer.data)
 
 # ----------------- 🔹 Task Views 🔹 -----------------
-class TaskListCreateView(APIView):
-    permission_classes = [IsAuthenticated]
+class TaskListCreateView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated, IsProjectMember]
+    renderer_classes = FAST_RENDERER_CLASSES
 
+    @conditional_get(task_list_state)
     def get(self, request, project_id):
-        """ Fetch all tasks for a project if the user is authorized """
-        project = get_object_or_404(Project, id=project_id, team_members=request.user)
-        tasks = Task.objects.filter(project=project)
-        serializer = TaskSerializer(tasks, many=True)
-        return Response(serializer.data)
-
-    def post(self, request, *args, **kwargs):
+        """ Fetch one filtered, sorted page of a project's tasks if the user is authorized """
+        try:
+            tasks, ordering = filter_tasks(Task.objects.filter(project_id=project_id), request.query_params, request.user)
+        except FilterError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = KeysetPagination()
+        paginator.ordering = ordering
+        if fast_rows_enabled():
+            page = paginator.paginate_queryset(task_values(tasks, ordering), request, view=self)
+            return paginator.get_paginated_response(task_rows(page))
+
+        # ✅ Join assignees; comment counts and the newest comments come per page, not per task
+        tasks = tasks.with_comment_summary().select_related("assigned_to")
+        page = paginator.paginate_queryset(tasks, request, view=self)
+        serializer = TaskSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def post(self, request, project_id):
         data = request.data
         comment_text = data.pop("comment", None)  # ✅ Get comment if provided
+        data["project"] = project_id  # ✅ Tasks are always created in the (membership-checked) URL project
 
         serializer = TaskSerializer(data=data)
         if serializer.is_valid():
-            task = serializer.save()
-
-            # ✅ If comment is provided, create a new Comment instance
-            if comment_text:
-                Comment.objects.create(task=task, user=request.user, text=comment_text)
+            # ✅ The task, its dashboard counters, the first comment and their outbox messages commit together
+            with transaction.atomic():
+                task = serializer.save()
+                task_data = TaskSyncSerializer(task).data
+                publish_event(task.project_id, "task.created", task_data)
+                enqueue("task.created", {"project": task.project_id, "data": task_data})
+
+                # ✅ If comment is provided, create a new Comment instance
+                if comment_text:
+                    comment = Comment.objects.create(task=task, user_id=request.user.id, text=comment_text)
+                    comment_data = CommentSyncSerializer(comment).data
+                    publish_event(task.project_id, "comment.created", comment_data)
+                    enqueue("comment.created", {"project": task.project_id, "data": comment_data})
 
             return Response(TaskSerializer(task).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UpdateTaskStatusView(APIView):
+class UpdateTaskStatusView(MetricsMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def patch(self, request, task_id):
         """ Update task details including deadline, status, and priority """
-        task = get_object_or_404(Task, id=task_id, project__team_members=request.user)
-
         new_status = request.data.get("status")
         new_priority = request.data.get("priority")
         new_deadline = request.data.get("deadline")
@@ -202,62 +376,165 @@ class UpdateTaskStatusView(APIView):
         if new_priority and new_priority not in ["low", "medium", "high"]:
             return Response({"error": "Invalid priority value"}, status=status.HTTP_400_BAD_REQUEST)
 
+        changes = {}
         if new_deadline:
-            task.deadline = new_deadline  # ✅ Update deadline
+            try:
+                changes["deadline"] = serializers.DateTimeField().to_internal_value(new_deadline)  # ✅ Update deadline
+            except serializers.ValidationError:
+                return Response({"error": "Invalid deadline value"}, status=status.HTTP_400_BAD_REQUEST)
 
         if new_status:
-            task.status = new_status
+            changes["status"] = new_status
 
         if new_priority:
-            task.priority = new_priority
+            changes["priority"] = new_priority
+
+        # ✅ Load the task and check membership in a single query (with the comment summary unless minimal)
+        minimal = wants_minimal_response(request)
+        tasks = Task.objects.filter(id=task_id).select_related("assigned_to")
+        task = with_membership(tasks if minimal else tasks.with_comment_summary(), request).first()
+        if task is None or not task.is_member:
+            raise Http404
+
+        changed = list(changes)
+        previous_key = counters.task_key(task)
+        changes["updated_at"] = timezone.now()
+        for field, value in changes.items():
+            setattr(task, field, value)
+
+        with transaction.atomic():
+            # ✅ One conditional UPDATE of the changed columns, re-checking membership in the same statement
+            if not member_rows(Task.objects.filter(id=task_id), request).update(**changes):
+                raise Http404
+            # ✅ No model signals: counters, reminders and the change log are written here, once each
+            counters.track(removed=[previous_key], added=[task])
+            if reminders.RESCHEDULE_FIELDS & changes.keys():
+                reminders.reschedule([task])
+            record_tasks([task], "updated")
+            bump_project_versions([task.project_id])
+            task_data = TaskSyncSerializer(task).data
+            publish_event(task.project_id, "task.updated", task_data)
+            enqueue("task.updated", {"project": task.project_id, "data": task_data})
+
+        if minimal:
+            data = TaskMinimalSerializer(task).data
+            task_data = {key: data[key] for key in ["id", *changed, "updated_at"]}
+            response = Response({"message": "Task updated successfully", "task": task_data})
+            response["Preference-Applied"] = "return=minimal"
+            return response
 
-        task.save()
         return Response({"message": "Task updated successfully", "task": TaskSerializer(task).data})
 
 
-class TaskDetailView(APIView):
+class BulkTaskView(MetricsMixin, APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, pk):
+    def post(self, request):
+        """ Create, update and delete many tasks in one transaction """
         try:
-            task = Task.objects.get(pk=pk)
-            if request.user not in task.project.team_members.all():
-                return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
-            serializer = TaskSerializer(task)
-            return Response(serializer.data)
-        except Task.DoesNotExist:
+            results = apply_bulk_tasks(request, request.data)
+        except BulkTaskError as e:
+            return Response(e.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(results, status=status.HTTP_200_OK)
+
+
+class TaskDetailView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    @conditional_get(task_state)
+    def get(self, request, pk):
+        project_id = Task.objects.filter(pk=pk).values_list("project_id", flat=True).first()
+        if project_id is None:
             return Response({"error": "Task not found"}, status=status.HTTP_404_NOT_FOUND)
+        if not is_project_member(request, project_id):
+            return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        def build():
+            task = Task.objects.with_comment_summary().select_related("assigned_to").filter(pk=pk).first()
+            return TaskSerializer(task).data if task else None
+
+        data, hit = cached("task", pk, project_id, build)
+        if data is None:
+            return Response({"error": "Task not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data, headers={"X-Cache": "HIT" if hit else "MISS"})
 
 
 # ----------------- 🔹 Comment Views 🔹 -----------------
 
-class CommentListCreateView(APIView):
+class CommentListCreateView(MetricsMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, task_id):
-        task = Task.objects.filter(id=task_id, project__team_members=request.user).first()
-        if not task:
+        """ One page of a task's comments, oldest first, keyset-paginated on (created_at, id) """
+        project_id = Task.objects.filter(id=task_id).values_list("project_id", flat=True).first()
+        if project_id is None or not is_project_member(request, project_id):
             return Response({"error": "Not authorized or task not found"}, status=status.HTTP_403_FORBIDDEN)
 
-        comments = Comment.objects.filter(task=task)  # ✅ Ensure comments are filtered correctly
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        comments = Comment.objects.filter(task_id=task_id).select_related("user")
+        paginator = KeysetPagination()
+        paginator.ordering = ("created_at", "id")
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request, task_id):
         task = Task.objects.filter(id=task_id).first()
-        if not task or request.user not in task.project.team_members.all():
+        if not task or not is_project_member(request, task.project_id):
             return Response({"error": "You are not authorized to comment on this task"}, status=status.HTTP_403_FORBIDDEN)
 
-        data = {
-            "task": task.id,   # ✅ Ensure the task ID is linked correctly
-            "user": request.user.id,
-            "text": request.data.get("text"),
-        }
-        serializer = CommentSerializer(data=data)
+        serializer = CommentSerializer(data={"text": request.data.get("text")})
 
         if serializer.is_valid():
-            serializer.save()
+            # ✅ The comment and its outbox messages commit together
+            with transaction.atomic():
+                comment = serializer.save(task=task, user_id=request.user.id)  # ✅ Link the task and author explicitly
+                comment_data = CommentSyncSerializer(comment).data
+                publish_event(task.project_id, "comment.created", comment_data)
+                enqueue("comment.created", {"project": task.project_id, "data": comment_data})
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+
+# ----------------- 🔹 Dashboard Views 🔹 -----------------
+
+class DashboardView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """ My open/overdue tasks and per-project column counts, read from the precomputed counters """
+        project_ids = claimed_project_ids(request.user)
+        if project_ids is None:
+            project_ids = ProjectMembership.objects.filter(user_id=request.user.id).values_list("project_id", flat=True)
+        return Response(counters.dashboard(request.user.id, project_ids))
+
+
+# ----------------- 🔹 Search Views 🔹 -----------------
+
+class SearchView(MetricsMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    page_size = 20
+    max_page_size = 100
+
+    def get(self, request):
+        """ Ranked full-text search over tasks and comments in the user's projects """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "Search query is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        backend = get_search_backend()
+        if backend is None:
+            return Response({"error": "Search is not available on this database"}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        try:
+            page = max(1, int(request.query_params.get("page", 1)))
+            page_size = min(max(1, int(request.query_params.get("page_size", self.page_size))), self.max_page_size)
+        except ValueError:
+            return Response({"error": "page and page_size must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Fetch one extra hit to know whether there is a next page
+        hits = backend.search(query, request.user.id, (page - 1) * page_size, page_size + 1)
+        next_url = None
+        if len(hits) > page_size:
+            next_url = replace_query_param(request.build_absolute_uri(), "page", page + 1)
+        return Response({"next": next_url, "results": hits[:page_size]})
@@ -2,6 +2,9 @@
 ASGI config for jira_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP requests go to Django; WebSocket connections to ``ws/projects/<id>/``
+receive real-time board events (see ``jira_app.realtime``). The hot read
+endpoints run as native async views (``ASYNC_VIEWS``, on by default here).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +15,17 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jira_backend.settings')
+# Route the hot read endpoints to the async views (see jira_app.async_views)
+os.environ.setdefault('ASYNC_VIEWS', 'True')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up, since it touches models and settings
+from jira_app.realtime import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        await websocket_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)